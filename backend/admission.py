@@ -0,0 +1,220 @@
+"""
+요청 수락 제어 (과부하 시 다른 API까지 느려지지 않도록)
+
+- 로그인: 클라이언트(IP)별 토큰 버킷 + (클라이언트, 전화번호)별 실패 버킷 -> 초과 시 429 Retry-After
+  (4자리 PIN 무작위 대입 방지, 실패 버킷은 PIN이 틀렸을 때만 차감)
+  -> 다른 사람이 내 번호로 계속 틀려도 내 기기의 올바른 PIN 로그인은 막히지 않음
+- 업로드/로그인: 경로별 동시 처리 수 제한 (AdmissionMiddleware)
+  제한에 걸리면 QUEUE_TIMEOUT초까지 대기 후에도 자리가 없으면 503 Retry-After
+- 업로드의 파일 복사/해시 계산은 기본 스레드풀이 아닌 업로드 전용 스레드로 실행
+  -> 업로드가 몰려도 순위/일정 조회는 기본 스레드풀을 그대로 사용
+
+환경변수:
+    LOGIN_RATE_PER_MINUTE        IP별 분당 로그인 시도 (기본 10, 버스트 LOGIN_BURST=5)
+    LOGIN_PHONE_RATE_PER_MINUTE  클라이언트+전화번호별 분당 로그인 실패 (기본 5, 버스트 LOGIN_PHONE_BURST=5)
+    LOGIN_CONCURRENCY            동시 로그인 처리 수 (기본 8, 대기 LOGIN_QUEUE_TIMEOUT=2초)
+    UPLOAD_CONCURRENCY           동시 업로드 처리 수 (기본 4, 대기 UPLOAD_QUEUE_TIMEOUT=10초)
+    ADMISSION_TRUST_FORWARDED    1이면 X-Forwarded-For 첫 주소를 클라이언트로 사용 (프록시 뒤 배포 시)
+"""
+import os
+import re
+import math
+import time
+import threading
+from collections import OrderedDict
+import anyio
+from fastapi import HTTPException, Request
+from starlette.responses import JSONResponse
+import schemas
+from auth import sanitize_phone
+
+TRUST_FORWARDED = os.getenv("ADMISSION_TRUST_FORWARDED", "0").lower() in ("1", "true", "yes")
+
+
+class TokenBucket:
+    """키별 토큰 버킷 (초당 rate개 충전, 최대 burst개), 오래 안 쓴 키는 LRU로 정리"""
+
+    def __init__(self, name: str, rate_per_minute: float, burst: int, max_keys: int = 10000):
+        self.name = name
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> (tokens, updated_at)
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.rejected = 0
+
+    def wait(self, key: str) -> float:
+        """토큰을 쓰지 않고 확인만. 남아 있으면 0, 없으면 다음 토큰까지 남은 시간(초)"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - updated_at) * self.rate)
+        if tokens >= 1.0:
+            return 0.0
+        return (1.0 - tokens) / self.rate if self.rate > 0 else 60.0
+
+    def take(self, key: str) -> float:
+        """토큰 1개 사용. 허용이면 0, 거절이면 다음 토큰까지 남은 시간(초)"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (float(self.burst), now))
+            tokens = min(float(self.burst), tokens + (now - updated_at) * self.rate)
+            if tokens >= 1.0:
+                tokens -= 1.0
+                wait = 0.0
+                self.allowed += 1
+            else:
+                wait = (1.0 - tokens) / self.rate if self.rate > 0 else 60.0
+                self.rejected += 1
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def stats(self) -> dict:
+        return {"keys": len(self._buckets), "allowed": self.allowed, "rejected": self.rejected}
+
+
+class ConcurrencyGate:
+    """동시 처리 수 제한 + 전용 스레드 (대기 시간 초과 시 거절)"""
+
+    def __init__(self, name: str, limit: int, queue_timeout: float):
+        self.name = name
+        self.limit = limit
+        self.queue_timeout = queue_timeout
+        self._slots = anyio.CapacityLimiter(limit)
+        # 이 경로의 블로킹 작업 전용 스레드 (입장 수와 같으므로 여기서는 기다리지 않음)
+        self._threads = anyio.CapacityLimiter(limit)
+        self.admitted = 0
+        self.rejected = 0
+
+    @property
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.queue_timeout))
+
+    async def acquire(self) -> bool:
+        with anyio.move_on_after(self.queue_timeout):
+            await self._slots.acquire()
+            self.admitted += 1
+            return True
+        self.rejected += 1
+        return False
+
+    def release(self) -> None:
+        self._slots.release()
+
+    async def run_sync(self, func, *args):
+        """블로킹 함수를 이 경로 전용 스레드에서 실행"""
+        return await anyio.to_thread.run_sync(func, *args, limiter=self._threads)
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "in_flight": int(self._slots.borrowed_tokens),
+            "waiting": self._slots.statistics().tasks_waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+login_ip_bucket = TokenBucket(
+    "login_ip",
+    float(os.getenv("LOGIN_RATE_PER_MINUTE", "10")),
+    int(os.getenv("LOGIN_BURST", "5")),
+)
+login_phone_bucket = TokenBucket(
+    "login_phone",
+    float(os.getenv("LOGIN_PHONE_RATE_PER_MINUTE", "5")),
+    int(os.getenv("LOGIN_PHONE_BURST", "5")),
+)
+
+login_gate = ConcurrencyGate(
+    "login", int(os.getenv("LOGIN_CONCURRENCY", "8")), float(os.getenv("LOGIN_QUEUE_TIMEOUT", "2"))
+)
+upload_gate = ConcurrencyGate(
+    "upload", int(os.getenv("UPLOAD_CONCURRENCY", "4")), float(os.getenv("UPLOAD_QUEUE_TIMEOUT", "10"))
+)
+
+# (메서드, 경로 정규식, 게이트): 이 외의 요청은 제한 없음
+GATED_ROUTES = [
+    ("POST", re.compile(r"^/login$"), login_gate),
+    ("POST", re.compile(r"^/gallery$"), upload_gate),
+    ("PUT", re.compile(r"^/gallery/uploads/[^/]+$"), upload_gate),
+    ("POST", re.compile(r"^/gallery/uploads/[^/]+/complete$"), upload_gate),
+]
+
+
+def client_key(request: Request) -> str:
+    if TRUST_FORWARDED:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def _too_many(wait: float) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail="로그인 시도가 너무 많습니다. 잠시 후 다시 시도해주세요.",
+        headers={"Retry-After": str(max(1, math.ceil(wait)))},
+    )
+
+
+def _phone_key(request: Request, phone: str) -> str:
+    return f"{client_key(request)}|{sanitize_phone(phone)}"
+
+
+def login_rate_limit(request: Request, login_req: schemas.LoginRequest) -> None:
+    """로그인 라우트 의존성: IP별 시도 횟수 제한 + 이 클라이언트의 해당 번호 실패 횟수 확인 (차감은 login_failed)"""
+    wait = login_ip_bucket.take(client_key(request))
+    if wait:
+        raise _too_many(wait)
+    wait = login_phone_bucket.wait(_phone_key(request, login_req.phone))
+    if wait:
+        raise _too_many(wait)
+
+
+def login_failed(request: Request, phone: str) -> None:
+    """PIN이 틀렸거나 없는 번호일 때만 (클라이언트, 전화번호) 버킷 차감"""
+    login_phone_bucket.take(_phone_key(request, phone))
+
+
+def find_gate(method: str, path: str):
+    for route_method, pattern, gate in GATED_ROUTES:
+        if method == route_method and pattern.match(path):
+            return gate
+    return None
+
+
+class AdmissionMiddleware:
+    """제한 경로는 본문을 읽기 전에 자리를 확보 (대기 초과 시 503, 본문은 받지 않음)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        gate = find_gate(scope.get("method", ""), scope.get("path", "")) if scope["type"] == "http" else None
+        if gate is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await gate.acquire():
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "요청이 많아 잠시 후 다시 시도해주세요."},
+                headers={"Retry-After": str(gate.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gate.release()
+
+
+def stats() -> dict:
+    return {
+        "gates": {gate.name: gate.stats() for gate in (login_gate, upload_gate)},
+        "buckets": {bucket.name: bucket.stats() for bucket in (login_ip_bucket, login_phone_bucket)},
+    }
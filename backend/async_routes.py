@@ -0,0 +1,131 @@
+"""
+비동기 DB 모드 라우트 (DB_ASYNC=1일 때 main.py가 동기 라우트보다 먼저 등록)
+
+- 요청이 많은 경로만 async def + AsyncSession으로 처리
+  POST /login, GET /users/me, GET /league/rankings, GET·POST /matches, GET /schedules
+- 응답 형식/오류 메시지는 동기 라우트와 동일 (같은 앱에서 설정만 바꿔 처리량 비교 가능)
+- 경기 등록 등 기존 동기 로직은 AsyncSession.run_sync로 그대로 재사용 (DB I/O는 비동기)
+"""
+import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+import models
+import schemas
+import match_stats
+import standings
+import schedule_slots
+import admission
+import events
+import serialization
+from auth import sanitize_phone, oauth2_scheme, token_subject, login_response, credentials_exception
+from cache import rankings_cache, rankings_cache_key, conditional_response, make_etag
+from database import get_async_db
+
+router = APIRouter()
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    phone = token_subject(token)
+    user = await db.scalar(select(models.Member).where(models.Member.phone == phone).limit(1))
+    if user is None:
+        raise credentials_exception()
+    return user
+
+
+@router.post("/login", response_model=schemas.LoginResponse, dependencies=[Depends(admission.login_rate_limit)])
+async def login(request: Request, login_req: schemas.LoginRequest, db: AsyncSession = Depends(get_async_db)):
+    try:
+        # 전화번호 정제 (하이픈 제거)
+        clean_phone = sanitize_phone(login_req.phone)
+        member = await db.scalar(select(models.Member).where(models.Member.phone == clean_phone).limit(1))
+        return login_response(member, login_req.pin)
+    except Exception as e:
+        print(f"LOGIN ERROR: {str(e)}")
+        if isinstance(e, HTTPException) and e.status_code == 400:
+            # 등록되지 않은 번호 / PIN 불일치만 실패 횟수로 계산
+            admission.login_failed(request, login_req.phone)
+        # 앱이 죽지 않도록 500 에러 대신 명확한 메시지 전달 (동기 라우트와 동일)
+        raise HTTPException(status_code=500, detail=f"로그인 처리 중 오류: {str(e)}")
+
+
+@router.get("/users/me", response_model=schemas.Member)
+async def read_users_me(current_user: models.Member = Depends(get_current_user)):
+    return current_user
+
+
+@router.get("/league/rankings", response_model=List[schemas.Member])
+async def get_rankings(request: Request, as_of: Optional[datetime.date] = None, db: AsyncSession = Depends(get_async_db)):
+    # 캐시 적중 시 DB 조회 없이 응답 (ETag 일치 시 304 Not Modified)
+    cache_key = rankings_cache_key(as_of)
+    cached = await rankings_cache.get_async(cache_key) if cache_key else None
+    if cached is None:
+        version = await rankings_cache.version_async()
+        if as_of is not None:
+            rankings = await db.run_sync(standings.rankings_as_of, as_of)
+        else:
+            rankings = serialization.project(
+                (await db.execute(standings.live_rankings_statement())).all(), serialization.MEMBER_FIELDS
+            )
+        body = serialization.dumps(rankings)
+        etag = await rankings_cache.set_async(cache_key, body, version) if cache_key else make_etag(body)
+    else:
+        etag, body = cached
+    return conditional_response(rankings_cache, request, etag, body)
+
+
+@router.get("/matches", response_model=List[schemas.MatchHistoryResponse])
+async def read_matches(
+    skip: int = 0,
+    limit: int = 100,
+    before_id: Optional[int] = None,
+    member_id: Optional[int] = None,
+    date_from: Optional[datetime.date] = None,
+    date_to: Optional[datetime.date] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    limit = max(1, min(limit, 200))
+    rows = (await db.execute(match_stats.history_statement(
+        limit=limit, skip=skip, before_id=before_id, member_id=member_id,
+        date_from=date_from, date_to=date_to
+    ))).all()
+
+    response = serialization.FastJSONResponse(match_stats.history_response(rows))
+
+    # 다음 페이지 커서 (마지막 페이지이거나 결과가 없으면 생략)
+    if rows and len(rows) == limit:
+        response.headers["X-Next-Before-Id"] = str(rows[-1][0])
+    return response
+
+
+@router.post("/matches", response_model=schemas.Match)
+async def create_match(match: schemas.MatchCreate, db: AsyncSession = Depends(get_async_db)):
+    # 스탯은 UPDATE members SET col = col + :delta 로 DB에서 원자적으로 증가 (동기 라우트와 같은 로직)
+    db_match = await db.run_sync(match_stats.record_match, match)
+    if db_match is None:
+        raise HTTPException(status_code=404, detail="참가 선수를 찾을 수 없습니다.")
+
+    await db.commit()
+    await rankings_cache.invalidate_async("경기 등록")
+    await db.refresh(db_match)
+    await events.publish_async("matches", "created", id=db_match.id)
+    await events.publish_async("rankings", "changed")
+    return db_match
+
+
+@router.get("/schedules", response_model=List[schemas.Schedule])
+async def read_schedules(
+    skip: int = 0,
+    limit: int = 100,
+    date_from: Optional[datetime.date] = Query(None, alias="from"),
+    date_to: Optional[datetime.date] = Query(None, alias="to"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # 기간 조회 (기본: 오늘), 동기 라우트와 같은 조건
+    date_from = date_from or datetime.date.today()
+    date_to = date_to or date_from
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="조회 종료일이 시작일보다 빠릅니다.")
+
+    return await db.run_sync(schedule_slots.range_query, date_from, date_to, skip, min(limit, 500))
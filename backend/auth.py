@@ -0,0 +1,192 @@
+"""
+로그인/토큰 공통 로직 (동기 라우트(main.py)와 비동기 라우트(async_routes.py)에서 함께 사용)
+
+- 인증 주체(Principal) 캐시: 토큰 sub(전화번호) -> 권한 확인에 필요한 필드(id, name, role, 승인/활동 여부)
+  요청마다 회원 조회 쿼리를 하지 않도록 TTL + LRU로 보관, 회원 승인/삭제/권한 변경 시 무효화
+  (프로세스별 캐시이므로 다른 워커에는 TTL이 지나야 반영됨)
+    PRINCIPAL_CACHE_TTL    보관 시간(초) (기본 60, 0이면 캐시 사용 안 함)
+    PRINCIPAL_CACHE_SIZE   최대 보관 수 (기본 1024)
+"""
+import os
+import re
+import time
+import datetime
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+from fastapi import HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+from jose import JWTError, jwt
+
+# --- 1. 유틸리티 함수 (전화번호 숫자만 추출) ---
+def sanitize_phone(phone: str) -> str:
+    """하이픈, 공백 등을 제거하고 숫자만 남김"""
+    if not phone:
+        return ""
+    return re.sub(r'[^0-9]', '', str(phone))
+
+# --- JWT 설정 및 토큰 생성 ---
+SECRET_KEY = "tennis_club_secret_key"
+ALGORITHM = "HS256"
+ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7 # 7 days
+
+def create_access_token(data: dict, expires_delta: Optional[datetime.timedelta] = None):
+    to_encode = data.copy()
+    if expires_delta:
+        expire = datetime.datetime.utcnow() + expires_delta
+    else:
+        expire = datetime.datetime.utcnow() + datetime.timedelta(minutes=15)
+    to_encode.update({"exp": expire})
+    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    return encoded_jwt
+
+# --- OAuth2 Scheme ---
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
+
+def credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+def token_subject(token: str) -> str:
+    """토큰 검증 후 sub(전화번호) 반환, 실패 시 401"""
+    return token_payload(token)["sub"]
+
+# --- 인증 주체(Principal) 캐시 ---
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "1024"))
+
+
+class Principal(NamedTuple):
+    """권한 확인용 회원 정보 (current_user.id / .name / .role 로 기존 코드와 같이 사용)"""
+    id: int
+    name: str
+    phone: str
+    role: str
+    is_approved: bool
+    is_active: bool
+
+    @classmethod
+    def from_member(cls, member) -> "Principal":
+        return cls(member.id, member.name, member.phone, member.role,
+                   bool(member.is_approved), member.is_active is not False)
+
+
+class PrincipalCache:
+    """토큰 sub -> Principal (TTL + LRU)"""
+
+    def __init__(self, ttl: float = PRINCIPAL_CACHE_TTL, max_size: int = PRINCIPAL_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()  # subject -> (expires_at, principal)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, subject: str) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(subject)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[subject]
+            self.misses += 1
+            return None
+
+    def set(self, principal: Principal) -> Principal:
+        if self.ttl <= 0:
+            return principal
+        with self._lock:
+            self._entries[principal.phone] = (time.monotonic() + self.ttl, principal)
+            self._entries.move_to_end(principal.phone)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return principal
+
+    def invalidate(self, subject: Optional[str] = None, reason: str = "") -> None:
+        """subject(전화번호)만, 또는 None이면 전체 삭제"""
+        with self._lock:
+            if subject is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(subject, None)
+        self.invalidations += 1
+        print(f"♻️ [Auth] 인증 캐시 무효화 ({reason})")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+principal_cache = PrincipalCache()
+
+
+def token_payload(token: str) -> dict:
+    """토큰 검증 후 payload 반환 (sub 없거나 검증 실패 시 401)"""
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise credentials_exception()
+    if payload.get("sub") is None:
+        raise credentials_exception()
+    return payload
+
+
+def resolve_principal(token: str, load_member) -> Principal:
+    """
+    토큰 -> Principal
+    1) 캐시 2) 없으면 load_member(phone)로 DB 조회 후 캐시
+    탈퇴(숨김) 처리된 회원은 401
+    """
+    phone = token_subject(token)
+    principal = principal_cache.get(phone)
+    if principal is None:
+        member = load_member(phone)
+        if member is None:
+            raise credentials_exception()
+        principal = principal_cache.set(Principal.from_member(member))
+    if not principal.is_active:
+        raise credentials_exception()
+    return principal
+
+
+def login_response(member, pin: str) -> dict:
+    """조회한 회원으로 PIN/승인 여부 확인 후 토큰 발급"""
+    if not member:
+        raise HTTPException(status_code=400, detail="등록되지 않은 전화번호입니다.")
+
+    if member.pin != pin:
+        raise HTTPException(status_code=400, detail="비밀번호가 틀렸습니다.")
+
+    if not member.is_approved:
+        # 403 Forbidden: 승인 대기 중 (앱에서 PendingScreen으로 이동)
+        raise HTTPException(status_code=403, detail="승인 대기 중입니다.")
+
+    # 토큰 생성
+    access_token_expires = datetime.timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        data={"sub": member.phone}, expires_delta=access_token_expires
+    )
+    principal_cache.set(Principal.from_member(member))
+
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "id": member.id,
+        "name": member.name,
+        "phone": member.phone,
+        "role": member.role,
+        "is_approved": member.is_approved
+    }
@@ -0,0 +1,138 @@
+"""
+/images 전송 벤치마크: 기존 StaticFiles 마운트 vs MediaFiles
+
+큰 동영상 파일을 만들어 두 서버(uvicorn)를 띄운 뒤
+- 임의 위치 탐색(Range 요청) 응답 시간 (첫 바이트까지 / 완료까지)
+- 전체 파일 전송 처리량
+- 재요청(If-None-Match) 응답
+을 비교한다.
+
+사용법 (backend 디렉터리에서):
+    python bench_media.py [--size-mb 200] [--seeks 200] [--range-kb 512]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import threading
+import statistics
+import httpx
+import uvicorn
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.staticfiles import StaticFiles
+from media_server import MediaFiles
+
+
+def make_app(kind: str, directory: str):
+    files = StaticFiles(directory=directory) if kind == "static" else MediaFiles(directory=directory)
+    return Starlette(routes=[Mount("/images", app=files)])
+
+
+def start_server(app, port: int) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def bench_seeks(client: httpx.Client, url: str, size: int, seeks: int, range_bytes: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    ttfb, total = [], []
+    for _ in range(seeks):
+        start = rng.randrange(0, size - range_bytes)
+        headers = {"Range": f"bytes={start}-{start + range_bytes - 1}"}
+        t0 = time.perf_counter()
+        with client.stream("GET", url, headers=headers) as response:
+            first = None
+            received = 0
+            for chunk in response.iter_raw():
+                if first is None:
+                    first = time.perf_counter()
+                received += len(chunk)
+            done = time.perf_counter()
+        assert response.status_code == 206 and received == range_bytes, (response.status_code, received)
+        ttfb.append((first - t0) * 1000)
+        total.append((done - t0) * 1000)
+    return {
+        "ttfb_p50_ms": round(statistics.median(ttfb), 3),
+        "ttfb_p95_ms": round(percentile(ttfb, 0.95), 3),
+        "seek_p50_ms": round(statistics.median(total), 3),
+        "seek_p95_ms": round(percentile(total, 0.95), 3),
+    }
+
+
+def bench_full(client: httpx.Client, url: str, size: int, repeat: int = 3) -> dict:
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        received = 0
+        with client.stream("GET", url) as response:
+            for chunk in response.iter_raw():
+                received += len(chunk)
+        elapsed = time.perf_counter() - t0
+        assert received == size
+        best = elapsed if best is None else min(best, elapsed)
+    return {"full_MBps": round(size / best / 1024 / 1024, 1)}
+
+
+def bench_revalidate(client: httpx.Client, url: str, count: int = 200) -> dict:
+    etag = client.head(url).headers.get("etag")
+    t0 = time.perf_counter()
+    statuses = set()
+    for _ in range(count):
+        statuses.add(client.get(url, headers={"If-None-Match": etag}).status_code)
+    return {"revalidate_avg_ms": round((time.perf_counter() - t0) * 1000 / count, 3), "revalidate_status": sorted(statuses)}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=200)
+    parser.add_argument("--seeks", type=int, default=200)
+    parser.add_argument("--range-kb", type=int, default=512)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="bench_media_")
+    # 내용 해시 형식 이름 (MediaFiles는 immutable 캐시 헤더를 붙임)
+    name = "ab" * 32 + ".mp4"
+    size = args.size_mb * 1024 * 1024
+    with open(os.path.join(directory, name), "wb") as f:
+        block = os.urandom(1024 * 1024)
+        for _ in range(args.size_mb):
+            f.write(block)
+
+    results = {}
+    servers = []
+    try:
+        for port, kind in ((8701, "static"), (8702, "media")):
+            servers.append(start_server(make_app(kind, directory), port))
+            url = f"http://127.0.0.1:{port}/images/{name}"
+            with httpx.Client(timeout=60) as client:
+                client.get(url, headers={"Range": "bytes=0-0"})  # 연결/캐시 예열
+                row = bench_seeks(client, url, size, args.seeks, args.range_kb * 1024, seed=42)
+                row.update(bench_full(client, url, size))
+                row.update(bench_revalidate(client, url))
+            results[kind] = row
+    finally:
+        for server in servers:
+            server.should_exit = True
+        os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+
+    print(f"파일 {args.size_mb}MB, 탐색 {args.seeks}회 x {args.range_kb}KB")
+    keys = list(results["static"].keys())
+    print(f"{'':22}{'StaticFiles':>14}{'MediaFiles':>14}")
+    for key in keys:
+        print(f"{key:22}{str(results['static'][key]):>14}{str(results['media'][key]):>14}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
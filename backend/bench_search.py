@@ -0,0 +1,114 @@
+"""
+게시글 검색 벤치마크: 전문 검색 색인(FTS5) vs LIKE '%...%'
+
+임시 SQLite DB에 게시글을 채운 뒤 같은 검색어로 두 방식의 응답 시간을 비교한다.
+(MySQL FULLTEXT는 DATABASE 연결 환경에서 search.search_posts로 같은 방식 측정 가능)
+
+사용법 (backend 디렉터리에서):
+    python bench_search.py [--posts 100000] [--repeat 20]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import itertools
+import tempfile
+import datetime
+import statistics
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+import models
+import search
+
+# 실제 게시판처럼 단어 빈도가 고르지 않도록: 흔한 단어 + 음절 조합으로 만든 드문 단어 (Zipf 분포)
+COMMON_WORDS = ["코트", "예약", "토요일", "레슨", "회비", "공지", "모임", "tennis", "court", "event"]
+SYLLABLES = "가나다라마바사아자차카타파하고노도로모보소오조초"
+QUERIES = ["코트 예약", "정기전", "우천 취소", "라켓 스트링", "booking", "없는검색어"]
+
+
+def vocabulary(rng: random.Random, size: int = 20000) -> list:
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))))
+    # 검색어 단어는 드물게 등장하도록 목록 뒤쪽에 배치
+    rare = ["정기전", "우천", "취소", "라켓", "스트링", "booking"]
+    return COMMON_WORDS + sorted(words) + rare
+
+
+def zipf_weights(count: int) -> list:
+    return [1.0 / (rank + 1) for rank in range(count)]
+
+
+def seed(engine, posts: int, rng: random.Random) -> None:
+    now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    words_list = vocabulary(rng)
+    cumulative = list(itertools.accumulate(zipf_weights(len(words_list))))
+    batch = []
+    with engine.begin() as conn:
+        for i in range(posts):
+            words = rng.choices(words_list, cum_weights=cumulative, k=rng.randint(20, 120))
+            batch.append({
+                "title": " ".join(rng.choices(words_list, cum_weights=cumulative, k=4)),
+                "author_name": f"회원{i % 200}",
+                "content": " ".join(words)[:2000],
+                "password": "0000",
+                "created_at": now - datetime.timedelta(minutes=i),
+            })
+            if len(batch) == 5000:
+                conn.execute(models.CommunityPost.__table__.insert(), batch)
+                batch = []
+        if batch:
+            conn.execute(models.CommunityPost.__table__.insert(), batch)
+
+
+def timed(fn, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return {"p50_ms": round(statistics.median(samples), 2), "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(prefix="bench_search_"), "bench.db")
+    engine = create_engine(f"sqlite:///{path}")
+    models.Base.metadata.create_all(bind=engine, tables=[models.CommunityPost.__table__])
+    mode = search.ensure_index(engine)
+
+    t0 = time.perf_counter()
+    seed(engine, args.posts, random.Random(42))
+    print(f"게시글 {args.posts}건 생성 + 색인: {time.perf_counter() - t0:.1f}s (검색 방식: {mode})")
+
+    db = sessionmaker(bind=engine)()
+    try:
+        print(f"{'검색어':14}{'결과':>6}{'FTS p50':>10}{'FTS p95':>10}{'LIKE p50':>11}{'LIKE p95':>11}")
+        for q in QUERIES:
+            terms = search.search_terms(q)
+            hits = len(search.search_posts(db, q, 20))
+            fts = timed(lambda: search.search_posts(db, q, 20), args.repeat)
+            like = timed(lambda: search._search_like(db, terms, 20), max(3, args.repeat // 4))
+            print(f"{q:14}{hits:>6}{fts['p50_ms']:>10}{fts['p95_ms']:>10}{like['p50_ms']:>11}{like['p95_ms']:>11}")
+
+        # 30일 정리 작업과 같은 일괄 삭제 후에도 색인이 맞는지 확인
+        db.query(models.CommunityPost).filter(models.CommunityPost.id <= args.posts // 2)\
+            .delete(synchronize_session=False)
+        db.commit()
+        stale = [row for row in search.search_posts(db, QUERIES[0], 50) if row["id"] <= args.posts // 2]
+        print(f"일괄 삭제 후 색인에 남은 삭제 글: {len(stale)}건")
+    finally:
+        db.close()
+        engine.dispose()
+        os.remove(path)
+        os.rmdir(os.path.dirname(path))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
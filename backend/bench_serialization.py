@@ -0,0 +1,162 @@
+"""
+목록 응답 직렬화 벤치마크: 기존(ORM 객체 + Pydantic 검증) vs 변경(컬럼 조회 + orjson)
+
+mock_data_generator로 만든 임시 SQLite DB에서 목록 API와 같은 조회/직렬화를 반복해
+요청당 CPU 시간(조회 포함 / 직렬화만)과 응답 크기(원본, gzip, brotli)를 비교한다.
+기존 방식은 FastAPI response_model 처리와 같음: from_attributes 검증 -> TypeAdapter.dump_json
+
+사용법 (backend 디렉터리에서):
+    python bench_serialization.py [--profile small] [--repeat 30]
+"""
+import os
+import sys
+import time
+import tempfile
+import argparse
+import statistics
+from typing import List
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+import models
+import schemas
+import standings
+import match_stats
+import serialization
+import compression
+import mock_data_generator
+
+MEMBERS_LIMIT = 100
+MATCHES_LIMIT = 100
+COMMUNITY_LIMIT = 30
+COMMUNITY_SNIPPET_LENGTH = 80  # main.COMMUNITY_SNIPPET_LENGTH
+
+
+def _members_orm(db):
+    return db.query(models.Member).filter(models.Member.is_active == True)\
+        .order_by(models.Member.id).limit(MEMBERS_LIMIT).all()
+
+
+def _members_rows(db):
+    rows = db.query(*serialization.columns(models.Member, schemas.Member))\
+        .filter(models.Member.is_active == True).order_by(models.Member.id).limit(MEMBERS_LIMIT).all()
+    return serialization.project(rows, serialization.MEMBER_FIELDS)
+
+
+def _rankings_orm(db):
+    m = models.Member
+    return db.query(m).filter(m.is_approved == True).order_by(m.rank_point.desc(), m.game_diff.desc(), m.wins.desc()).all()
+
+
+def _rankings_rows(db):
+    return serialization.project(db.execute(standings.live_rankings_statement()).all(), serialization.MEMBER_FIELDS)
+
+
+def _matches_models(db):
+    rows = db.execute(match_stats.history_statement(limit=MATCHES_LIMIT)).all()
+    return [schemas.MatchHistoryResponse(**item) for item in match_stats.history_response(rows)]
+
+
+def _matches_rows(db):
+    return match_stats.history_response(db.execute(match_stats.history_statement(limit=MATCHES_LIMIT)).all())
+
+
+def _community_query(db):
+    p = models.CommunityPost
+    return db.query(p.id, p.title, p.author_name, func.substr(p.content, 1, COMMUNITY_SNIPPET_LENGTH).label("snippet"), p.created_at)\
+        .order_by(p.id.desc()).limit(COMMUNITY_LIMIT).all()
+
+
+def _community_models(db):
+    return [schemas.CommunityPostSummary(id=r.id, title=r.title, author_name=r.author_name,
+                                         snippet=r.snippet or "", created_at=r.created_at)
+            for r in _community_query(db)]
+
+
+def _community_rows(db):
+    return [{"id": r.id, "title": r.title, "author_name": r.author_name, "snippet": r.snippet or "",
+             "created_at": r.created_at} for r in _community_query(db)]
+
+
+def _gallery_orm(db):
+    return db.query(models.Gallery).order_by(models.Gallery.created_at.desc()).all()
+
+
+def _gallery_rows(db):
+    rows = db.query(*serialization.columns(models.Gallery, schemas.GalleryResponse))\
+        .order_by(models.Gallery.created_at.desc()).all()
+    return serialization.gallery_items(rows)
+
+
+# (경로, 기존 조회, 응답 모델, 변경 조회)
+ENDPOINTS = [
+    (f"/members/?limit={MEMBERS_LIMIT}", _members_orm, schemas.Member, _members_rows),
+    ("/league/rankings", _rankings_orm, schemas.Member, _rankings_rows),
+    (f"/matches?limit={MATCHES_LIMIT}", _matches_models, schemas.MatchHistoryResponse, _matches_rows),
+    (f"/community?limit={COMMUNITY_LIMIT}", _community_models, schemas.CommunityPostSummary, _community_rows),
+    ("/gallery", _gallery_orm, schemas.GalleryResponse, _gallery_rows),
+]
+
+
+def cpu_ms(fn, repeat: int) -> float:
+    """요청 1회 CPU 시간 중앙값 (ms)"""
+    samples = []
+    for _ in range(repeat):
+        t0 = time.process_time()
+        fn()
+        samples.append((time.process_time() - t0) * 1000)
+    return round(statistics.median(samples), 2)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profile", choices=sorted(mock_data_generator.PROFILES), default="small")
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(prefix="bench_serialization_"), "bench.db")
+    engine = create_engine(f"sqlite:///{path}")
+    models.Base.metadata.create_all(bind=engine)
+    mock_data_generator.generate(engine, **mock_data_generator.PROFILES[args.profile])
+
+    encodings = ["gzip"] + (["br"] if compression.brotli is not None else [])
+    print(f"\nJSON 인코더: {'orjson' if serialization.orjson is not None else 'json (orjson 없음)'}, "
+          f"압축: {', '.join(encodings)} (brotli 패키지가 없으면 gzip만)")
+    print(f"{'경로':26}{'건수':>6}{'기존 CPU':>10}{'변경 CPU':>10}{'기존 직렬화':>11}{'변경 직렬화':>11}"
+          f"{'원본':>10}" + "".join(f"{e:>10}" for e in encodings))
+
+    db = sessionmaker(bind=engine)()
+    try:
+        for path_label, before_query, schema, after_query in ENDPOINTS:
+            adapter = TypeAdapter(List[schema])
+
+            def before():
+                return adapter.dump_json(adapter.validate_python(before_query(db), from_attributes=True))
+
+            def after():
+                return serialization.dumps(after_query(db))
+
+            before_body, after_body = before(), after()
+            items = adapter.validate_python(before_query(db), from_attributes=True)
+            rows = after_query(db)
+            db.expunge_all()
+
+            before_cpu = cpu_ms(lambda: (before(), db.expunge_all()), args.repeat)
+            after_cpu = cpu_ms(lambda: (after(), db.expunge_all()), args.repeat)
+            before_encode = cpu_ms(lambda: adapter.dump_json(adapter.validate_python(items)), args.repeat)
+            after_encode = cpu_ms(lambda: serialization.dumps(rows), args.repeat)
+            sizes = [len(compression.compress(after_body, e)) for e in encodings]
+            same = "" if len(before_body) == len(after_body) else f"  (기존 {len(before_body)}B)"
+            print(f"{path_label:26}{len(rows):>6}{before_cpu:>10}{after_cpu:>10}{before_encode:>11}{after_encode:>11}"
+                  f"{len(after_body):>10}" + "".join(f"{s:>10}" for s in sizes) + same)
+    finally:
+        db.close()
+        engine.dispose()
+        os.remove(path)
+        os.rmdir(os.path.dirname(path))
+    print("\nCPU: 요청 1회 중앙값(ms), 기존 = ORM 조회 + from_attributes 검증 + dump_json, "
+          "변경 = 컬럼 조회 + dict + orjson. 크기 단위: 바이트")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""
+직렬화된 응답 캐시 (리그 순위 등 조회가 많은 화면용)
+
+- 기본: 프로세스 내 메모리 캐시 (리그 순위, 토너먼트 대진표)
+- 선택: CACHE_REDIS_URL 환경변수를 지정하면 Redis를 공유 백엔드로 사용
+  (여러 워커가 같은 캐시 버전/본문을 공유하므로 한 워커의 무효화가 전체에 반영됨)
+- 무효화는 데이터가 바뀌는 API(경기 등록/삭제, 회원 승인/삭제, 월말 정산)에서 명시적으로 호출
+- 메모리 캐시는 키 CACHE_MAX_ENTRIES개까지 (가장 오래 쓰지 않은 키부터 제거)
+- 비동기 라우트는 *_async 메서드 사용 (Redis 백엔드 호출은 스레드에서 실행 -> 이벤트 루프가 멈추지 않음)
+"""
+import os
+import hashlib
+import datetime
+import threading
+from collections import OrderedDict
+import anyio
+from starlette.responses import Response
+
+try:
+    import redis
+except ImportError:  # Redis는 선택 사항
+    redis = None
+
+
+MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "64"))
+
+
+class LocalBackend:
+    """프로세스 내 버전 카운터 (본문은 ResponseCache가 직접 보관)"""
+
+    # 네트워크 호출이 없어 이벤트 루프에서 바로 호출해도 됨
+    blocking = False
+
+    def __init__(self):
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def version(self) -> int:
+        return self._version
+
+    def bump(self) -> int:
+        with self._lock:
+            self._version += 1
+            return self._version
+
+    def get(self, key: str):
+        return None
+
+    def set(self, key: str, value: bytes) -> None:
+        pass
+
+
+class RedisBackend:
+    """Redis 공유 백엔드: 버전 카운터 + 버전별 본문 저장"""
+
+    blocking = True
+
+    def __init__(self, url: str, prefix: str = "tennis:cache:", ttl: int = 3600):
+        self._redis = redis.Redis.from_url(url)
+        self._prefix = prefix
+        self._ttl = ttl
+
+    def version(self) -> int:
+        return int(self._redis.get(self._prefix + "version") or 0)
+
+    def bump(self) -> int:
+        return int(self._redis.incr(self._prefix + "version"))
+
+    def get(self, key: str):
+        return self._redis.get(self._prefix + key)
+
+    def set(self, key: str, value: bytes) -> None:
+        self._redis.setex(self._prefix + key, self._ttl, value)
+
+
+def make_etag(body: bytes) -> str:
+    """본문 해시 기반 강한(strong) ETag"""
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def etag_matches(if_none_match, etag: str) -> bool:
+    """
+    If-None-Match 헤더(콤마 구분 목록 / *)가 현재 ETag와 일치하는지
+    약한 비교: 압축 응답의 W/"..." ETag도 같은 본문으로 취급
+    """
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+def conditional_response(cache, request, etag: str, body: bytes) -> Response:
+    """캐시된 JSON 본문 응답, If-None-Match가 현재 ETag와 같으면 304"""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        with cache._lock:
+            cache.not_modified += 1
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+class ResponseCache:
+    """
+    직렬화된 JSON 본문 + ETag 캐시
+    사용 순서: version = cache.version() -> 조회/직렬화 -> cache.set(key, body, version)
+    (계산 중 무효화되면 이전 버전으로 저장되어 다시 제공되지 않음)
+    """
+
+    def __init__(self, name: str, backend=None, max_entries: int = None):
+        self.name = name
+        self.backend = backend or LocalBackend()
+        self.max_entries = MAX_ENTRIES if max_entries is None else max_entries
+        self._entries = OrderedDict()  # key -> (version, etag, body), 최근 사용 순
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidations = 0
+
+    def version(self) -> int:
+        return self.backend.version()
+
+    def _store(self, key: str, entry: tuple) -> None:
+        # _lock 안에서 호출
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str):
+        """캐시 적중 시 (etag, body), 아니면 None"""
+        version = self.backend.version()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1], entry[2]
+
+        body = self.backend.get(f"{self.name}:{version}:{key}")
+        with self._lock:
+            if body is not None:
+                etag = make_etag(body)
+                self._store(key, (version, etag, body))
+                self.hits += 1
+                return etag, body
+            self.misses += 1
+        return None
+
+    def set(self, key: str, body: bytes, version: int) -> str:
+        etag = make_etag(body)
+        with self._lock:
+            self._store(key, (version, etag, body))
+        self.backend.set(f"{self.name}:{version}:{key}", body)
+        return etag
+
+    def invalidate(self, reason: str = "") -> None:
+        self.backend.bump()
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+        print(f"♻️ [Cache] {self.name} 캐시 무효화 ({reason})")
+
+    # --- 비동기 라우트용 ---
+
+    async def _run(self, func, *args):
+        if self.backend.blocking:
+            return await anyio.to_thread.run_sync(func, *args)
+        return func(*args)
+
+    async def version_async(self) -> int:
+        return await self._run(self.version)
+
+    async def get_async(self, key: str):
+        return await self._run(self.get, key)
+
+    async def set_async(self, key: str, body: bytes, version: int) -> str:
+        return await self._run(self.set, key, body, version)
+
+    async def invalidate_async(self, reason: str = "") -> None:
+        await self._run(self.invalidate, reason)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "backend": type(self.backend).__name__,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def _make_backend(name: str):
+    url = os.getenv("CACHE_REDIS_URL")
+    if url and redis is not None:
+        return RedisBackend(url, prefix=f"tennis:cache:{name}:")
+    if url:
+        print("⚠️ [Cache] redis 패키지가 없어 메모리 캐시를 사용합니다.")
+    return LocalBackend()
+
+
+# 리그 순위 응답 캐시 (GET /league/rankings)
+rankings_cache = ResponseCache("rankings", _make_backend("rankings"))
+
+
+def rankings_cache_key(as_of):
+    """
+    순위 캐시 키: 현재 순위는 "live", as_of는 정산이 끝난 달(지난달 이전) 날짜만 캐시
+    (이번 달/미래 날짜는 클라이언트가 임의로 늘릴 수 있으므로 매번 계산) -> None이면 캐시하지 않음
+    """
+    if as_of is None:
+        return "live"
+    if as_of < datetime.date.today().replace(day=1):
+        return f"as_of:{as_of.isoformat()}"
+    return None
+
+# 현재 토너먼트 대진표 응답 캐시 (GET /tournament/current)
+tournament_cache = ResponseCache("tournament", _make_backend("tournament"))
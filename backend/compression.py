@@ -0,0 +1,128 @@
+"""
+응답 압축 (gzip / brotli)
+
+- Accept-Encoding 협상: brotli 패키지가 있으면 br, 없으면 gzip (q=0으로 거절한 방식은 제외)
+- COMPRESS_MIN_SIZE 이상인 JSON/텍스트 응답만 압축 (작은 응답은 압축 비용이 더 큼)
+- 한 번에 보내는 응답만 압축: 스트리밍 응답(SSE /events, 업로드 파일/Range 전송)은 그대로 전달
+- 압축한 응답의 ETag는 약한 ETag(W/"...")로 바꿈 (If-None-Match는 약한 비교 -> 304 그대로 동작)
+
+환경변수:
+    COMPRESS_MIN_SIZE        압축 최소 크기 (바이트, 기본 1024)
+    COMPRESS_GZIP_LEVEL      gzip 압축 수준 (기본 5)
+    COMPRESS_BROTLI_QUALITY  brotli 품질 (기본 4, 응답마다 압축하므로 속도 우선)
+"""
+import os
+import gzip
+
+try:
+    import brotli
+except ImportError:  # brotli는 선택 사항 (없으면 gzip만 사용)
+    brotli = None
+
+MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "5"))
+BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "4"))
+
+COMPRESSIBLE_TYPES = ("application/json", "text/plain", "text/html", "text/css", "application/javascript")
+
+
+def supported_encodings() -> tuple:
+    """선호 순서"""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate(accept_encoding: str):
+    """Accept-Encoding 헤더 -> 사용할 압축 방식 (없으면 None)"""
+    if not accept_encoding:
+        return None
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name.strip().lower()] = quality
+    best, best_quality = None, 0.0
+    for encoding in supported_encodings():
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _header(headers: list, name: bytes):
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+class CompressionMiddleware:
+    """JSON/텍스트 단일 본문 응답을 Accept-Encoding에 맞춰 압축"""
+
+    def __init__(self, app, min_size: int = None):
+        self.app = app
+        self.min_size = MIN_SIZE if min_size is None else min_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = dict(scope.get("headers") or []).get(b"accept-encoding", b"").decode("latin-1")
+        encoding = negotiate(accept)
+
+        start_message = None
+
+        async def send_wrapper(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                content_type = (_header(headers, b"content-type") or b"").decode("latin-1").split(";")[0].strip()
+                if content_type not in COMPRESSIBLE_TYPES or _header(headers, b"content-encoding"):
+                    await send(message)
+                    return
+                vary = _header(headers, b"vary")
+                if vary is None:
+                    headers.append((b"vary", b"Accept-Encoding"))
+                elif b"accept-encoding" not in vary.lower():
+                    headers = [(k, v + b", Accept-Encoding" if k.lower() == b"vary" else v) for k, v in headers]
+                message["headers"] = headers
+                if encoding is None or message["status"] in (204, 304):
+                    await send(message)
+                    return
+                # 본문을 보고 압축 여부 결정
+                start_message = message
+                return
+
+            if message["type"] == "http.response.body" and start_message is not None:
+                start, start_message = start_message, None
+                body = message.get("body", b"")
+                if message.get("more_body", False) or len(body) < self.min_size:
+                    # 스트리밍 응답이거나 작은 응답: 그대로 전달
+                    await send(start)
+                    await send(message)
+                    return
+                compressed = compress(body, encoding)
+                headers = [(k, v) for k, v in start["headers"] if k.lower() != b"content-length"]
+                headers.append((b"content-encoding", encoding.encode()))
+                headers.append((b"content-length", str(len(compressed)).encode()))
+                headers = [(k, b"W/" + v if k.lower() == b"etag" and not v.startswith(b"W/") else v)
+                           for k, v in headers]
+                start["headers"] = headers
+                await send(start)
+                await send({"type": "http.response.body", "body": compressed, "more_body": False})
+                return
+
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
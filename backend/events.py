@@ -0,0 +1,221 @@
+"""
+실시간 변경 알림 (Server-Sent Events, GET /events?topics=rankings,matches)
+
+- 경기 등록/삭제/수정, 운동 약속 등록/수정/삭제, 회원 승인이 commit된 직후 짧은 이벤트 발행
+  앱은 전체 목록을 주기적으로 다시 받는 대신 이벤트가 온 화면만 갱신
+- EventHub: 프로세스 내 구독자 관리 (토픽별 구독, 구독자마다 크기 제한 대기열)
+  대기열이 가득 찬 느린 구독자는 연결을 끊음 (다른 구독자/발행자가 기다리지 않음)
+- 브로커: 기본은 프로세스 내 전달(LocalBroker)
+  EVENTS_REDIS_URL(없으면 CACHE_REDIS_URL)을 지정하면 Redis pub/sub으로 워커/서버 간 전달
+  Redis 발행은 네트워크 호출이므로 비동기 라우트는 publish_async로 스레드에서 실행 (이벤트 루프가 멈추지 않음)
+
+환경변수:
+    EVENTS_QUEUE_SIZE         구독자별 대기 이벤트 수 (기본 64, 초과 시 연결 종료)
+    EVENTS_MAX_SUBSCRIBERS    프로세스당 최대 구독자 수 (기본 1000)
+    EVENTS_HEARTBEAT_SECONDS  연결 유지용 주석 전송 간격 (기본 15)
+"""
+import os
+import json
+import asyncio
+import itertools
+import functools
+import threading
+import anyio
+
+try:
+    import redis
+except ImportError:  # Redis는 선택 사항
+    redis = None
+
+TOPICS = ("rankings", "matches", "schedules", "members")
+QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "64"))
+MAX_SUBSCRIBERS = int(os.getenv("EVENTS_MAX_SUBSCRIBERS", "1000"))
+HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+# 연결이 끊긴 앱이 다시 접속하기까지 기다리는 시간 (SSE retry 필드, 밀리초)
+RECONNECT_MS = 3000
+
+_CLOSED = object()
+
+
+class Subscriber:
+    """SSE 연결 하나: 구독 토픽 + 크기 제한 대기열 (이벤트 루프 안에서만 읽음)"""
+
+    def __init__(self, topics, loop: asyncio.AbstractEventLoop, queue_size: int = QUEUE_SIZE):
+        self.topics = frozenset(topics)
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = False
+
+    def offer(self, message: str) -> bool:
+        """이벤트 루프 스레드에서 호출. 대기열이 가득 차면 False"""
+        if self.dropped:
+            return False
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            self.dropped = True
+            # 읽던 이벤트를 다 소비하면 종료하도록 자리를 비우고 종료 표시
+            self.queue.get_nowait()
+            self.queue.put_nowait(_CLOSED)
+            return False
+
+
+class EventHub:
+    """프로세스 내 팬아웃: 토픽별 구독자에게 직렬화된 SSE 메시지 전달"""
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._sequence = itertools.count(1)
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    def subscribe(self, topics) -> Subscriber:
+        with self._lock:
+            if len(self._subscribers) >= MAX_SUBSCRIBERS:
+                return None
+            subscriber = Subscriber(topics, asyncio.get_running_loop())
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def dispatch(self, topic: str, data: dict) -> None:
+        """브로커에서 받은 이벤트를 이 프로세스의 구독자에게 전달 (아무 스레드에서나 호출 가능)"""
+        message = (f"id: {next(self._sequence)}\nevent: {topic}\n"
+                   f"data: {json.dumps(data, ensure_ascii=False, separators=(',', ':'))}\n\n")
+        with self._lock:
+            targets = [s for s in self._subscribers if topic in s.topics and not s.dropped]
+        for subscriber in targets:
+            try:
+                subscriber.loop.call_soon_threadsafe(self._deliver, subscriber, message)
+            except RuntimeError:
+                # 이벤트 루프가 이미 종료됨
+                self.unsubscribe(subscriber)
+
+    def _deliver(self, subscriber: Subscriber, message: str) -> None:
+        if subscriber.offer(message):
+            self.delivered += 1
+        elif subscriber.dropped:
+            self.dropped += 1
+            self.unsubscribe(subscriber)
+            print(f"⚠️ [Events] 느린 구독자 연결 종료 (대기 {subscriber.queue.maxsize}건 초과)")
+
+    def stats(self) -> dict:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        return {
+            "broker": type(broker).__name__,
+            "subscribers": len(subscribers),
+            "by_topic": {t: sum(1 for s in subscribers if t in s.topics) for t in TOPICS},
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+        }
+
+    def count_published(self) -> None:
+        with self._lock:
+            self.published += 1
+
+
+class LocalBroker:
+    """프로세스 내 전달 (단일 워커 / 테스트용)"""
+
+    # publish가 구독자 대기열에 넣기만 하므로 이벤트 루프에서 바로 호출해도 됨
+    blocking = False
+
+    def __init__(self, hub: EventHub):
+        self.hub = hub
+
+    def publish(self, topic: str, data: dict) -> None:
+        self.hub.dispatch(topic, data)
+
+
+class RedisBroker:
+    """Redis pub/sub: 모든 워커가 같은 채널을 구독하여 각자의 구독자에게 전달"""
+
+    blocking = True
+
+    def __init__(self, hub: EventHub, url: str, prefix: str = "tennis:events:"):
+        self.hub = hub
+        self.prefix = prefix
+        self._redis = redis.Redis.from_url(url)
+        self._listener = None
+
+    def publish(self, topic: str, data: dict) -> None:
+        self._redis.publish(self.prefix + topic, json.dumps(data, ensure_ascii=False))
+
+    def start(self) -> None:
+        if self._listener is not None:
+            return
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.psubscribe(self.prefix + "*")
+
+        def listen():
+            for message in pubsub.listen():
+                channel = message["channel"].decode()
+                self.hub.dispatch(channel[len(self.prefix):], json.loads(message["data"]))
+
+        self._listener = threading.Thread(target=listen, name="events-redis", daemon=True)
+        self._listener.start()
+
+
+def _make_broker(hub: EventHub):
+    url = os.getenv("EVENTS_REDIS_URL") or os.getenv("CACHE_REDIS_URL")
+    if url and redis is not None:
+        remote = RedisBroker(hub, url)
+        remote.start()
+        return remote
+    if url:
+        print("⚠️ [Events] redis 패키지가 없어 프로세스 내 전달을 사용합니다.")
+    return LocalBroker(hub)
+
+
+hub = EventHub()
+broker = _make_broker(hub)
+
+
+def publish(topic: str, event_type: str, **fields) -> None:
+    """commit 후 호출: {"type": ..., 변경된 항목 id 등} 짧은 이벤트 발행 (실패해도 요청은 성공)"""
+    try:
+        broker.publish(topic, {"type": event_type, **fields})
+        hub.count_published()
+    except Exception as e:
+        print(f"❌ [Events] 발행 실패 ({topic}.{event_type}): {e}")
+
+
+async def publish_async(topic: str, event_type: str, **fields) -> None:
+    """비동기 라우트용 publish: 블로킹 브로커(Redis)는 스레드에서 실행"""
+    if broker.blocking:
+        await anyio.to_thread.run_sync(functools.partial(publish, topic, event_type, **fields))
+    else:
+        publish(topic, event_type, **fields)
+
+
+def parse_topics(value: str) -> list:
+    topics = [t.strip() for t in (value or "").split(",") if t.strip()] or list(TOPICS)
+    unknown = [t for t in topics if t not in TOPICS]
+    if unknown:
+        raise ValueError(f"알 수 없는 토픽: {', '.join(unknown)} ({', '.join(TOPICS)})")
+    return topics
+
+
+async def stream(subscriber: Subscriber):
+    """SSE 본문: 재접속 간격 -> 이벤트 / 하트비트 주석, 연결이 끊기면 구독 해제"""
+    try:
+        yield f"retry: {RECONNECT_MS}\n: connected {','.join(sorted(subscriber.topics))}\n\n"
+        while True:
+            try:
+                message = await asyncio.wait_for(subscriber.queue.get(), HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            if message is _CLOSED:
+                break
+            yield message
+    finally:
+        hub.unsubscribe(subscriber)
@@ -0,0 +1,102 @@
+"""
+월별 리그 기록(league_histories) 조회 및 최근 N개월 누적 집계(league_rolling_points)
+
+- 월말 정산(scheduler.reset_league_and_cleanup)이 한 달을 보관한 직후 refresh_rolling_points 호출
+- 토너먼트 시드 / 누적 랭킹은 league_rolling_points 인덱스 한 번 조회
+
+사용법 (backend 디렉터리에서, 기존 기록으로 누적 집계 초기화):
+    python league_history.py refresh
+"""
+import sys
+from sqlalchemy import and_, func, literal, or_, select
+from sqlalchemy.orm import Session
+from database import SessionLocal
+import models
+
+# 유지하는 누적 기간 (개월)
+ROLLING_WINDOWS = (6, 12)
+# 토너먼트 시드 배정 기준 기간
+SEEDING_WINDOW = 6
+
+
+def shift_month(year: int, month: int, delta: int) -> tuple:
+    """(연, 월)을 delta개월 이동"""
+    index = year * 12 + (month - 1) + delta
+    return index // 12, index % 12 + 1
+
+
+def _period_between(start: tuple, end: tuple):
+    """league_histories (year, month)가 start~end(포함) 구간인지 조건식"""
+    h = models.LeagueHistory
+    return and_(
+        or_(h.year > start[0], and_(h.year == start[0], h.month >= start[1])),
+        or_(h.year < end[0], and_(h.year == end[0], h.month <= end[1])),
+    )
+
+
+def refresh_rolling_points(db: Session, through_year: int, through_month: int, windows=ROLLING_WINDOWS) -> None:
+    """
+    through 월까지 최근 N개월 누적 집계를 다시 계산 (commit은 호출자가 수행)
+    기간별 DELETE 1번 + INSERT ... SELECT GROUP BY 1번
+    """
+    table = models.LeagueRollingPoints.__table__
+    h = models.LeagueHistory
+    for window in windows:
+        start = shift_month(through_year, through_month, -(window - 1))
+        db.execute(table.delete().where(table.c.window_months == window))
+        aggregate = select(
+            literal(window),
+            h.member_id,
+            func.sum(h.total_points),
+            func.sum(h.final_wins),
+            func.sum(h.final_losses),
+            func.sum(h.final_diff),
+            func.count(h.id),
+            literal(through_year),
+            literal(through_month),
+        ).where(
+            h.member_id.isnot(None),
+            _period_between(start, (through_year, through_month))
+        ).group_by(h.member_id)
+        db.execute(table.insert().from_select(
+            ["window_months", "member_id", "total_points", "total_wins", "total_losses",
+             "total_diff", "months_played", "through_year", "through_month"],
+            aggregate
+        ))
+
+
+def latest_period(db: Session):
+    """가장 최근 정산 월 (기록이 없으면 None)"""
+    h = models.LeagueHistory
+    row = db.query(h.year, h.month).order_by(h.year.desc(), h.month.desc()).first()
+    return (row.year, row.month) if row else None
+
+
+def top_member_ids(db: Session, limit: int, window: int = SEEDING_WINDOW) -> list:
+    """최근 window개월 누적 승점 상위 회원 ID (활동 중인 승인 회원만)"""
+    r = models.LeagueRollingPoints
+    rows = db.query(r.member_id).join(models.Member, models.Member.id == r.member_id).filter(
+        r.window_months == window,
+        models.Member.is_active == True,
+        models.Member.is_approved == True
+    ).order_by(r.total_points.desc(), r.total_diff.desc()).limit(limit).all()
+    return [row.member_id for row in rows]
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "refresh"
+    if command != "refresh":
+        print(f"알 수 없는 명령: {command} (refresh)")
+        sys.exit(2)
+
+    db = SessionLocal()
+    try:
+        period = latest_period(db)
+        if period is None:
+            print("⚠️ [History] 보관된 월별 기록이 없습니다.")
+        else:
+            refresh_rolling_points(db, *period)
+            db.commit()
+            print(f"✅ [History] {period[0]}년 {period[1]}월 기준 누적 집계 갱신 완료")
+    finally:
+        db.close()
@@ -0,0 +1,396 @@
+"""
+부하 테스트
+
+1) --scenario db-mode (기본): 동기 DB 모드 vs 비동기 DB 모드(DB_ASYNC=1) 처리량 비교
+   같은 DB로 uvicorn 서버를 두 번(DB_ASYNC=0, 1) 띄우고, 동시 접속 수를 바꿔 가며
+   주요 조회 경로(/users/me, /matches, /schedules, /league/rankings?as_of=)를 호출해
+   초당 처리량과 응답 시간 분포(p50/p95/p99)를 비교한다.
+
+2) --scenario mix: 실제 사용과 비슷한 혼합 부하 (로그인, 순위, 경기 등록, 운동 약속, 갤러리)
+   mock_data_generator로 만든 데이터(--profile)에 대해 엔드포인트별 처리량과 p50/p95/p99를 측정
+   --json 결과에 커밋/설정 정보를 함께 저장 -> 커밋 간 비교
+
+사용법 (backend 디렉터리에서):
+    python load_test.py [--concurrency 16 64 256] [--duration 10]
+    python load_test.py --database-url mysql+pymysql://user:pw@host/db   # 실제 MySQL로 측정
+    python load_test.py --scenario mix --profile small --concurrency 32 --duration 30 --json result.json
+(--database-url을 주지 않으면 임시 SQLite 파일을 만들어 사용)
+"""
+import os
+import io
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import platform
+import tempfile
+import datetime
+import subprocess
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+# (경로, 가중치): 앱이 실제로 자주 부르는 조회 위주
+TRAFFIC_MIX = [
+    ("/users/me", 3),
+    ("/matches?limit=20", 3),
+    ("/schedules", 2),
+    ("/league/rankings?as_of={as_of}", 2),
+]
+
+
+def seed_database(url: str, members: int = 60, matches: int = 3000, schedules: int = 30) -> None:
+    """테스트용 회원/경기/오늘 일정 생성 (빈 DB일 때만)"""
+    os.environ["DATABASE_URL"] = url
+    sys.path.insert(0, BACKEND_DIR)
+    import models
+    from database import engine
+
+    models.Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        if conn.execute(models.Member.__table__.select().limit(1)).first():
+            return
+        rng = random.Random(7)
+        conn.execute(models.Member.__table__.insert(), [{
+            "name": f"회원{i}", "phone": f"0109000{i:04d}", "birth": "1990", "pin": "1234",
+            "role": "ADMIN" if i == 0 else "MEMBER", "is_approved": True, "is_active": True,
+            "rank_point": 0, "wins": 0, "draws": 0, "losses": 0, "game_diff": 0,
+        } for i in range(members)])
+        now = datetime.datetime.now()
+        rows = []
+        for i in range(matches):
+            ids = rng.sample(range(1, members + 1), 4)
+            rows.append({
+                "team_a_player1_id": ids[0], "team_a_player2_id": ids[1],
+                "team_b_player1_id": ids[2], "team_b_player2_id": ids[3],
+                "score_team_a": rng.randint(0, 6), "score_team_b": rng.randint(0, 6),
+                "date": now - datetime.timedelta(minutes=i * 7),
+            })
+        conn.execute(models.Match.__table__.insert(), rows)
+        conn.execute(models.Schedule.__table__.insert(), [{
+            "member_id": i + 1, "member_name": f"회원{i}", "date": now.date(),
+            "start_time": f"{8 + i % 12:02d}:00", "end_time": f"{9 + i % 12:02d}:00",
+        } for i in range(schedules)])
+
+
+def start_server(url: str, db_async: bool, port: int, workdir: str, extra_env: dict = None) -> subprocess.Popen:
+    env = dict(os.environ, DATABASE_URL=url, DB_ASYNC="1" if db_async else "0",
+               PYTHONPATH=BACKEND_DIR + os.pathsep + os.environ.get("PYTHONPATH", ""), **(extra_env or {}))
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning", "--no-access-log"],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/schedules", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("서버가 시작되지 않았습니다.")
+
+
+def percentile(ordered: list, p: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def summarize(latencies: list, errors: int, elapsed: float) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "rps": round(len(ordered) / elapsed, 1),
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+    }
+
+
+async def run_load(base_url: str, token: str, concurrency: int, duration: float, mix=TRAFFIC_MIX) -> dict:
+    """concurrency개의 가상 사용자가 duration초 동안 mix 비율로 요청"""
+    paths = [path for path, weight in mix for _ in range(weight)]
+    as_of = datetime.date.today().isoformat()
+    headers = {"Authorization": f"Bearer {token}"}
+    latencies, errors = [], 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + duration
+
+        async def user(seed: int):
+            nonlocal errors
+            rng = random.Random(seed)
+            while time.perf_counter() < deadline:
+                path = rng.choice(paths).format(as_of=as_of)
+                t0 = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    ok = response.status_code in (200, 304)
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies.append(time.perf_counter() - t0)
+                else:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(user(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return summarize(latencies, errors, elapsed)
+
+
+# --- 혼합 부하 (--scenario mix) ---
+
+# (작업 이름, 가중치): 조회 위주, 쓰기는 가끔
+MIXED_OPERATIONS = [
+    ("POST /login", 2),
+    ("GET /league/rankings", 6),
+    ("GET /matches", 5),
+    ("POST /matches", 1),
+    ("GET /schedules", 4),
+    ("POST /schedules", 1),
+    ("GET /gallery", 2),
+    ("POST /gallery", 1),
+]
+# 작업별 정상 응답 (운동 약속 시간 중복 409는 정상 처리)
+EXPECTED_STATUS = {"POST /schedules": (200, 409)}
+# 부하 중 로그인이 IP별 시도 제한(429)에 걸리지 않도록 서버 설정 (동시 처리 수 제한은 그대로)
+MIX_SERVER_ENV = {
+    "LOGIN_RATE_PER_MINUTE": "1000000", "LOGIN_BURST": "1000000",
+    "LOGIN_PHONE_RATE_PER_MINUTE": "1000000", "LOGIN_PHONE_BURST": "1000000",
+}
+
+
+def sample_images(count: int = 8) -> list:
+    """갤러리 업로드용 작은 JPEG (내용이 같으면 서버가 한 번만 저장하므로 몇 가지 색으로)"""
+    from PIL import Image
+
+    images = []
+    for i in range(count):
+        buffer = io.BytesIO()
+        Image.new("RGB", (64, 48), (i * 30 % 256, 120, 200 - i * 20)).save(buffer, "JPEG")
+        images.append(buffer.getvalue())
+    return images
+
+
+def login_pool(base_url: str, size: int) -> list:
+    """[(회원 id, 전화번호, 토큰)]: mock_data_generator 회원(010 + 8자리, PIN 1234) 중 승인된 회원"""
+    pool = []
+    with httpx.Client(base_url=base_url, timeout=10) as client:
+        for i in range(size * 2):
+            phone = f"010{i:08d}"
+            response = client.post("/login", json={"phone": phone, "pin": "1234"})
+            if response.status_code == 200:
+                body = response.json()
+                pool.append((body["id"], phone, body["access_token"]))
+            if len(pool) >= size:
+                break
+    if len(pool) < 4:
+        raise RuntimeError("로그인 가능한 회원이 부족합니다. (mock_data_generator로 만든 DB인지 확인)")
+    return pool
+
+
+async def mixed_request(client: httpx.AsyncClient, name: str, rng: random.Random, pool: list, images: list):
+    member_id, phone, token = rng.choice(pool)
+    auth = {"Authorization": f"Bearer {token}"}
+    if name == "POST /login":
+        return await client.post("/login", json={"phone": phone, "pin": "1234"})
+    if name == "GET /league/rankings":
+        return await client.get("/league/rankings")
+    if name == "GET /matches":
+        return await client.get("/matches", params={"limit": 20})
+    if name == "POST /matches":
+        ids = [p[0] for p in rng.sample(pool, 4)]
+        return await client.post("/matches", json={
+            "team_a_player1_id": ids[0], "team_a_player2_id": ids[1],
+            "team_b_player1_id": ids[2], "team_b_player2_id": ids[3],
+            "score_team_a": 6, "score_team_b": rng.randint(0, 5),
+        })
+    if name == "GET /schedules":
+        return await client.get("/schedules")
+    if name == "POST /schedules":
+        start = rng.randrange(6 * 60, 21 * 60, 30)
+        day = datetime.date.today() + datetime.timedelta(days=rng.randint(1, 14))
+        return await client.post("/schedules", headers=auth, json={
+            "start_time": f"{start // 60:02d}:{start % 60:02d}:00",
+            "end_time": f"{(start + 90) // 60:02d}:{(start + 90) % 60:02d}:00",
+            "date": day.isoformat(),
+        })
+    if name == "GET /gallery":
+        return await client.get("/gallery")
+    if name == "POST /gallery":
+        return await client.post("/gallery", data={"uploader_name": f"회원{member_id}", "file_type": "IMAGE"},
+                                 files={"file": ("photo.jpg", rng.choice(images), "image/jpeg")})
+    raise ValueError(name)
+
+
+async def run_mixed_load(base_url: str, pool: list, concurrency: int, duration: float,
+                         mix=MIXED_OPERATIONS) -> dict:
+    """concurrency개의 가상 사용자가 duration초 동안 mix 비율로 요청 -> 전체/작업별 통계"""
+    names = [name for name, weight in mix for _ in range(weight)]
+    images = sample_images()
+    latencies = {name: [] for name, _ in mix}
+    errors = {name: 0 for name, _ in mix}
+    statuses = {name: {} for name, _ in mix}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + duration
+
+        async def user(seed: int):
+            rng = random.Random(seed)
+            while time.perf_counter() < deadline:
+                name = rng.choice(names)
+                t0 = time.perf_counter()
+                try:
+                    response = await mixed_request(client, name, rng, pool, images)
+                    code = response.status_code
+                except httpx.HTTPError:
+                    code = "error"
+                statuses[name][str(code)] = statuses[name].get(str(code), 0) + 1
+                if code in EXPECTED_STATUS.get(name, (200, 304)):
+                    latencies[name].append(time.perf_counter() - t0)
+                else:
+                    errors[name] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(user(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    endpoints = {}
+    for name, _ in mix:
+        endpoints[name] = {**summarize(latencies[name], errors[name], elapsed), "status": statuses[name]}
+    total = summarize([t for values in latencies.values() for t in values], sum(errors.values()), elapsed)
+    return {"total": total, "endpoints": endpoints}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_mix_scenario(args, workdir: str, url: str) -> dict:
+    import mock_data_generator
+
+    os.environ["DATABASE_URL"] = url
+    import models
+    from database import engine
+
+    models.Base.metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        empty = conn.execute(models.Member.__table__.select().limit(1)).first() is None
+    if empty:
+        print(f"🎾 [Load] 테스트 데이터 생성 ({args.profile})")
+        mock_data_generator.generate(engine, seed=args.seed, **mock_data_generator.PROFILES[args.profile])
+    engine.dispose()
+
+    server = start_server(url, args.db_async, args.port, workdir, MIX_SERVER_ENV)
+    try:
+        base_url = f"http://127.0.0.1:{args.port}"
+        pool = login_pool(base_url, 200)
+        asyncio.run(run_mixed_load(base_url, pool, 4, 2))  # 예열
+        runs = {c: asyncio.run(run_mixed_load(base_url, pool, c, args.duration)) for c in args.concurrency}
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+    return {
+        "meta": {
+            "scenario": "mix",
+            "commit": git_commit(),
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "database": url.split("@")[-1],
+            "db_async": args.db_async,
+            "profile": args.profile if empty else "existing",
+            "seed": args.seed,
+            "duration": args.duration,
+            "mix": dict(MIXED_OPERATIONS),
+        },
+        "runs": {str(c): result for c, result in runs.items()},
+    }
+
+
+def print_mix_report(report: dict) -> None:
+    meta = report["meta"]
+    print(f"DB: {meta['database']}  커밋: {meta['commit']}  ({meta['duration']:.0f}초씩 측정)")
+    for concurrency, result in report["runs"].items():
+        print(f"\n동시 접속 {concurrency}")
+        print(f"{'작업':<22} {'요청':>7} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'오류':>5}")
+        for name, r in list(result["endpoints"].items()) + [("(전체)", result["total"])]:
+            print(f"{name:<22} {r['requests']:>7} {r['rps']:>8} {r['p50_ms']:>8} {r['p95_ms']:>8} "
+                  f"{r['p99_ms']:>8} {r['errors']:>5}")
+
+
+def login_token(base_url: str) -> str:
+    response = httpx.post(f"{base_url}/login", json={"phone": "01090000000", "pin": "1234"}, timeout=10)
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenario", choices=["db-mode", "mix"], default="db-mode")
+    parser.add_argument("--database-url")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[16, 64, 256])
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8711)
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    # --scenario mix 전용
+    parser.add_argument("--profile", default="small", help="mock_data_generator 프로필 (빈 DB일 때)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--db-async", action="store_true", help="DB_ASYNC=1로 서버 실행")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="tennis_load_")
+    url = args.database_url or f"sqlite:///{os.path.join(workdir, 'load.db')}"
+
+    if args.scenario == "mix":
+        report = run_mix_scenario(args, workdir, url)
+        print_mix_report(report)
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+        return
+
+    seed_database(url)
+
+    results = {}
+    for mode, db_async in (("sync", False), ("async", True)):
+        server = start_server(url, db_async, args.port, workdir)
+        try:
+            base_url = f"http://127.0.0.1:{args.port}"
+            token = login_token(base_url)
+            asyncio.run(run_load(base_url, token, 4, 2))  # 예열
+            results[mode] = {c: asyncio.run(run_load(base_url, token, c, args.duration)) for c in args.concurrency}
+        finally:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+    print(f"DB: {url.split('@')[-1]}  ({args.duration:.0f}초씩 측정)")
+    print(f"{'동시 접속':>8} {'모드':>6} {'rps':>9} {'p50':>8} {'p95':>8} {'p99':>8} {'오류':>5}")
+    for c in args.concurrency:
+        for mode in ("sync", "async"):
+            r = results[mode][c]
+            print(f"{c:>8} {mode:>6} {r['rps']:>9} {r['p50_ms']:>8} {r['p95_ms']:>8} {r['p99_ms']:>8} {r['errors']:>5}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
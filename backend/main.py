@@ -1,38 +1,68 @@
-from fastapi import FastAPI, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from fastapi import FastAPI, Depends, HTTPException, Query, status, Request, Response
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
+from contextlib import asynccontextmanager
+from starlette.responses import StreamingResponse
 import datetime
-import re  # 정규표현식 모듈 추가 (전화번호 정제용)
-from jose import JWTError, jwt
+import os
+import anyio
 
 # 절대 경로 import로 통일 (점 제거)
 import models
 import schemas
+import auth
+import database
 from database import SessionLocal, engine
-
-# DB 테이블 생성
-models.Base.metadata.create_all(bind=engine)
-
-# import 추가
-from apscheduler.schedulers.background import BackgroundScheduler
-from scheduler import reset_league_and_cleanup
-
-app = FastAPI()
-
-# 스케줄러 설정
-scheduler = BackgroundScheduler()
-# 매월 말일 23시 59분에 실행 (테스트를 위해 매일 실행하려면 day='last' 대신 hour, minute 조정 가능)
-# 여기서는 '매월 말일'을 트리거하기 위해 Cron 방식 사용
-scheduler.add_job(reset_league_and_cleanup, 'cron', day='last', hour=23, minute=59)
-scheduler.start()
+import match_stats
+import standings
+import league_history
+import tournament
+import rating
+import media_store
+import search
+import admission
+import scheduler
+import schedule_slots
+import events
+import metrics
+import serialization
+import compression
+from thumbnails import thumbnail_worker
+from cache import rankings_cache, rankings_cache_key, tournament_cache, conditional_response, make_etag
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 시작 작업은 import 시점이 아닌 워커 시작 시 실행 (uvicorn --workers N / gunicorn)
+    # DB 테이블 생성
+    models.Base.metadata.create_all(bind=engine)
+    # 게시글 전문 검색 색인 (SQLite FTS5 / MySQL FULLTEXT)
+    search.ensure_index(engine)
+
+    # 정기 작업: 모든 워커가 등록하되 DB 임대를 가진 한 곳에서만 실행
+    # (SCHEDULER_ENABLED=0이면 이 프로세스에서는 끄고 python scheduler.py로 별도 실행)
+    job_scheduler = None
+    if scheduler.SCHEDULER_ENABLED:
+        job_scheduler = scheduler.create_scheduler()
+        job_scheduler.start()
+    yield
+    if job_scheduler is not None:
+        scheduler.stop_scheduler(job_scheduler)
+    thumbnail_worker.shutdown()
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS 설정 (앱 접속 허용)
 from fastapi.middleware.cors import CORSMiddleware
 
-from fastapi.staticfiles import StaticFiles
+from media_server import MediaFiles
+
+# 업로드 파일 전송 (Range/ETag/immutable 캐시 지원, StaticFiles 대체)
+os.makedirs("uploads", exist_ok=True)
+app.mount("/images", MediaFiles(directory="uploads"), name="images")
 
-app.mount("/images", StaticFiles(directory="uploads"), name="images")
+# 로그인/업로드 동시 처리 수 제한 (CORS보다 안쪽: 503 응답에도 CORS 헤더 포함)
+app.add_middleware(admission.AdmissionMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -42,6 +72,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# JSON 응답 gzip/brotli 압축 (COMPRESS_MIN_SIZE 이상, 스트리밍 응답 제외)
+app.add_middleware(compression.CompressionMiddleware)
+
+# 라우트별 응답 시간 / 요청당 쿼리 수 (가장 바깥: CORS, 수락 제어 대기 시간까지 포함)
+app.add_middleware(metrics.MetricsMiddleware)
+
 # DB 세션 의존성 함수
 def get_db():
     db = SessionLocal()
@@ -50,51 +86,31 @@ def get_db():
     finally:
         db.close()
 
-# --- 1. 유틸리티 함수 (전화번호 숫자만 추출) ---
-def sanitize_phone(phone: str) -> str:
-    """하이픈, 공백 등을 제거하고 숫자만 남김"""
-    if not phone:
-        return ""
-    return re.sub(r'[^0-9]', '', str(phone))
-
-# --- JWT 설정 및 토큰 생성 ---
-SECRET_KEY = "tennis_club_secret_key"
-ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7 # 7 days
-
-def create_access_token(data: dict, expires_delta: Optional[datetime.timedelta] = None):
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.datetime.utcnow() + datetime.timedelta(minutes=15)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
-
-# --- OAuth2 Scheme ---
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
+# --- 1. 유틸리티 / JWT 설정 (auth.py, 비동기 라우트와 공용) ---
+from auth import sanitize_phone, oauth2_scheme, token_subject, login_response, principal_cache
 
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        phone: str = payload.get("sub")
-        if phone is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-    
+    # 회원 전체 정보가 필요한 경우 (/users/me)
+    phone = token_subject(token)
     user = db.query(models.Member).filter(models.Member.phone == phone).first()
     if user is None:
-        raise credentials_exception
+        raise auth.credentials_exception()
     return user
 
+def get_current_principal(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    # 권한 확인만 필요한 경우: 캐시의 id/name/role 사용, 캐시에 없을 때만 DB 조회
+    return auth.resolve_principal(
+        token,
+        lambda phone: db.query(models.Member).filter(models.Member.phone == phone).first()
+    )
+
+# 비동기 DB 모드 (DB_ASYNC=1): 주요 조회/로그인 라우트를 async 버전으로 먼저 등록
+# (같은 경로의 아래 동기 라우트보다 앞에 있어 우선 처리됨)
+if database.DB_ASYNC:
+    import async_routes
+    app.include_router(async_routes.router)
+    print("⚡ [DB] 비동기 모드: " + ", ".join(sorted({route.path for route in async_routes.router.routes})))
+
 # --- 2. 회원 관리 API ---
 
 @app.post("/members/", response_model=schemas.Member)
@@ -118,43 +134,19 @@ def create_member(member: schemas.MemberCreate, db: Session = Depends(get_db)):
     db.refresh(db_member)
     return db_member
 
-@app.post("/login", response_model=schemas.LoginResponse)
-def login(login_req: schemas.LoginRequest, db: Session = Depends(get_db)):
+@app.post("/login", response_model=schemas.LoginResponse, dependencies=[Depends(admission.login_rate_limit)])
+def login(request: Request, login_req: schemas.LoginRequest, db: Session = Depends(get_db)):
     try:
         # 전화번호 정제 (하이픈 제거)
         clean_phone = sanitize_phone(login_req.phone)
-        print(f"DEBUG: Login Attempt - Phone: '{clean_phone}', PIN: '{login_req.pin}'")
-        
         member = db.query(models.Member).filter(models.Member.phone == clean_phone).first()
-        
-        if not member:
-            raise HTTPException(status_code=400, detail="등록되지 않은 전화번호입니다.")
-        
-        if member.pin != login_req.pin:
-            raise HTTPException(status_code=400, detail="비밀번호가 틀렸습니다.")
-            
-        if not member.is_approved:
-            # 403 Forbidden: 승인 대기 중 (앱에서 PendingScreen으로 이동)
-            raise HTTPException(status_code=403, detail="승인 대기 중입니다.")
-            
-        # 토큰 생성
-        access_token_expires = datetime.timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token = create_access_token(
-            data={"sub": member.phone}, expires_delta=access_token_expires
-        )
-        
-        return {
-            "access_token": access_token,
-            "token_type": "bearer",
-            "id": member.id,
-            "name": member.name,
-            "phone": member.phone,
-            "role": member.role,
-            "is_approved": member.is_approved
-        }
+        return login_response(member, login_req.pin)
         
     except Exception as e:
         print(f"LOGIN ERROR: {str(e)}")
+        if isinstance(e, HTTPException) and e.status_code == 400:
+            # 등록되지 않은 번호 / PIN 불일치만 실패 횟수로 계산
+            admission.login_failed(request, login_req.phone)
         # 앱이 죽지 않도록 500 에러 대신 명확한 메시지 전달
         raise HTTPException(status_code=500, detail=f"로그인 처리 중 오류: {str(e)}")
 
@@ -169,20 +161,20 @@ def read_members(
     is_approved: Optional[bool] = None, 
     db: Session = Depends(get_db)
 ):
-    # is_active가 True인(활동 중인) 회원만 필터링
-    query = db.query(models.Member).filter(models.Member.is_active == True)
+    # is_active가 True인(활동 중인) 회원만 필터링, 응답에 필요한 컬럼만 조회
+    query = db.query(*serialization.columns(models.Member, schemas.Member)).filter(models.Member.is_active == True)
     
     if is_approved is not None:
         query = query.filter(models.Member.is_approved == is_approved)
         
-    members = query.offset(skip).limit(limit).all()
-    return members
+    rows = query.order_by(models.Member.id).offset(skip).limit(limit).all()
+    return serialization.FastJSONResponse(serialization.project(rows, serialization.MEMBER_FIELDS))
 
 @app.put("/members/{member_id}/approve")
 def approve_member(
     member_id: int, 
     db: Session = Depends(get_db),
-    current_user: models.Member = Depends(get_current_user)
+    current_user: auth.Principal = Depends(get_current_principal)
 ):
     # 1. 관리자 권한 체크
     if current_user.role != "ADMIN":
@@ -196,6 +188,10 @@ def approve_member(
     # 3. 승인 처리
     member.is_approved = True
     db.commit()
+    rankings_cache.invalidate("회원 승인")
+    principal_cache.invalidate(member.phone, "회원 승인")
+    events.publish("members", "approved", id=member_id)
+    events.publish("rankings", "changed")
     
     print(f"✅ [Server Log] 회원 승인 완료: {member.name} (ID: {member_id})")
     return {"message": f"{member.name}님의 가입이 승인되었습니다."}
@@ -204,7 +200,7 @@ def approve_member(
 def delete_member(
     member_id: int, 
     db: Session = Depends(get_db), 
-    current_user: models.Member = Depends(get_current_user)
+    current_user: auth.Principal = Depends(get_current_principal)
 ):
     if current_user.role != "ADMIN":
         raise HTTPException(
@@ -219,88 +215,146 @@ def delete_member(
     # [핵심] DB에서 지우지 않고 플래그만 변경 (경기 기록 보존)
     member.is_active = False
     db.commit()
+    rankings_cache.invalidate("회원 삭제")
+    principal_cache.invalidate(member.phone, "회원 삭제")
+    events.publish("members", "deleted", id=member_id)
+    events.publish("rankings", "changed")
     
     print(f"🗑️ [Soft Delete] 회원 숨김 처리: {member.name}")
     return {"message": "회원이 탈퇴(숨김) 처리되었습니다.", "deleted_id": member_id}
 
+@app.put("/members/{member_id}/role")
+def update_member_role(
+    member_id: int,
+    role_update: schemas.MemberRoleUpdate,
+    db: Session = Depends(get_db),
+    current_user: auth.Principal = Depends(get_current_principal)
+):
+    if current_user.role != "ADMIN":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="권한이 없습니다. (ADMIN only)"
+        )
+
+    member = db.query(models.Member).filter(models.Member.id == member_id).first()
+    if not member:
+        raise HTTPException(status_code=404, detail="해당 회원을 찾을 수 없습니다.")
+
+    member.role = role_update.role
+    db.commit()
+    # 캐시된 권한 즉시 무효화 (클레임 토큰은 재로그인 시 반영)
+    principal_cache.invalidate(member.phone, "권한 변경")
+
+    print(f"🔑 [Server Log] 회원 권한 변경: {member.name} -> {member.role}")
+    return {"message": f"{member.name}님의 권한이 {member.role}(으)로 변경되었습니다."}
+
+@app.get("/auth/cache")
+def get_principal_cache_stats():
+    # 인증 캐시 적중률 확인용
+    return principal_cache.stats()
+
+@app.get("/admission")
+def get_admission_stats():
+    # 로그인 시도 제한 / 업로드 동시 처리 현황
+    return admission.stats()
+
 # --- 3. 리그 및 경기 API ---
 
 @app.post("/matches", response_model=schemas.Match)
 def create_match(match: schemas.MatchCreate, db: Session = Depends(get_db)):
-    # 1. 경기 기록 생성
-    db_match = models.Match(
-        team_a_player1_id=match.team_a_player1_id,
-        team_a_player2_id=match.team_a_player2_id,
-        team_b_player1_id=match.team_b_player1_id,
-        team_b_player2_id=match.team_b_player2_id,
-        score_team_a=match.score_team_a,
-        score_team_b=match.score_team_b
-    )
-    db.add(db_match)
-
-    # 2. 선수 스탯 업데이트
-    # Team A members
-    ta_p1 = db.query(models.Member).filter(models.Member.id == match.team_a_player1_id).first()
-    ta_p2 = db.query(models.Member).filter(models.Member.id == match.team_a_player2_id).first()
-    
-    # Team B members
-    tb_p1 = db.query(models.Member).filter(models.Member.id == match.team_b_player1_id).first()
-    tb_p2 = db.query(models.Member).filter(models.Member.id == match.team_b_player2_id).first()
-
-    if not ta_p1 or not ta_p2 or not tb_p1 or not tb_p2:
+    # 1. 경기 기록 생성 + 2. 선수 스탯 업데이트
+    # 스탯은 UPDATE members SET col = col + :delta 로 DB에서 원자적으로 증가시킴
+    # (여러 워커가 같은 선수의 경기를 동시에 등록해도 갱신 유실 없음)
+    db_match = match_stats.record_match(db, match)
+    if db_match is None:
         raise HTTPException(status_code=404, detail="참가 선수를 찾을 수 없습니다.")
 
-    # 득실차 계산
-    diff = match.score_team_a - match.score_team_b
-    
-    ta_p1.game_diff += diff
-    ta_p2.game_diff += diff
-    
-    tb_p1.game_diff -= diff
-    tb_p2.game_diff -= diff
-
-    # 승점 및 승무패 기록 (승3, 무1, 패0)
-    if match.score_team_a > match.score_team_b:
-        # Team A Win
-        ta_p1.rank_point += 3
-        ta_p2.rank_point += 3
-        ta_p1.wins += 1
-        ta_p2.wins += 1
-        
-        tb_p1.losses += 1
-        tb_p2.losses += 1
-        
-    elif match.score_team_a < match.score_team_b:
-        # Team B Win
-        tb_p1.rank_point += 3
-        tb_p2.rank_point += 3
-        tb_p1.wins += 1
-        tb_p2.wins += 1
-        
-        ta_p1.losses += 1
-        ta_p2.losses += 1
-        
-    else:
-        # Draw
-        ta_p1.rank_point += 1
-        ta_p2.rank_point += 1
-        tb_p1.rank_point += 1
-        tb_p2.rank_point += 1
-        
-        ta_p1.draws += 1
-        ta_p2.draws += 1
-        tb_p1.draws += 1
-        tb_p2.draws += 1
-
     db.commit()
+    rankings_cache.invalidate("경기 등록")
     db.refresh(db_match)
+    events.publish("matches", "created", id=db_match.id)
+    events.publish("rankings", "changed")
     return db_match
 
+# 한 번에 등록 가능한 최대 경기 수 (대회 당일 일괄 입력용)
+MAX_MATCH_BATCH = 200
+
+@app.post("/matches/batch", response_model=schemas.MatchBatchResult)
+def create_matches_batch(matches: List[schemas.MatchCreate], db: Session = Depends(get_db)):
+    if len(matches) > MAX_MATCH_BATCH:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {MAX_MATCH_BATCH}경기까지 등록할 수 있습니다.")
+
+    # 1. 모든 참가 선수를 IN (...) 쿼리 한 번으로 조회
+    all_ids = set()
+    for match in matches:
+        all_ids.update(match_stats.participant_ids(match))
+    members = match_stats.load_members(db, all_ids)
+
+    # 2. 경기별 검증 + 회원별 변화량 메모리 합산
+    results = []
+    accepted = []
+    totals = {}
+    for index, match in enumerate(matches):
+        if any(mid not in members for mid in match_stats.participant_ids(match)):
+            results.append(schemas.MatchBatchItemResult(index=index, error="참가 선수를 찾을 수 없습니다."))
+            continue
+        db_match = models.Match(**match.model_dump())
+        accepted.append((index, db_match))
+        match_stats.merge_deltas(totals, match_stats.match_deltas(match))
+
+    # 3. 하나의 트랜잭션에서 경기 일괄 INSERT(match_stats.insert_matches) + 스탯 일괄 UPDATE
+    try:
+        # 레이팅은 입력 순서대로 앞 경기 결과를 반영해 계산
+        rating_totals = rating.assign(members, [db_match for _, db_match in accepted])
+        match_stats.insert_matches(db, [db_match for _, db_match in accepted])
+        match_stats.apply_member_deltas(db, totals)
+        rating.apply_deltas(db, rating_totals)
+
+        # 시즌(월)별 순위 프로젝션도 함께 갱신
+        season_totals = {}
+        for index, db_match in accepted:
+            season = standings.season_of(db_match.date)
+            match_stats.merge_deltas(
+                season_totals.setdefault(season, {}),
+                match_stats.match_deltas(db_match)
+            )
+        for season, deltas in season_totals.items():
+            standings.apply_season_deltas(db, season, deltas)
+
+        for index, db_match in accepted:
+            results.append(schemas.MatchBatchItemResult(
+                index=index,
+                match=schemas.Match(
+                    id=db_match.id,
+                    date=db_match.date,
+                    **{key: getattr(db_match, key) for key in schemas.MatchBase.model_fields}
+                )
+            ))
+        # 발행할 id는 commit 전에 수집 (commit 후 접근하면 경기마다 다시 SELECT)
+        created_ids = [db_match.id for _, db_match in accepted]
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"MATCH BATCH ERROR: {e}")
+        raise HTTPException(status_code=500, detail=f"경기 일괄 등록 실패: {str(e)}")
+
+    if accepted:
+        rankings_cache.invalidate("경기 일괄 등록")
+        events.publish("matches", "created", ids=created_ids)
+        events.publish("rankings", "changed")
+    results.sort(key=lambda r: r.index)
+    print(f"✅ [Server Log] 경기 일괄 등록: 성공 {len(accepted)}건 / 실패 {len(matches) - len(accepted)}건")
+    return schemas.MatchBatchResult(
+        created=len(accepted),
+        failed=len(matches) - len(accepted),
+        results=results
+    )
+
 @app.delete("/matches/{match_id}")
 def delete_match(
     match_id: int, 
     db: Session = Depends(get_db), 
-    current_user: models.Member = Depends(get_current_user)
+    current_user: auth.Principal = Depends(get_current_principal)
 ):
     # 권한 체크: ADMIN만 삭제 가능
     if current_user.role != "ADMIN":
@@ -309,118 +363,215 @@ def delete_match(
             detail="권한이 없습니다. (ADMIN only)"
         )
     
-    match = db.query(models.Match).filter(models.Match.id == match_id).first()
-    if not match:
+    # --- 경기 삭제 + 스탯 롤백 (Rollback Stats) ---
+    # DELETE가 성공한 요청만 롤백 변화량을 원자적으로 반영
+    if match_stats.remove_match(db, match_id) is None:
         raise HTTPException(status_code=404, detail="Match not found")
-    
-    # --- 스탯 롤백 (Rollback Stats) ---
-    ta_p1 = db.query(models.Member).filter(models.Member.id == match.team_a_player1_id).first()
-    ta_p2 = db.query(models.Member).filter(models.Member.id == match.team_a_player2_id).first()
-    tb_p1 = db.query(models.Member).filter(models.Member.id == match.team_b_player1_id).first()
-    tb_p2 = db.query(models.Member).filter(models.Member.id == match.team_b_player2_id).first()
-
-    # Note: If a player was deleted, we skip their update (or handle gracefully)
-    # But current logic deletes match before player, so valid IDs should exist unless forced otherwise.
-    
-    # 득실차 복구
-    diff = match.score_team_a - match.score_team_b
-    
-    if ta_p1: ta_p1.game_diff -= diff
-    if ta_p2: ta_p2.game_diff -= diff
-    
-    if tb_p1: tb_p1.game_diff += diff
-    if tb_p2: tb_p2.game_diff += diff
-    
-    # 승패/승점 복구
-    if match.score_team_a > match.score_team_b:
-        # Team A Won (Revert: -3 pts, -1 win for A / -1 loss for B)
-        if ta_p1:
-            ta_p1.rank_point -= 3
-            ta_p1.wins -= 1
-        if ta_p2:
-            ta_p2.rank_point -= 3
-            ta_p2.wins -= 1
-            
-        if tb_p1: tb_p1.losses -= 1
-        if tb_p2: tb_p2.losses -= 1
-            
-    elif match.score_team_a < match.score_team_b:
-        # Team B Won (Revert: -3 pts, -1 win for B / -1 loss for A)
-        if tb_p1:
-            tb_p1.rank_point -= 3
-            tb_p1.wins -= 1
-        if tb_p2:
-            tb_p2.rank_point -= 3
-            tb_p2.wins -= 1
-            
-        if ta_p1: ta_p1.losses -= 1
-        if ta_p2: ta_p2.losses -= 1
-            
-    else:
-        # Draw (Revert: -1 pts, -1 draw for All)
-        if ta_p1:
-            ta_p1.rank_point -= 1
-            ta_p1.draws -= 1
-        if ta_p2:
-            ta_p2.rank_point -= 1
-            ta_p2.draws -= 1
-            
-        if tb_p1:
-            tb_p1.rank_point -= 1
-            tb_p1.draws -= 1
-        if tb_p2:
-            tb_p2.rank_point -= 1
-            tb_p2.draws -= 1
-
-    # 경기 삭제
-    db.delete(match)
     db.commit()
+    rankings_cache.invalidate("경기 삭제")
+    events.publish("matches", "deleted", id=match_id)
+    events.publish("rankings", "changed")
     print(f"✅ [Server Log] 경기 삭제 및 스탯 롤백 완료 (Match ID: {match_id})")
     
     return {"message": "Match deleted and stats rolled back successfully"}
 
+@app.put("/matches/{match_id}", response_model=schemas.Match)
+def update_match(
+    match_id: int,
+    match_update: schemas.MatchCreate,
+    db: Session = Depends(get_db),
+    current_user: auth.Principal = Depends(get_current_principal)
+):
+    # 권한 체크: ADMIN만 수정 가능
+    if current_user.role != "ADMIN":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, 
+            detail="권한이 없습니다. (ADMIN only)"
+        )
+
+    # 삭제 후 재등록 대신 (새 결과 - 기존 결과) 변화량만 반영
+    try:
+        match = match_stats.edit_match(db, match_id, match_update)
+    except match_stats.MatchConflict:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="다른 사용자가 먼저 경기 결과를 수정했습니다. 다시 시도해주세요.")
+    if match is None:
+        raise HTTPException(status_code=404, detail="경기 또는 참가 선수를 찾을 수 없습니다.")
+
+    db.commit()
+    rankings_cache.invalidate("경기 수정")
+    events.publish("matches", "updated", id=match_id)
+    events.publish("rankings", "changed")
+    db.refresh(match)
+    print(f"✅ [Server Log] 경기 결과 수정 완료 (Match ID: {match_id})")
+    return match
+
 @app.get("/matches", response_model=List[schemas.MatchHistoryResponse])
-def read_matches(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    matches = db.query(models.Match).order_by(models.Match.id.desc()).offset(skip).limit(limit).all()
-    
-    result = []
-    for m in matches:
-        # Resolve names. If player is deleted/null, handle gracefully.
-        ta_p1 = m.team_a_player1.name if m.team_a_player1 else "Unknown"
-        ta_p2 = m.team_a_player2.name if m.team_a_player2 else "Unknown"
-        tb_p1 = m.team_b_player1.name if m.team_b_player1 else "Unknown"
-        tb_p2 = m.team_b_player2.name if m.team_b_player2 else "Unknown"
-        
-        result.append(schemas.MatchHistoryResponse(
-            id=m.id,
-            date=m.date,
-            score_team_a=m.score_team_a,
-            score_team_b=m.score_team_b,
-            team_a_names=f"{ta_p1}, {ta_p2}",
-            team_b_names=f"{tb_p1}, {tb_p2}"
-        ))
-        
-    return result
+def read_matches(
+    skip: int = 0,
+    limit: int = 100,
+    before_id: Optional[int] = None,
+    member_id: Optional[int] = None,
+    date_from: Optional[datetime.date] = None,
+    date_to: Optional[datetime.date] = None,
+    db: Session = Depends(get_db)
+):
+    limit = max(1, min(limit, 200))
+    # 선수 이름은 한 번의 JOIN 쿼리로 조회 (N+1 방지), 커서/필터 조건은 match_stats.history_statement
+    rows = db.execute(match_stats.history_statement(
+        limit=limit, skip=skip, before_id=before_id, member_id=member_id,
+        date_from=date_from, date_to=date_to
+    )).all()
+    response = serialization.FastJSONResponse(match_stats.history_response(rows))
+
+    # 다음 페이지 커서 (마지막 페이지이거나 결과가 없으면 생략)
+    if rows and len(rows) == limit:
+        response.headers["X-Next-Before-Id"] = str(rows[-1][0])
+    return response
 
 @app.get("/league/rankings", response_model=List[schemas.Member])
-def get_rankings(db: Session = Depends(get_db)):
-    # 순위 산정: 승점 > 득실차 > 승수 내림차순
-    # 승인된 회원만 랭킹에 표시
-    rankings = db.query(models.Member).filter(models.Member.is_approved == True).order_by(
-        models.Member.rank_point.desc(),
-        models.Member.game_diff.desc(),
-        models.Member.wins.desc()
-    ).all()
-    return rankings
+def get_rankings(request: Request, as_of: Optional[datetime.date] = None, db: Session = Depends(get_db)):
+    # 직렬화된 응답을 캐시하고 ETag로 변경 여부 확인
+    # 캐시 적중 시 DB 조회 없이 응답 (ETag 일치 시 304 Not Modified)
+    cache_key = rankings_cache_key(as_of)
+    cached = rankings_cache.get(cache_key) if cache_key else None
+    if cached is None:
+        version = rankings_cache.version()
+        if as_of is not None:
+            # 특정 날짜 기준 순위: matches 원장 기반 프로젝션에서 계산
+            rankings = standings.rankings_as_of(db, as_of)
+        else:
+            # 순위 산정: 승점 > 득실차 > 승수 내림차순
+            # 승인된 회원만 랭킹에 표시
+            rankings = serialization.project(
+                db.execute(standings.live_rankings_statement()).all(), serialization.MEMBER_FIELDS
+            )
+        body = serialization.dumps(rankings)
+        etag = rankings_cache.set(cache_key, body, version) if cache_key else make_etag(body)
+    else:
+        etag, body = cached
+
+    return conditional_response(rankings_cache, request, etag, body)
+
+@app.get("/league/rankings/cache")
+def get_rankings_cache_stats():
+    # 순위 캐시 적중률 확인용
+    return rankings_cache.stats()
+
+@app.get("/scheduler")
+def read_scheduler_status(db: Session = Depends(get_db)):
+    # 현재 정기 작업 리더와 최근 작업 실행 기록 (소요 시간/결과)
+    return scheduler.status(db)
+
+# --- 실시간 변경 알림 (SSE) ---
+
+@app.get("/events")
+async def stream_events(topics: Optional[str] = None):
+    """
+    text/event-stream 구독 (topics: rankings,matches,schedules,members 중 콤마 구분, 기본 전체)
+    이벤트는 변경 종류와 id만 담으므로 앱은 해당 화면만 다시 조회
+    """
+    try:
+        topic_list = events.parse_topics(topics)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    subscriber = events.hub.subscribe(topic_list)
+    if subscriber is None:
+        raise HTTPException(status_code=503, detail="실시간 알림 접속자가 많습니다.", headers={"Retry-After": "30"})
+    return StreamingResponse(
+        events.stream(subscriber),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/events/stats")
+def read_event_stats():
+    return events.hub.stats()
+
+@app.get("/metrics")
+def read_metrics():
+    # Prometheus 수집용: 라우트별 응답 시간/쿼리 수, 연결 풀, 캐시, 실시간 알림, 수락 제어
+    return Response(content=metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/db/pool")
+async def read_pool_stats():
+    """
+    DB 연결 풀 상태 (대여 대기 시간, 포화도)
+    동기 라우트는 스레드풀 스레드 수만큼 동시에 연결을 요구하므로 threadpool_tokens와 비교하여 풀 크기 조정
+    """
+    stats = {
+        "threadpool_tokens": anyio.to_thread.current_default_thread_limiter().total_tokens,
+        "sync": database.pool_stats(),
+    }
+    if database.DB_ASYNC:
+        stats["async"] = database.pool_stats(database.get_async_engine().sync_engine)
+    return stats
+
+@app.get("/league/history", response_model=List[schemas.LeagueHistoryResponse])
+def read_league_history(
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    member_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db)
+):
+    # 지난 월별 기록 조회 (member_id, year, month 복합 인덱스 사용)
+    history = models.LeagueHistory
+    query = db.query(history).options(joinedload(history.member))
+    if member_id is not None:
+        query = query.filter(history.member_id == member_id)
+    if year is not None:
+        query = query.filter(history.year == year)
+    if month is not None:
+        query = query.filter(history.month == month)
+
+    if member_id is not None and month is None:
+        # 한 회원의 월별 추이: 최근 월부터
+        query = query.order_by(history.year.desc(), history.month.desc())
+    else:
+        # 특정 월 순위: 승점 > 득실차 > 승수
+        query = query.order_by(
+            history.total_points.desc(),
+            history.final_diff.desc(),
+            history.final_wins.desc()
+        )
+    return query.offset(skip).limit(limit).all()
+
+@app.get("/league/rolling", response_model=List[schemas.LeagueRollingResponse])
+def read_league_rolling(window: int = league_history.SEEDING_WINDOW, limit: int = 100, db: Session = Depends(get_db)):
+    # 최근 N개월 누적 순위 (월말 정산 시 미리 계산된 집계 테이블 조회)
+    if window not in league_history.ROLLING_WINDOWS:
+        raise HTTPException(status_code=400, detail=f"지원하는 기간: {list(league_history.ROLLING_WINDOWS)}개월")
+    rolling = models.LeagueRollingPoints
+    return db.query(rolling).options(joinedload(rolling.member))\
+        .filter(rolling.window_months == window)\
+        .order_by(rolling.total_points.desc(), rolling.total_diff.desc())\
+        .limit(limit).all()
 
 # --- 4. 운동 약속 (Schedule) API ---
 
+def _schedule_minutes(schedule: schemas.ScheduleCreate, db: Session, member_id: int, exclude_id: Optional[int] = None):
+    # 시작/종료를 분 단위로 변환 후 같은 회원의 겹치는 약속 확인
+    start = schedule_slots.to_minute(schedule.start_time)
+    end = schedule_slots.to_minute(schedule.end_time)
+    if end <= start:
+        raise HTTPException(status_code=400, detail="종료 시간은 시작 시간보다 늦어야 합니다.")
+    conflict = schedule_slots.find_overlap(db, member_id, schedule.date, start, end, exclude_id)
+    if conflict:
+        raise HTTPException(
+            status_code=409,
+            detail=f"같은 시간에 이미 등록한 약속이 있습니다. ({conflict.start_time}~{conflict.end_time})"
+        )
+    return start, end
+
 @app.post("/schedules", response_model=schemas.Schedule)
 def create_schedule(
     schedule: schemas.ScheduleCreate, 
     db: Session = Depends(get_db),
-    current_user: models.Member = Depends(get_current_user)
+    current_user: auth.Principal = Depends(get_current_principal)
 ):
+    start_minute, end_minute = _schedule_minutes(schedule, db, current_user.id)
     try:
         # DB에 저장할 때는 date 객체 사용 (입력받은 날짜 사용)
         # start_time, end_time은 time 객체이므로 문자열로 변환하여 저장
@@ -430,11 +581,14 @@ def create_schedule(
             member_name=current_user.name, 
             start_time=schedule.start_time.strftime("%H:%M"),
             end_time=schedule.end_time.strftime("%H:%M"),
+            start_minute=start_minute,
+            end_minute=end_minute,
             date=schedule.date
         )
         db.add(db_schedule)
         db.commit()
         db.refresh(db_schedule)
+        events.publish("schedules", "created", id=db_schedule.id, date=db_schedule.date.isoformat())
         return db_schedule
     except Exception as e:
         print(f"SCHEDULE ERROR: {e}")
@@ -444,23 +598,35 @@ def create_schedule(
 def read_schedules(
     skip: int = 0, 
     limit: int = 100, 
+    date_from: Optional[datetime.date] = Query(None, alias="from"),
+    date_to: Optional[datetime.date] = Query(None, alias="to"),
     db: Session = Depends(get_db)
 ):
-    today = datetime.date.today()
-    
-    # 날짜가 '오늘'인 데이터만 조회
-    schedules = db.query(models.Schedule)\
-        .filter(models.Schedule.date == today)\
-        .offset(skip).limit(limit).all()
-        
-    return schedules
+    # 기간 조회 (기본: 오늘), (date, start_minute) 인덱스로 날짜/시간 순
+    date_from = date_from or datetime.date.today()
+    date_to = date_to or date_from
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="조회 종료일이 시작일보다 빠릅니다.")
+
+    return schedule_slots.range_query(db, date_from, date_to, skip, min(limit, 500))
+
+@app.get("/schedules/occupancy", response_model=List[schemas.ScheduleSlot])
+def read_schedule_occupancy(
+    date: Optional[datetime.date] = None,
+    slot: int = schedule_slots.DEFAULT_SLOT_MINUTES,
+    db: Session = Depends(get_db)
+):
+    # 시간대별 코트 인원 (약속이 있는 시간대만)
+    if slot < 5 or slot > 240:
+        raise HTTPException(status_code=400, detail="시간대 단위는 5~240분이어야 합니다.")
+    return schedule_slots.occupancy(db, date or datetime.date.today(), slot)
 
 @app.put("/schedules/{schedule_id}")
 def update_schedule(
     schedule_id: int,
     schedule_update: schemas.ScheduleCreate, 
     db: Session = Depends(get_db),
-    current_user: models.Member = Depends(get_current_user)
+    current_user: auth.Principal = Depends(get_current_principal)
 ):
     schedule = db.query(models.Schedule).filter(models.Schedule.id == schedule_id).first()
     if not schedule:
@@ -470,17 +636,21 @@ def update_schedule(
     if schedule.member_id != current_user.id and current_user.role != "ADMIN":
         raise HTTPException(status_code=403, detail="수정 권한이 없습니다.")
 
+    start_minute, end_minute = _schedule_minutes(schedule_update, db, schedule.member_id, exclude_id=schedule.id)
     schedule.start_time = schedule_update.start_time.strftime("%H:%M")
     schedule.end_time = schedule_update.end_time.strftime("%H:%M")
+    schedule.start_minute = start_minute
+    schedule.end_minute = end_minute
     schedule.date = schedule_update.date
     db.commit()
+    events.publish("schedules", "updated", id=schedule_id, date=schedule.date.isoformat())
     return {"message": "수정되었습니다."}
 
 @app.delete("/schedules/{schedule_id}")
 def delete_schedule(
     schedule_id: int,
     db: Session = Depends(get_db),
-    current_user: models.Member = Depends(get_current_user)
+    current_user: auth.Principal = Depends(get_current_principal)
 ):
     schedule = db.query(models.Schedule).filter(models.Schedule.id == schedule_id).first()
     if not schedule:
@@ -489,61 +659,110 @@ def delete_schedule(
     if schedule.member_id != current_user.id and current_user.role != "ADMIN":
         raise HTTPException(status_code=403, detail="삭제 권한이 없습니다.")
 
+    schedule_date = schedule.date
     db.delete(schedule)
     db.commit()
+    events.publish("schedules", "deleted", id=schedule_id, date=schedule_date.isoformat())
     return {"message": "삭제되었습니다."}
 
 # --- 5. 토너먼트 (Tournament) API ---
 
+def _seeded_entrants(db: Session, entrants: int, seed_by: str) -> list:
+    # 시드 순 참가자 선발 (활동 중인 승인 회원만)
+    #   seed_by=points: 최근 6개월 누적 승점 상위 -> 부족하면 현재 리그 순위로 보충
+    #   seed_by=rating: 레이팅 상위
+    if entrants < 2 or entrants > 256:
+        raise HTTPException(status_code=400, detail="참가 인원은 2~256명이어야 합니다.")
+    if seed_by not in tournament.SEED_SOURCES:
+        raise HTTPException(status_code=400, detail=f"시드 기준은 {', '.join(tournament.SEED_SOURCES)} 중 하나여야 합니다.")
+    seeded_ids = tournament.seed_member_ids(db, entrants, seed_by)
+    if len(seeded_ids) < entrants:
+        raise HTTPException(status_code=400, detail=f"토너먼트 인원 부족 (최소 {entrants}명 필요)")
+    return seeded_ids
+
+@app.post("/tournament/preview", response_model=schemas.TournamentBracket)
+def preview_tournament(
+    entrants: int = 8,
+    name: Optional[str] = None,
+    seed_by: str = "points",
+    db: Session = Depends(get_db)
+):
+    # 대진표 미리보기: 저장하지 않음 (/tournament/current 변경 없음, 로그인 불필요)
+    return tournament.preview_bracket(db, _seeded_entrants(db, entrants, seed_by), name)
+
 @app.post("/tournament/generate", response_model=schemas.TournamentBracket)
-def generate_tournament(db: Session = Depends(get_db)):
-    # 1. 최근 6개월 기록 합산 (단순화를 위해 전체 합산)
-    history = db.query(models.LeagueHistory).all()
-    
-    points_map = {}
-    for h in history:
-        if h.member_id not in points_map:
-            points_map[h.member_id] = 0
-        points_map[h.member_id] += h.total_points
-        
-    # 2. 점수순 정렬
-    sorted_members = sorted(points_map.items(), key=lambda item: item[1], reverse=True)
-    
-    # 3. 상위 8명 선발
-    top_8_ids = [m[0] for m in sorted_members[:8]]
-    
-    if len(top_8_ids) < 8:
-        # 데이터가 부족할 경우 현재 멤버에서 보충 (에러 방지용)
-        remaining_members = db.query(models.Member).filter(models.Member.id.notin_(top_8_ids)).limit(8 - len(top_8_ids)).all()
-        for rm in remaining_members:
-            top_8_ids.append(rm.id)
-            
-        if len(top_8_ids) < 8:
-             raise HTTPException(status_code=400, detail="토너먼트 인원 부족 (최소 8명 필요)")
-        
-    top_8_members = []
-    for mid in top_8_ids:
-        member = db.query(models.Member).filter(models.Member.id == mid).first()
-        top_8_members.append(member)
-        
-    # 4. 시드 배정 (1위 vs 8위, 2위 vs 7위 ...)
-    matches = []
-    
-    def create_match_obj(id, p1_idx, p2_idx):
-        return schemas.TournamentMatch(
-            match_id=id,
-            round="8강전",
-            player1=top_8_members[p1_idx].name,
-            player2=top_8_members[p2_idx].name
+def generate_tournament(
+    entrants: int = 8,
+    name: Optional[str] = None,
+    seed_by: str = "points",
+    db: Session = Depends(get_db),
+    current_user: auth.Principal = Depends(get_current_principal)
+):
+    # 권한 체크: 대진표 저장(/tournament/current 교체)은 ADMIN만 가능
+    if current_user.role != "ADMIN":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="권한이 없습니다. (ADMIN only)"
         )
+    seeded_ids = _seeded_entrants(db, entrants, seed_by)
 
-    # 8강 대진표 (승자가 4강에서 만나는 구조 고려)
-    matches.append(create_match_obj(1, 0, 7)) # 1위 vs 8위
-    matches.append(create_match_obj(2, 3, 4)) # 4위 vs 5위
-    matches.append(create_match_obj(3, 2, 5)) # 3위 vs 6위
-    matches.append(create_match_obj(4, 1, 6)) # 2위 vs 7위
-    
-    return schemas.TournamentBracket(matches=matches)
+    # 대진표 생성 및 저장 (1위 vs 최하위 시드 ..., 빈 자리는 상위 시드 부전승)
+    new_tournament = tournament.create_tournament(db, seeded_ids, name)
+    db.commit()
+    tournament_cache.invalidate("토너먼트 생성")
+    print(f"🏆 [Server Log] 토너먼트 생성: {new_tournament.name} ({entrants}명, ID: {new_tournament.id})")
+
+    return tournament.bracket_state(db, new_tournament.id)
+
+def _bracket_response(request: Request, cache_key: str, tournament_id_getter, db: Session):
+    # 직렬화된 대진표를 캐시하고 ETag로 변경 여부 확인
+    cached = tournament_cache.get(cache_key)
+    if cached is None:
+        version = tournament_cache.version()
+        tournament_id = tournament_id_getter()
+        bracket = tournament.bracket_state(db, tournament_id) if tournament_id else None
+        if bracket is None:
+            raise HTTPException(status_code=404, detail="토너먼트를 찾을 수 없습니다.")
+        body = bracket.model_dump_json().encode()
+        etag = tournament_cache.set(cache_key, body, version)
+    else:
+        etag, body = cached
+
+    return conditional_response(tournament_cache, request, etag, body)
+
+@app.get("/tournament/current", response_model=schemas.TournamentBracket)
+def read_current_tournament(request: Request, db: Session = Depends(get_db)):
+    # 가장 최근 토너먼트 대진표 (캐시)
+    return _bracket_response(request, "current", lambda: tournament.latest_tournament_id(db), db)
+
+@app.get("/tournament/{tournament_id}", response_model=schemas.TournamentBracket)
+def read_tournament(tournament_id: int, request: Request, db: Session = Depends(get_db)):
+    return _bracket_response(request, f"id:{tournament_id}", lambda: tournament_id, db)
+
+@app.put("/tournament/matches/{bracket_match_id}/result", response_model=schemas.TournamentBracket)
+def record_tournament_result(
+    bracket_match_id: int,
+    result: schemas.TournamentResultCreate,
+    db: Session = Depends(get_db),
+    current_user: auth.Principal = Depends(get_current_principal)
+):
+    # 권한 체크: ADMIN만 결과 입력 가능
+    if current_user.role != "ADMIN":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="권한이 없습니다. (ADMIN only)"
+        )
+
+    # 경기 결과 입력 -> 승자를 다음 라운드로 진출
+    try:
+        tournament_id = tournament.record_result(db, bracket_match_id, result.winner_id, result.score1, result.score2)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    db.commit()
+    tournament_cache.invalidate("토너먼트 결과 입력")
+    return tournament.bracket_state(db, tournament_id)
 
 # --- 6. 커뮤니티 (Community) API ---
 
@@ -574,70 +793,199 @@ def delete_post(post_id: int, password: str, db: Session = Depends(get_db)):
     db.commit()
     return {"detail": "게시글이 삭제되었습니다."}
 
-@app.get("/community", response_model=List[schemas.CommunityPostResponse])
-def read_posts(db: Session = Depends(get_db)):
-    # 1. 30일 지난 게시글 자동 삭제
-    cutoff_date = datetime.datetime.now() - datetime.timedelta(days=30)
-    db.query(models.CommunityPost).filter(models.CommunityPost.created_at < cutoff_date).delete()
-    db.commit()
-    
-    # 2. 최신순 조회
-    posts = db.query(models.CommunityPost).order_by(models.CommunityPost.created_at.desc()).all()
-    return posts
+# 목록에서 보여줄 본문 앞부분 길이
+COMMUNITY_SNIPPET_LENGTH = 80
+
+@app.get("/community", response_model=List[schemas.CommunityPostSummary])
+def read_posts(
+    before: Optional[int] = None,
+    limit: int = 30,
+    db: Session = Depends(get_db)
+):
+    """
+    최신순 게시글 목록 (제목, 작성자, 본문 앞부분)
+    - 30일 지난 글 삭제는 스케줄러(purge_expired_posts_job)가 처리 -> 조회는 읽기만 함
+    - 다음 페이지: 응답 헤더 X-Next-Before-Id 값을 ?before= 로 전달
+    """
+    limit = max(1, min(limit, 100))
+    query = db.query(
+        models.CommunityPost.id,
+        models.CommunityPost.title,
+        models.CommunityPost.author_name,
+        func.substr(models.CommunityPost.content, 1, COMMUNITY_SNIPPET_LENGTH).label("snippet"),
+        models.CommunityPost.created_at
+    )
+    # 커서 기반 페이지네이션 (ID는 작성 순서대로 증가, PK 인덱스 사용)
+    if before is not None:
+        query = query.filter(models.CommunityPost.id < before)
+    rows = query.order_by(models.CommunityPost.id.desc()).limit(limit).all()
+
+    response = serialization.FastJSONResponse([{
+        "id": row.id,
+        "title": row.title,
+        "author_name": row.author_name,
+        "snippet": row.snippet or "",
+        "created_at": row.created_at,
+    } for row in rows])
+    if len(rows) == limit:
+        response.headers["X-Next-Before-Id"] = str(rows[-1].id)
+    return response
+
+# /community/{post_id}보다 먼저 등록해야 "search"가 ID로 해석되지 않음
+@app.get("/community/search", response_model=List[schemas.CommunitySearchResult])
+def search_community(q: str, limit: int = 20, db: Session = Depends(get_db)):
+    """제목/본문 전문 검색 (관련도 순)"""
+    limit = max(1, min(limit, 50))
+    return search.search_posts(db, q, limit)
+
+@app.get("/community/{post_id}", response_model=schemas.CommunityPostResponse)
+def read_post(post_id: int, db: Session = Depends(get_db)):
+    post = db.query(models.CommunityPost).filter(models.CommunityPost.id == post_id).first()
+    if not post:
+        raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
+    return post
 
 # --- 7. 갤러리 (Gallery) API ---
 
 import shutil
 import uuid
-import os
 from fastapi import File, UploadFile, Form
+from starlette.requests import ClientDisconnect
+
+# 조각 업로드 시 디스크에 한 번에 쓰는 크기 (요청 본문은 이 단위로만 메모리에 머무름)
+UPLOAD_WRITE_BUFFER = 1024 * 1024
+
+def _gallery_created(db: Session, db_gallery: models.Gallery):
+    db.commit()
+    db.refresh(db_gallery)
+    # 썸네일은 별도 프로세스에서 생성 후 thumbnail_path 갱신 (응답은 기다리지 않음)
+    # 같은 내용의 썸네일이 이미 있으면 재사용
+    if db_gallery.thumbnail_path is None:
+        thumbnail_worker.enqueue(db_gallery.id, db_gallery.file_path, db_gallery.file_type)
+    return db_gallery
 
 @app.post("/gallery", response_model=schemas.GalleryResponse)
-def upload_gallery(
+async def upload_gallery(
     file: UploadFile = File(...),
     uploader_name: str = Form(...),
     file_type: str = Form(...), # 'IMAGE' or 'VIDEO'
     db: Session = Depends(get_db)
 ):
-    # Create uploads directory if not exists
-    os.makedirs("uploads", exist_ok=True)
-    
-    # Generate unique filename
-    file_extension = file.filename.split(".")[-1]
-    unique_filename = f"{uuid.uuid4()}.{file_extension}"
-    file_path = f"uploads/{unique_filename}"
-    
-    # Save file
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-        
-    # Save to DB
-    db_gallery = models.Gallery(
-        uploader_name=uploader_name,
-        file_type=file_type,
-        file_path=file_path,
-        thumbnail_path=None
-    )
-    db.add(db_gallery)
+    """한 번에 올리는 업로드 (작은 사진용). 큰 동영상은 /gallery/uploads 이어받기 사용"""
+    # 파일 복사/해시는 업로드 전용 스레드에서 (기본 스레드풀은 조회 API용으로 유지)
+    return await admission.upload_gate.run_sync(_store_direct_upload, file, uploader_name, file_type, db)
+
+def _store_direct_upload(file: UploadFile, uploader_name: str, file_type: str, db: Session):
+    os.makedirs(media_store.PARTIAL_DIR, exist_ok=True)
+    temp_path = media_store.partial_path(f"direct-{uuid.uuid4()}")
+    try:
+        with open(temp_path, "wb") as buffer:
+            shutil.copyfileobj(file.file, buffer, media_store.HASH_BLOCK_SIZE)
+
+        # 내용 해시로 저장 (같은 파일이 이미 있으면 참조만 증가)
+        blob, _ = media_store.store_file(db, temp_path, media_store.file_extension(file.filename))
+        db_gallery = models.Gallery(
+            uploader_name=uploader_name,
+            file_type=file_type,
+            file_path=blob.file_path,
+            content_hash=blob.content_hash,
+            thumbnail_path=media_store.existing_thumbnail(blob.file_path)
+        )
+        db.add(db_gallery)
+        return _gallery_created(db, db_gallery)
+    except Exception:
+        # 롤백하면 저장소로 옮긴 새 파일이 임시 위치로 돌아오므로 그 뒤 임시 파일 삭제
+        db.rollback()
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+# 이어받기 업로드: 세션 생성 -> PUT 조각(offset) 반복 -> 완료
+@app.post("/gallery/uploads", response_model=schemas.UploadSessionStatus)
+def create_upload_session(data: schemas.UploadSessionCreate, db: Session = Depends(get_db)):
+    try:
+        session = media_store.create_session(db, data.uploader_name, data.file_type, data.filename, data.total_size)
+    except media_store.UploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     db.commit()
-    db.refresh(db_gallery)
-    
-    return db_gallery
+    return {"upload_id": session.id, "received": 0, "total_size": session.total_size}
+
+def _load_upload_session(upload_id: str) -> models.UploadSession:
+    db = SessionLocal()
+    try:
+        session = db.query(models.UploadSession).filter(models.UploadSession.id == upload_id).first()
+        if not session:
+            raise HTTPException(status_code=404, detail="업로드 세션을 찾을 수 없습니다.")
+        db.expunge(session)
+        return session
+    finally:
+        db.close()
+
+@app.get("/gallery/uploads/{upload_id}", response_model=schemas.UploadSessionStatus)
+def read_upload_session(upload_id: str):
+    """연결이 끊긴 뒤 이어서 보낼 위치(received) 확인"""
+    session = _load_upload_session(upload_id)
+    return {"upload_id": upload_id, "received": media_store.received_bytes(upload_id), "total_size": session.total_size}
+
+@app.put("/gallery/uploads/{upload_id}", response_model=schemas.UploadSessionStatus)
+async def append_upload_chunk(upload_id: str, offset: int, request: Request):
+    """
+    요청 본문(바이트)을 offset 위치부터 이어 씀
+    본문은 스트림으로 읽어 UPLOAD_WRITE_BUFFER 단위로 디스크에 기록 (파일 전체를 메모리에 올리지 않음)
+    """
+    run_sync = admission.upload_gate.run_sync
+    session = await run_sync(_load_upload_session, upload_id)
+    writer = media_store.ChunkWriter(session, offset)
+    buffer = bytearray()
+    try:
+        await run_sync(writer.open)
+        try:
+            async for chunk in request.stream():
+                buffer += chunk
+                if len(buffer) >= UPLOAD_WRITE_BUFFER:
+                    await run_sync(writer.write, buffer)
+                    buffer.clear()
+        except ClientDisconnect:
+            # 연결이 끊겨도 받은 만큼은 보존 -> 클라이언트가 상태 조회 후 이어서 전송
+            print(f"⚠️ [Upload] 연결 끊김 (세션: {upload_id}, 받은 크기: {writer.received + len(buffer)})")
+        if buffer:
+            await run_sync(writer.write, buffer)
+    except media_store.UploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    finally:
+        await run_sync(writer.close)
+    return {"upload_id": upload_id, "received": writer.received, "total_size": session.total_size}
+
+@app.post("/gallery/uploads/{upload_id}/complete", response_model=schemas.GalleryResponse)
+async def complete_upload(upload_id: str, db: Session = Depends(get_db)):
+    # 전체 파일 해시 계산 -> 업로드 전용 스레드
+    return await admission.upload_gate.run_sync(_finalize_upload, upload_id, db)
+
+def _finalize_upload(upload_id: str, db: Session):
+    session = db.query(models.UploadSession).filter(models.UploadSession.id == upload_id).first()
+    if not session:
+        raise HTTPException(status_code=404, detail="업로드 세션을 찾을 수 없습니다.")
+    try:
+        db_gallery, _ = media_store.finalize_session(db, session)
+    except media_store.UploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    return _gallery_created(db, db_gallery)
 
 @app.get("/gallery", response_model=List[schemas.GalleryResponse])
 def read_gallery(db: Session = Depends(get_db)):
-    return db.query(models.Gallery).order_by(models.Gallery.created_at.desc()).all()
+    rows = db.query(*serialization.columns(models.Gallery, schemas.GalleryResponse))\
+        .order_by(models.Gallery.created_at.desc()).all()
+    return serialization.FastJSONResponse(serialization.gallery_items(rows))
 
 @app.delete("/gallery/{gallery_id}")
 def delete_gallery(gallery_id: int, db: Session = Depends(get_db)):
     gallery = db.query(models.Gallery).filter(models.Gallery.id == gallery_id).first()
     if not gallery:
         raise HTTPException(status_code=404, detail="Gallery item not found")
-    
-    # Optional: Delete file from disk
-    # if os.path.exists(gallery.file_path):
-    #     os.remove(gallery.file_path)
 
+    # 파일 참조 -1, 더 이상 참조하는 항목이 없으면 commit 후 파일/썸네일 삭제
+    orphaned = media_store.release(db, gallery)
     db.delete(gallery)
     db.commit()
+    media_store.remove_files(db, orphaned)
     return {"detail": "Gallery item deleted"}
@@ -0,0 +1,272 @@
+import datetime
+from sqlalchemy import bindparam, or_, select
+from sqlalchemy.orm import Session, aliased
+import models
+import rating
+import standings
+from standings import STAT_COLUMNS
+
+
+def participant_ids(match) -> list:
+    """경기 참가 선수 ID 4명 (A1, A2, B1, B2 순서)"""
+    return [
+        match.team_a_player1_id,
+        match.team_a_player2_id,
+        match.team_b_player1_id,
+        match.team_b_player2_id,
+    ]
+
+
+def match_deltas(match, sign: int = 1) -> dict:
+    """
+    경기 1건이 선수별 스탯에 주는 변화량 계산 (승3, 무1, 패0 / 득실차)
+    sign=-1 이면 경기 삭제 시의 롤백 변화량
+    반환: {member_id: {컬럼: 변화량}}
+    """
+    diff = match.score_team_a - match.score_team_b
+    if diff > 0:
+        team_a = {"rank_point": 3, "wins": 1}
+        team_b = {"losses": 1}
+    elif diff < 0:
+        team_a = {"losses": 1}
+        team_b = {"rank_point": 3, "wins": 1}
+    else:
+        team_a = {"rank_point": 1, "draws": 1}
+        team_b = {"rank_point": 1, "draws": 1}
+    team_a["game_diff"] = diff
+    team_b["game_diff"] = -diff
+
+    deltas = {}
+    ids = participant_ids(match)
+    for member_id, team in zip(ids, (team_a, team_a, team_b, team_b)):
+        if member_id is None:
+            continue
+        row = deltas.setdefault(member_id, dict.fromkeys(STAT_COLUMNS, 0))
+        for column, value in team.items():
+            row[column] += sign * value
+    return deltas
+
+
+def merge_deltas(total: dict, deltas: dict) -> dict:
+    """여러 경기의 변화량을 회원별로 합산 (total을 직접 갱신)"""
+    for member_id, row in deltas.items():
+        acc = total.setdefault(member_id, dict.fromkeys(STAT_COLUMNS, 0))
+        for column in STAT_COLUMNS:
+            acc[column] += row[column]
+    return total
+
+
+def load_members(db: Session, member_ids) -> dict:
+    """참가 선수를 IN (...) 쿼리 한 번으로 조회 -> {id: Member}"""
+    ids = {mid for mid in member_ids if mid is not None}
+    if not ids:
+        return {}
+    rows = db.query(models.Member).filter(models.Member.id.in_(ids)).all()
+    return {m.id: m for m in rows}
+
+
+def apply_member_deltas(db: Session, deltas: dict) -> None:
+    """
+    합산된 변화량을 UPDATE 한 번(executemany)으로 반영
+    UPDATE members SET col = col + :delta WHERE id = :id
+    """
+    params = []
+    for member_id, row in deltas.items():
+        if not any(row.values()):
+            continue
+        param = {"b_id": member_id}
+        param.update({f"d_{column}": row[column] for column in STAT_COLUMNS})
+        params.append(param)
+    if not params:
+        return
+
+    table = models.Member.__table__
+    stmt = (
+        table.update()
+        .where(table.c.id == bindparam("b_id"))
+        .values({
+            column: table.c[column] + bindparam(f"d_{column}")
+            for column in STAT_COLUMNS
+        })
+    )
+    db.execute(stmt, params)
+
+
+def insert_matches(db: Session, db_matches: list) -> None:
+    """
+    경기 여러 건 INSERT -> 각 객체에 id/일시 설정 (commit은 호출자가 수행)
+    RETURNING을 지원하는 DB(SQLite, MariaDB)는 다중 행 INSERT ... RETURNING id 한 번
+    MySQL은 RETURNING이 없어 ORM flush로 행마다 INSERT (lastrowid로 id 확인)
+    """
+    if not db_matches:
+        return
+    now = datetime.datetime.now(datetime.timezone.utc)
+    for db_match in db_matches:
+        if db_match.date is None:
+            db_match.date = now
+
+    if not db.get_bind().dialect.insert_executemany_returning:
+        db.add_all(db_matches)
+        db.flush()
+        return
+
+    table = models.Match.__table__
+    columns = [c.key for c in table.columns if c.key != "id"]
+    ids = db.scalars(
+        table.insert().returning(table.c.id),
+        [{column: getattr(db_match, column) for column in columns} for db_match in db_matches]
+    ).all()
+    # RETURNING 순서는 보장되지 않지만 자동 증가 id는 VALUES 순서대로 증가
+    # (sort_by_parameter_order=True는 SQLite에서 행마다 INSERT로 바뀌므로 사용하지 않음)
+    for db_match, match_id in zip(db_matches, sorted(ids)):
+        db_match.id = match_id
+
+
+class MatchConflict(Exception):
+    """수정 도중 다른 요청이 같은 경기를 먼저 변경한 경우"""
+
+
+def record_match(db: Session, match):
+    """
+    경기 기록 추가 + 참가 선수 스탯 원자적 증가 (commit은 호출자가 수행)
+    참가 선수가 없으면 None 반환
+    """
+    members = load_members(db, participant_ids(match))
+    if any(mid not in members for mid in participant_ids(match)):
+        return None
+
+    db_match = models.Match(**match.model_dump())
+    rating_deltas = rating.assign(members, [db_match])
+    db.add(db_match)
+    db.flush()  # 경기 일시(시즌) 확정
+
+    deltas = match_deltas(match)
+    apply_member_deltas(db, deltas)
+    rating.apply_deltas(db, rating_deltas)
+    standings.apply_season_deltas(db, standings.season_of(db_match.date), deltas)
+    return db_match
+
+
+def remove_match(db: Session, match_id: int):
+    """
+    경기 삭제 + 스탯 롤백 (commit은 호출자가 수행)
+    DELETE 결과(rowcount)로 삭제 주체를 확정하므로 동시에 같은 경기를 지워도 롤백은 한 번만 적용됨
+    경기가 없으면 None 반환
+    """
+    match = db.query(models.Match).filter(models.Match.id == match_id).first()
+    if not match:
+        return None
+
+    deleted = db.query(models.Match).filter(models.Match.id == match_id)\
+        .delete(synchronize_session=False)
+    if deleted != 1:
+        return None
+
+    # 이미 삭제된 선수는 UPDATE 대상이 없으므로 자연히 건너뜀
+    deltas = match_deltas(match, sign=-1)
+    apply_member_deltas(db, deltas)
+    # 레이팅은 이 경기에서 적용한 변화량만 되돌림
+    rating.apply_deltas(db, rating.member_deltas(match, -(match.rating_delta or 0.0)))
+    standings.apply_season_deltas(db, standings.season_of(match.date), deltas)
+    db.expunge(match)
+    return match
+
+
+def edit_match(db: Session, match_id: int, new_match):
+    """
+    경기 결과 수정: (새 결과 - 기존 결과) 변화량만 반영 (commit은 호출자가 수행)
+    기존 값 조건부 UPDATE(낙관적 검사)로 동시 수정 시 MatchConflict 발생
+    경기나 참가 선수가 없으면 None 반환
+    """
+    old = db.query(models.Match).filter(models.Match.id == match_id).first()
+    if not old:
+        return None
+
+    members = load_members(db, participant_ids(new_match))
+    if any(mid not in members for mid in participant_ids(new_match)):
+        return None
+
+    fields = ("team_a_player1_id", "team_a_player2_id", "team_b_player1_id",
+              "team_b_player2_id", "score_team_a", "score_team_b")
+    old_values = {key: getattr(old, key) for key in fields}
+    new_values = {key: getattr(new_match, key) for key in fields}
+
+    # 레이팅: 기존 변화량을 되돌린 레이팅 기준으로 새 결과의 변화량 계산
+    rating_deltas = rating.member_deltas(old, -(old.rating_delta or 0.0))
+    ratings = {mid: rating.current(m) + rating_deltas.get(mid, 0.0) for mid, m in members.items()}
+    new_values["rating_delta"] = rating.match_delta(ratings, new_match)
+    for mid, change in rating.member_deltas(new_match, new_values["rating_delta"]).items():
+        rating_deltas[mid] = rating_deltas.get(mid, 0.0) + change
+
+    table = models.Match.__table__
+    stmt = table.update().where(table.c.id == match_id)
+    for key, value in old_values.items():
+        stmt = stmt.where(table.c[key] == value)
+    updated = db.execute(stmt.values(new_values)).rowcount
+    if updated != 1:
+        raise MatchConflict(match_id)
+
+    deltas = match_deltas(old, sign=-1)
+    merge_deltas(deltas, match_deltas(new_match))
+    apply_member_deltas(db, deltas)
+    rating.apply_deltas(db, rating_deltas)
+    standings.apply_season_deltas(db, standings.season_of(old.date), deltas)
+
+    db.expire(old)
+    return old
+
+
+def history_statement(limit: int = 100, skip: int = 0, before_id=None, member_id=None,
+                      date_from=None, date_to=None):
+    """
+    경기 기록 목록 SELECT (GET /matches, 동기/비동기 라우트 공용)
+    선수 이름은 members 테이블을 4번 LEFT JOIN 하여 한 번의 쿼리로 조회 (N+1 방지)
+    """
+    a1, a2, b1, b2 = (aliased(models.Member) for _ in range(4))
+    stmt = select(
+        models.Match.id,
+        models.Match.date,
+        models.Match.score_team_a,
+        models.Match.score_team_b,
+        a1.name, a2.name, b1.name, b2.name
+    ).outerjoin(a1, a1.id == models.Match.team_a_player1_id)\
+     .outerjoin(a2, a2.id == models.Match.team_a_player2_id)\
+     .outerjoin(b1, b1.id == models.Match.team_b_player1_id)\
+     .outerjoin(b2, b2.id == models.Match.team_b_player2_id)
+
+    # 커서 기반 페이지네이션: 이전 페이지 마지막 경기 ID보다 작은 것부터 (PK 인덱스 사용)
+    if before_id is not None:
+        stmt = stmt.where(models.Match.id < before_id)
+    if member_id is not None:
+        stmt = stmt.where(or_(
+            models.Match.team_a_player1_id == member_id,
+            models.Match.team_a_player2_id == member_id,
+            models.Match.team_b_player1_id == member_id,
+            models.Match.team_b_player2_id == member_id
+        ))
+    if date_from is not None:
+        stmt = stmt.where(models.Match.date >= datetime.datetime.combine(date_from, datetime.time()))
+    if date_to is not None:
+        stmt = stmt.where(models.Match.date < datetime.datetime.combine(date_to + datetime.timedelta(days=1), datetime.time()))
+
+    stmt = stmt.order_by(models.Match.id.desc())
+    # skip(offset)은 기존 앱 호환용. 깊은 페이지는 before_id 사용 권장
+    if skip:
+        stmt = stmt.offset(skip)
+    return stmt.limit(limit)
+
+
+def history_response(rows) -> list:
+    """history_statement 결과 행 -> MatchHistoryResponse 형식 dict 목록 (serialization.FastJSONResponse로 응답)"""
+    result = []
+    for match_id, date, score_a, score_b, ta_p1, ta_p2, tb_p1, tb_p2 in rows:
+        # Resolve names. If player is deleted/null, handle gracefully.
+        result.append({
+            "id": match_id,
+            "date": date,
+            "score_team_a": score_a,
+            "score_team_b": score_b,
+            "team_a_names": f"{ta_p1 or 'Unknown'}, {ta_p2 or 'Unknown'}",
+            "team_b_names": f"{tb_p1 or 'Unknown'}, {tb_p2 or 'Unknown'}",
+        })
+    return result
@@ -0,0 +1,239 @@
+"""
+업로드 파일 전송 (/images 경로, StaticFiles 대체)
+
+- Range 요청(bytes=a-b, a-, -n) -> 206 부분 응답: 동영상 탐색(seek) 시 필요한 구간만 읽음
+- ETag / Last-Modified 검증 -> 304
+- 내용 해시 이름(uploads/<sha256>.<확장자>, 썸네일 포함)은 내용이 바뀌지 않으므로
+  1년 immutable 캐시, 그 외(기존 uuid 파일)는 짧은 캐시 + 재검증
+- 미리 압축된 파일(<파일>.br / <파일>.gz)이 있으면 Accept-Encoding에 맞춰 그대로 전송
+- 서버가 ASGI zerocopysend 확장을 지원하면 sendfile로 전송 (커널이 파일 -> 소켓 직접 복사)
+  지원하지 않으면(uvicorn 등) 스레드에서 블록 단위로 읽어 전송
+"""
+import os
+import re
+import stat
+import email.utils
+import anyio
+
+# 파일 이름(확장자 제외)이 sha256이면 내용 주소 방식 파일
+CONTENT_ADDRESSED = re.compile(r"^[0-9a-f]{64}$")
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+DEFAULT_CACHE = "public, max-age=3600, must-revalidate"
+READ_CHUNK_SIZE = 256 * 1024
+# 미리 압축된 파일 확인 순서 (확장자, Content-Encoding)
+PRECOMPRESSED = ((".br", "br"), (".gz", "gzip"))
+
+MEDIA_TYPES = {
+    ".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".png": "image/png", ".gif": "image/gif",
+    ".webp": "image/webp", ".heic": "image/heic", ".mp4": "video/mp4", ".mov": "video/quicktime",
+    ".m4v": "video/x-m4v", ".webm": "video/webm", ".3gp": "video/3gpp",
+}
+
+
+def media_type(path: str) -> str:
+    return MEDIA_TYPES.get(os.path.splitext(path)[1].lower(), "application/octet-stream")
+
+
+def parse_range(header: str, size: int):
+    """
+    Range 헤더 -> (start, end) (end 포함)
+    - 범위 단위가 아니거나 여러 구간이면 None (전체 전송)
+    - 만족할 수 없는 범위면 ValueError (416)
+    """
+    if not header or not header.startswith("bytes="):
+        return None
+    spec = header[len("bytes="):].strip()
+    if "," in spec:
+        return None
+    first, sep, last = spec.partition("-")
+    if not sep:
+        return None
+    try:
+        if first == "":
+            # 끝에서 n바이트
+            length = int(last)
+            if length <= 0:
+                raise ValueError
+            start, end = max(size - length, 0), size - 1
+        else:
+            start = int(first)
+            end = int(last) if last else size - 1
+    except ValueError:
+        raise ValueError("invalid range")
+    if start >= size or start > end or start < 0:
+        raise ValueError("unsatisfiable range")
+    return start, min(end, size - 1)
+
+
+def accepts_encoding(accept_encoding: str, coding: str) -> bool:
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        if name.strip().lower() == coding:
+            return params.replace(" ", "") not in ("q=0", "q=0.0")
+    return False
+
+
+class MediaFiles:
+    """
+    ASGI 앱: app.mount("/images", MediaFiles("uploads"))
+    GET / HEAD만 처리, 디렉터리 밖 경로나 임시 업로드 파일(.partial)은 404
+    """
+
+    def __init__(self, directory: str):
+        self.directory = os.path.realpath(directory)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return
+        if scope["method"] not in ("GET", "HEAD"):
+            await self._respond(send, 405, [(b"allow", b"GET, HEAD")])
+            return
+
+        path = self._resolve(scope["path"], scope.get("root_path", ""))
+        file_stat = await anyio.to_thread.run_sync(self._stat, path) if path else None
+        if file_stat is None:
+            await self._respond(send, 404, body=b"Not Found")
+            return
+
+        headers = self._request_headers(scope)
+        await self._send_file(scope, send, path, file_stat, headers)
+
+    def _resolve(self, request_path: str, root_path: str):
+        if root_path and request_path.startswith(root_path):
+            request_path = request_path[len(root_path):]
+        relative = request_path.lstrip("/")
+        if not relative or any(part.startswith(".") for part in relative.split("/")):
+            return None
+        full = os.path.realpath(os.path.join(self.directory, relative))
+        if os.path.commonpath([full, self.directory]) != self.directory:
+            return None
+        return full
+
+    @staticmethod
+    def _stat(path: str):
+        try:
+            result = os.stat(path)
+        except OSError:
+            return None
+        return result if stat.S_ISREG(result.st_mode) else None
+
+    @staticmethod
+    def _request_headers(scope) -> dict:
+        return {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope["headers"]}
+
+    @staticmethod
+    def etag_for(path: str, file_stat) -> str:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        if CONTENT_ADDRESSED.match(stem):
+            return f'"{stem}"'
+        return f'"{file_stat.st_size:x}-{int(file_stat.st_mtime):x}"'
+
+    def _not_modified(self, headers: dict, etag: str, file_stat) -> bool:
+        if_none_match = headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            # 미리 압축된 표현의 ETag("<etag>-br")도 같은 파일로 취급
+            return "*" in tags or any(tag == etag or tag.startswith(etag[:-1] + "-") for tag in tags)
+        if_modified_since = headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(file_stat.st_mtime) <= since
+        return False
+
+    async def _send_file(self, scope, send, path: str, file_stat, headers: dict):
+        etag = self.etag_for(path, file_stat)
+        stem = os.path.splitext(os.path.basename(path))[0]
+        response_headers = [
+            (b"accept-ranges", b"bytes"),
+            (b"etag", etag.encode()),
+            (b"last-modified", email.utils.formatdate(file_stat.st_mtime, usegmt=True).encode()),
+            (b"cache-control", (IMMUTABLE_CACHE if CONTENT_ADDRESSED.match(stem) else DEFAULT_CACHE).encode()),
+        ]
+
+        if self._not_modified(headers, etag, file_stat):
+            await self._respond(send, 304, response_headers)
+            return
+
+        content_type = media_type(path)
+        send_path, size = path, file_stat.st_size
+
+        # If-Range: 검증자가 다르면(파일이 바뀜) Range를 무시하고 전체 전송
+        range_header = headers.get("range")
+        if_range = headers.get("if-range")
+        if range_header and if_range and if_range.strip() != etag:
+            range_header = None
+
+        try:
+            byte_range = parse_range(range_header, size) if range_header else None
+        except ValueError:
+            await self._respond(send, 416, response_headers + [(b"content-range", f"bytes */{size}".encode())])
+            return
+
+        if byte_range is None:
+            # 전체 전송일 때만 미리 압축된 파일 사용 (부분 응답은 원본 기준)
+            encoded = await anyio.to_thread.run_sync(self._precompressed, path, headers.get("accept-encoding", ""))
+            if encoded:
+                send_path, size, coding = encoded
+                response_headers[1] = (b"etag", f'{etag[:-1]}-{coding}"'.encode())
+                response_headers.append((b"content-encoding", coding.encode()))
+            response_headers.append((b"vary", b"Accept-Encoding"))
+            status_code, start, length = 200, 0, size
+        else:
+            start, end = byte_range
+            status_code, length = 206, end - start + 1
+            response_headers.append((b"content-range", f"bytes {start}-{end}/{size}".encode()))
+
+        response_headers += [
+            (b"content-type", content_type.encode()),
+            (b"content-length", str(length).encode()),
+        ]
+        await send({"type": "http.response.start", "status": status_code, "headers": response_headers})
+        if scope["method"] == "HEAD" or length == 0:
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        extensions = scope.get("extensions") or {}
+        if "http.response.zerocopysend" in extensions:
+            with open(send_path, "rb") as f:
+                await send({"type": "http.response.zerocopysend", "file": f.fileno(),
+                            "offset": start, "count": length})
+            return
+        if "http.response.pathsend" in extensions and status_code == 200:
+            await send({"type": "http.response.pathsend", "path": send_path})
+            return
+        await self._stream(send, send_path, start, length)
+
+    @staticmethod
+    def _precompressed(path: str, accept_encoding: str):
+        for suffix, coding in PRECOMPRESSED:
+            candidate = path + suffix
+            if accepts_encoding(accept_encoding, coding) and os.path.isfile(candidate):
+                return candidate, os.path.getsize(candidate), coding
+        return None
+
+    @staticmethod
+    async def _stream(send, path: str, start: int, length: int):
+        f = await anyio.to_thread.run_sync(open, path, "rb")
+        try:
+            await anyio.to_thread.run_sync(f.seek, start)
+            remaining = length
+            while remaining > 0:
+                chunk = await anyio.to_thread.run_sync(f.read, min(READ_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b""})
+        finally:
+            await anyio.to_thread.run_sync(f.close)
+
+    @staticmethod
+    async def _respond(send, status_code: int, headers=None, body: bytes = b""):
+        headers = list(headers or [])
+        headers.append((b"content-length", str(len(body)).encode()))
+        await send({"type": "http.response.start", "status": status_code, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
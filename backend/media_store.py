@@ -0,0 +1,321 @@
+"""
+갤러리 업로드 파일 저장소 (내용 해시 기반, 중복 제거 + 참조 카운트)
+
+- 파일은 uploads/<sha256>.<확장자> 로 한 번만 저장, 같은 사진을 여러 명이 올려도 파일 1개
+- media_blobs.ref_count = 이 파일을 가리키는 gallery 행 수, 0이 되면 파일/썸네일 삭제
+- 이어받기 업로드: 세션 생성 -> offset 지정 조각 전송(반복) -> 완료
+  받은 바이트 수는 임시 파일(uploads/.partial/<세션ID>) 크기로 판단하므로
+  연결이 끊겨도 상태 조회 후 그 위치부터 다시 보내면 됨
+
+사용법 (backend 디렉터리에서, 오래된 미완료 세션 정리):
+    python media_store.py purge
+"""
+import os
+import sys
+import uuid
+import hashlib
+import datetime
+from sqlalchemy import event, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+import models
+from thumbnails import thumbnail_path_for
+
+try:
+    import fcntl
+except ImportError:  # Windows: 파일 잠금 없이 동작
+    fcntl = None
+
+MEDIA_DIR = "uploads"
+PARTIAL_DIR = os.path.join(MEDIA_DIR, ".partial")
+HASH_BLOCK_SIZE = 1024 * 1024
+# 업로드 1건 최대 크기 (기본 2GB)
+MAX_UPLOAD_SIZE = int(os.getenv("MAX_UPLOAD_SIZE", str(2 * 1024 * 1024 * 1024)))
+# 이 시간 이상 완료되지 않은 세션은 정리 대상
+STALE_UPLOAD_HOURS = int(os.getenv("STALE_UPLOAD_HOURS", "24"))
+
+
+class UploadError(Exception):
+    """업로드 요청 오류 (status_code로 HTTP 상태 전달)"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def file_extension(filename: str) -> str:
+    ext = os.path.splitext(filename or "")[1].lstrip(".").lower()
+    if not ext.isalnum() or len(ext) > 10:
+        return "bin"
+    return ext
+
+
+def partial_path(upload_id: str) -> str:
+    return os.path.join(PARTIAL_DIR, upload_id)
+
+
+def received_bytes(upload_id: str) -> int:
+    try:
+        return os.path.getsize(partial_path(upload_id))
+    except FileNotFoundError:
+        return 0
+
+
+def hash_file(path: str) -> str:
+    """파일 전체를 블록 단위로 읽어 sha256 (메모리에 통째로 올리지 않음)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# --- 이어받기 업로드 세션 ---
+
+def create_session(db: Session, uploader_name: str, file_type: str, filename: str, total_size=None):
+    if total_size is not None and not 0 < total_size <= MAX_UPLOAD_SIZE:
+        raise UploadError("파일 크기가 허용 범위를 벗어났습니다.", 413)
+    os.makedirs(PARTIAL_DIR, exist_ok=True)
+    session = models.UploadSession(
+        id=str(uuid.uuid4()),
+        uploader_name=uploader_name,
+        file_type=file_type,
+        file_extension=file_extension(filename),
+        total_size=total_size
+    )
+    db.add(session)
+    open(partial_path(session.id), "wb").close()
+    return session
+
+
+class ChunkWriter:
+    """
+    세션 임시 파일에 offset 위치부터 이어 쓰기
+    - offset이 현재 받은 크기와 다르면 409 (클라이언트는 상태 조회 후 재전송)
+    - 같은 세션에 동시에 조각을 보내면 파일 잠금으로 한 요청만 허용
+    """
+
+    def __init__(self, session: models.UploadSession, offset: int):
+        self.session = session
+        self.offset = offset
+        self.written = 0
+        self._file = None
+
+    def open(self) -> None:
+        path = partial_path(self.session.id)
+        if not os.path.exists(path):
+            raise UploadError("업로드 세션 파일이 없습니다. 처음부터 다시 시작하세요.", 404)
+        self._file = open(path, "r+b")
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                self.close()
+                raise UploadError("같은 업로드가 이미 전송 중입니다.", 409)
+        current = os.fstat(self._file.fileno()).st_size
+        if self.offset != current:
+            self.close()
+            raise UploadError(f"offset 불일치 (현재 받은 크기: {current})", 409)
+        self._file.seek(current)
+
+    def write(self, data: bytes) -> None:
+        limit = self.session.total_size or MAX_UPLOAD_SIZE
+        if self.offset + self.written + len(data) > limit:
+            raise UploadError("선언한 파일 크기를 초과했습니다.", 413)
+        self._file.write(data)
+        self.written += len(data)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+            self._file.close()  # 닫으면 잠금도 해제
+            self._file = None
+
+    @property
+    def received(self) -> int:
+        return self.offset + self.written
+
+
+def finalize_session(db: Session, session: models.UploadSession):
+    """
+    업로드 완료: 해시 계산 -> 저장소에 등록 -> gallery 행 생성 (commit은 호출자가 수행)
+    반환: (gallery, 새로 저장된 파일이면 True)
+    """
+    path = partial_path(session.id)
+    if not os.path.exists(path):
+        raise UploadError("업로드 세션 파일이 없습니다. 처음부터 다시 시작하세요.", 404)
+    size = os.path.getsize(path)
+    if size == 0:
+        raise UploadError("받은 데이터가 없습니다.")
+    if session.total_size is not None and size != session.total_size:
+        raise UploadError(f"아직 업로드가 끝나지 않았습니다. (받은 크기: {size}/{session.total_size})", 409)
+
+    blob, is_new = store_file(db, path, session.file_extension)
+    gallery = models.Gallery(
+        uploader_name=session.uploader_name,
+        file_type=session.file_type,
+        file_path=blob.file_path,
+        content_hash=blob.content_hash,
+        thumbnail_path=existing_thumbnail(blob.file_path)
+    )
+    db.add(gallery)
+    db.delete(session)
+    db.flush()
+    return gallery, is_new
+
+
+# --- 내용 해시 저장소 ---
+
+def store_file(db: Session, src_path: str, extension: str):
+    """
+    임시 파일을 저장소로 옮기고 참조 +1 (commit은 호출자가 수행)
+    - 이미 같은 내용이 있으면 임시 파일은 commit 후 삭제
+    - 새 파일은 바로 옮기되, commit 전에 롤백되면 임시 위치로 되돌림 (행 없는 저장소 파일 방지)
+    반환: (MediaBlob, 새 파일이면 True)
+    """
+    content_hash = hash_file(src_path)
+    blobs = models.MediaBlob.__table__
+
+    # 1) 이미 있는 파일이면 참조만 증가 (동시 요청에도 원자적)
+    result = db.execute(
+        update(blobs).where(blobs.c.content_hash == content_hash)
+        .values(ref_count=blobs.c.ref_count + 1)
+    )
+    if result.rowcount == 1:
+        db.info.setdefault(_REMOVE_ON_COMMIT, []).append(src_path)
+        return _blob(db, content_hash), False
+
+    # 2) 새 파일: 먼저 파일을 제자리로 옮긴 뒤 행 추가
+    target = f"{MEDIA_DIR}/{content_hash}.{extension}"
+    size = os.path.getsize(src_path)
+    os.replace(src_path, target)
+    try:
+        with db.begin_nested():
+            db.add(models.MediaBlob(content_hash=content_hash, file_path=target, size=size, ref_count=1))
+    except IntegrityError:
+        # 같은 내용을 다른 요청이 먼저 등록함 -> 그 행의 참조 증가
+        # (경로가 같으면 내용도 같으므로 그대로 두고, 확장자가 달라 경로가 다르면 삭제)
+        db.execute(
+            update(blobs).where(blobs.c.content_hash == content_hash)
+            .values(ref_count=blobs.c.ref_count + 1)
+        )
+        blob = _blob(db, content_hash)
+        if blob.file_path != target:
+            os.remove(target)
+        return blob, False
+    db.info.setdefault(_RESTORE_ON_ROLLBACK, []).append((target, src_path))
+    return _blob(db, content_hash), True
+
+
+# store_file이 세션에 남기는 commit/롤백 후 파일 정리 목록
+_REMOVE_ON_COMMIT = "media_store.remove_on_commit"
+_RESTORE_ON_ROLLBACK = "media_store.restore_on_rollback"
+
+
+@event.listens_for(Session, "after_commit")
+def _files_committed(session):
+    if session.in_nested_transaction():
+        return  # SAVEPOINT 해제
+    session.info.pop(_RESTORE_ON_ROLLBACK, None)
+    for path in session.info.pop(_REMOVE_ON_COMMIT, []):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _files_rolled_back(session, transaction):
+    """commit 없이 끝난 트랜잭션(rollback / close): 새로 옮긴 파일을 임시 위치로 되돌림"""
+    if transaction.parent is not None:
+        return
+    session.info.pop(_REMOVE_ON_COMMIT, None)
+    for target, src_path in session.info.pop(_RESTORE_ON_ROLLBACK, []):
+        if os.path.exists(target):
+            os.replace(target, src_path)
+
+
+def _blob(db: Session, content_hash: str) -> models.MediaBlob:
+    return db.query(models.MediaBlob).filter(models.MediaBlob.content_hash == content_hash).one()
+
+
+def existing_thumbnail(file_path: str):
+    """같은 내용의 썸네일이 이미 만들어져 있으면 그 경로"""
+    thumb = thumbnail_path_for(file_path)
+    return thumb if os.path.exists(thumb) else None
+
+
+def release(db: Session, gallery: models.Gallery):
+    """
+    gallery 행이 참조하던 파일의 참조 -1 (commit은 호출자가 수행)
+    반환: 참조가 0이 되어 삭제해야 할 파일 경로 목록 (commit 후 remove_files로 삭제)
+    """
+    if gallery.content_hash is None:
+        # 해시 저장소 도입 전 파일 (uuid 이름, 행 하나만 참조)
+        return [gallery.file_path, gallery.thumbnail_path]
+
+    blobs = models.MediaBlob.__table__
+    db.execute(
+        update(blobs).where(blobs.c.content_hash == gallery.content_hash)
+        .values(ref_count=blobs.c.ref_count - 1)
+    )
+    result = db.execute(
+        blobs.delete().where(blobs.c.content_hash == gallery.content_hash, blobs.c.ref_count <= 0)
+    )
+    if result.rowcount != 1:
+        return []
+    return [gallery.file_path, thumbnail_path_for(gallery.file_path)]
+
+
+def remove_files(db: Session, paths: list) -> None:
+    """commit 이후 호출: 그 사이 같은 내용이 다시 등록되었으면 지우지 않음"""
+    for path in paths:
+        if not path or not os.path.exists(path):
+            continue
+        stem = os.path.splitext(os.path.basename(path))[0]
+        if db.query(models.MediaBlob.id).filter(models.MediaBlob.content_hash == stem).first():
+            continue
+        os.remove(path)
+
+
+def purge_stale_sessions(db: Session, hours: int = STALE_UPLOAD_HOURS) -> int:
+    """오래된 미완료 업로드 세션과 임시 파일 정리"""
+    # created_at은 UTC로 저장됨 (DB 컬럼에는 시간대 정보 없음)
+    cutoff = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None) - datetime.timedelta(hours=hours)
+    stale = db.query(models.UploadSession.id).filter(models.UploadSession.created_at < cutoff).all()
+    for row in stale:
+        try:
+            os.remove(partial_path(row.id))
+        except FileNotFoundError:
+            pass
+    if stale:
+        db.query(models.UploadSession).filter(
+            models.UploadSession.id.in_([row.id for row in stale])
+        ).delete(synchronize_session=False)
+    return len(stale)
+
+
+def purge_stale_sessions_job():
+    """스케줄러용: 자체 세션으로 정리 후 commit"""
+    from database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        count = purge_stale_sessions(db)
+        db.commit()
+        if count:
+            print(f"🧹 [Upload] 미완료 업로드 {count}건 정리")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ [Upload Purge Error] {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "purge"
+    if command != "purge":
+        print(f"알 수 없는 명령: {command} (purge)")
+        sys.exit(2)
+    purge_stale_sessions_job()
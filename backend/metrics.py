@@ -0,0 +1,320 @@
+"""
+요청 지표 수집 (GET /metrics, Prometheus 텍스트 형식)
+
+- MetricsMiddleware: 라우트 경로 템플릿(/matches/{match_id})별 응답 시간 히스토그램, 상태 코드별 요청 수
+- SQLAlchemy before/after_cursor_execute 이벤트: 요청마다 실행한 쿼리 수와 DB 시간 집계
+  -> 라우트별 "요청당 쿼리 수" 히스토그램으로 N+1 조회를 운영 중에 바로 확인
+  (스레드풀에서 도는 동기 라우트도 contextvars로 같은 요청에 합산됨)
+- 연결 풀(pool_stats), 응답/인증 캐시, 실시간 알림, 수락 제어 상태도 함께 내보냄
+
+환경변수:
+    METRICS_SERVER_TIMING   1이면 응답에 Server-Timing 헤더 추가 (app;dur=, db;dur=;desc="N queries")
+    METRICS_QUERY_WARN      요청 하나가 이 횟수 이상 쿼리하면 로그 출력 (기본 50, 0이면 끔)
+"""
+import os
+import time
+import threading
+import contextvars
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+SERVER_TIMING = os.getenv("METRICS_SERVER_TIMING", "0").lower() in ("1", "true", "yes")
+QUERY_WARN = int(os.getenv("METRICS_QUERY_WARN", "50"))
+
+# 응답 시간 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 요청당 쿼리 수 히스토그램 구간
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+PREFIX = "tennis"
+
+
+class RequestStats:
+    """요청 하나의 쿼리 수 / DB 시간 (미들웨어가 만들고 SQL 이벤트가 누적)"""
+
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+_current = contextvars.ContextVar("request_stats", default=None)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.total += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def cumulative(self):
+        running = 0
+        for bound, count in zip(list(self.buckets) + ["+Inf"], self.counts):
+            running += count
+            yield bound, running
+
+
+class RouteMetrics:
+    """(메서드, 라우트)별 응답 시간 / 쿼리 수 / DB 시간"""
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.db_seconds = 0.0
+        self.statuses = {}
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.routes = {}  # (method, route) -> RouteMetrics
+        self.in_flight = 0
+        # 요청 밖(스케줄러, 썸네일 등)을 포함한 전체 쿼리
+        self.queries_total = 0
+        self.query_seconds_total = 0.0
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float, stats: RequestStats) -> None:
+        with self._lock:
+            metrics = self.routes.get((method, route))
+            if metrics is None:
+                metrics = self.routes[(method, route)] = RouteMetrics()
+            metrics.latency.observe(seconds)
+            metrics.queries.observe(stats.queries)
+            metrics.db_seconds += stats.db_seconds
+            metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+
+    def observe_query(self, seconds: float) -> None:
+        with self._lock:
+            self.queries_total += 1
+            self.query_seconds_total += seconds
+
+
+registry = Registry()
+
+
+# --- SQL 실행 시간 (모든 엔진: 동기 엔진, 비동기 엔진의 sync_engine 포함) ---
+
+# 시작 시각은 문장별 실행 컨텍스트에 저장 (실패한 문장은 after_cursor_execute가 호출되지 않아도
+# 컨텍스트와 함께 버려지므로 연결에 남지 않음)
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_query_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_metrics_query_started", None)
+    if started is None:
+        return
+    seconds = time.perf_counter() - started
+    registry.observe_query(seconds)
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += seconds
+
+
+def current_stats():
+    """진행 중인 요청의 RequestStats (요청 밖이면 None)"""
+    return _current.get()
+
+
+def route_label(scope: dict, root_path: str) -> str:
+    """지표 라벨: 라우트 경로 템플릿 (실제 경로를 쓰면 id마다 라벨이 늘어남)"""
+    route = scope.get("route")
+    if route is not None and getattr(route, "path", None):
+        return route.path
+    mounted = scope.get("root_path", "")
+    if mounted != root_path:
+        # app.mount("/images", ...) 아래 정적 파일
+        return mounted[len(root_path):] + "/*"
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """요청마다 응답 시간 / 쿼리 수 집계, 설정 시 Server-Timing 헤더 추가"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        root_path = scope.get("root_path", "")
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if SERVER_TIMING:
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [
+                        (b"server-timing", server_timing(time.perf_counter() - started, stats).encode("latin-1"))
+                    ]
+            await send(message)
+
+        registry.in_flight += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            registry.in_flight -= 1
+            _current.reset(token)
+            seconds = time.perf_counter() - started
+            route = route_label(scope, root_path)
+            registry.observe_request(scope["method"], route, status_code, seconds, stats)
+            if QUERY_WARN and stats.queries >= QUERY_WARN:
+                print(f"⚠️ [Metrics] {scope['method']} {route} 쿼리 {stats.queries}회 "
+                      f"(DB {stats.db_seconds * 1000:.1f}ms / 전체 {seconds * 1000:.1f}ms)")
+
+
+def server_timing(seconds: float, stats: RequestStats) -> str:
+    return (f'app;dur={seconds * 1000:.1f}, '
+            f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries"')
+
+
+# --- Prometheus 텍스트 형식 ---
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+class _Writer:
+    def __init__(self):
+        self.lines = []
+        self._declared = set()
+
+    def declare(self, name: str, kind: str, help_text: str) -> None:
+        if name not in self._declared:
+            self._declared.add(name)
+            self.lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+            self.lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+
+    def sample(self, name: str, value, **labels) -> None:
+        if value is None:
+            return
+        if isinstance(value, bool):
+            value = int(value)
+        self.lines.append(f"{PREFIX}_{name}{_labels(**labels)} {value}")
+
+    def histogram(self, name: str, histogram: Histogram, **labels) -> None:
+        for bound, count in histogram.cumulative():
+            self.sample(f"{name}_bucket", count, **labels, le=bound)
+        self.sample(f"{name}_sum", round(histogram.total, 6), **labels)
+        self.sample(f"{name}_count", histogram.count, **labels)
+
+    def text(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def _write_requests(w: _Writer) -> None:
+    with registry._lock:
+        routes = sorted(registry.routes.items())
+        snapshot = [(key, m, dict(m.statuses)) for key, m in routes]
+        in_flight = registry.in_flight
+        queries_total = registry.queries_total
+        query_seconds_total = registry.query_seconds_total
+
+    w.declare("http_requests_in_flight", "gauge", "처리 중인 요청 수")
+    w.sample("http_requests_in_flight", in_flight)
+    w.declare("http_requests_total", "counter", "라우트/상태 코드별 요청 수")
+    for (method, route), _, statuses in snapshot:
+        for status_code, count in sorted(statuses.items()):
+            w.sample("http_requests_total", count, method=method, route=route, status=status_code)
+    w.declare("http_request_duration_seconds", "histogram", "라우트별 응답 시간")
+    for (method, route), m, _ in snapshot:
+        w.histogram("http_request_duration_seconds", m.latency, method=method, route=route)
+    w.declare("http_request_db_queries", "histogram", "라우트별 요청당 SQL 실행 수")
+    for (method, route), m, _ in snapshot:
+        w.histogram("http_request_db_queries", m.queries, method=method, route=route)
+    w.declare("http_request_db_seconds_total", "counter", "라우트별 SQL 실행 시간 합계")
+    for (method, route), m, _ in snapshot:
+        w.sample("http_request_db_seconds_total", round(m.db_seconds, 6), method=method, route=route)
+
+    w.declare("db_queries_total", "counter", "전체 SQL 실행 수 (요청 밖 작업 포함)")
+    w.sample("db_queries_total", queries_total)
+    w.declare("db_query_seconds_total", "counter", "전체 SQL 실행 시간")
+    w.sample("db_query_seconds_total", round(query_seconds_total, 6))
+
+
+def _write_pool(w: _Writer, name: str, stats: dict) -> None:
+    gauges = {"size": "풀 상시 연결 수", "in_use": "대여 중인 연결 수", "idle": "대기 중인 연결 수",
+              "saturation": "풀 사용률", "peak_in_use": "최대 동시 대여 수"}
+    for key, help_text in gauges.items():
+        w.declare(f"db_pool_{key}", "gauge", help_text)
+        w.sample(f"db_pool_{key}", stats.get(key), pool=name)
+    counters = {"checkouts": "연결 대여 수", "waited": "1ms 이상 기다린 대여 수", "timeouts": "대여 시간 초과 수"}
+    for key, help_text in counters.items():
+        w.declare(f"db_pool_{key}_total", "counter", help_text)
+        w.sample(f"db_pool_{key}_total", stats.get(key), pool=name)
+    if "wait_buckets" in stats:
+        w.declare("db_pool_wait_seconds", "histogram", "연결 대여 대기 시간")
+        running = 0
+        for label, count in stats["wait_buckets"].items():
+            running += count
+            w.sample("db_pool_wait_seconds_bucket", running, pool=name,
+                     le="+Inf" if label == "le_inf" else label[3:])
+        w.sample("db_pool_wait_seconds_count", stats["checkouts"], pool=name)
+
+
+def render() -> str:
+    """GET /metrics 본문"""
+    import database
+    import admission
+    import events
+    from auth import principal_cache
+    from cache import rankings_cache, tournament_cache
+
+    w = _Writer()
+    _write_requests(w)
+
+    _write_pool(w, "sync", database.pool_stats())
+    if database.DB_ASYNC:
+        _write_pool(w, "async", database.pool_stats(database.get_async_engine()))
+
+    for key, help_text in (("hits", "캐시 적중 수"), ("misses", "캐시 미스 수"), ("invalidations", "캐시 무효화 수")):
+        w.declare(f"cache_{key}_total", "counter", help_text)
+        for response_cache in (rankings_cache, tournament_cache):
+            w.sample(f"cache_{key}_total", getattr(response_cache, key), cache=response_cache.name)
+        w.sample(f"cache_{key}_total", getattr(principal_cache, key), cache="principal")
+    w.declare("cache_not_modified_total", "counter", "ETag 일치로 304 응답한 수")
+    for response_cache in (rankings_cache, tournament_cache):
+        w.sample("cache_not_modified_total", response_cache.not_modified, cache=response_cache.name)
+
+    hub = events.hub.stats()
+    w.declare("events_subscribers", "gauge", "실시간 알림 구독자 수")
+    w.sample("events_subscribers", hub["subscribers"])
+    for key in ("published", "delivered", "dropped"):
+        w.declare(f"events_{key}_total", "counter", f"실시간 알림 {key}")
+        w.sample(f"events_{key}_total", hub[key])
+
+    gates = admission.stats()["gates"]
+    w.declare("admission_in_flight", "gauge", "제한 경로 처리 중 요청 수")
+    w.declare("admission_rejected_total", "counter", "대기 초과로 거절한 요청 수")
+    for name, gate in gates.items():
+        w.sample("admission_in_flight", gate["in_flight"], gate=name)
+        w.sample("admission_rejected_total", gate["rejected"], gate=name)
+    return w.text()
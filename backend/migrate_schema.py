@@ -0,0 +1,83 @@
+from sqlalchemy import inspect, text
+from database import engine, SessionLocal
+import models
+import search
+import schedule_slots
+
+def migrate_schema():
+    """
+    기존 DB를 models.py 기준으로 맞춤 (여러 번 실행해도 안전)
+    1. 없는 테이블 생성
+    2. 기존 테이블에 없는 컬럼 추가 (새로 생긴 schedule_archive.schedule_id는 기존 id로 채움)
+    3. 없는 인덱스 생성 (league_histories 중복 기록은 유니크 인덱스 생성 전에 정리)
+    4. 게시글 전문 검색 색인 생성
+    5. 운동 약속 분(minute) 컬럼 채우기
+    """
+    print("🔧 DB 스키마 동기화 시작...")
+    models.Base.metadata.create_all(bind=engine)
+
+    inspector = inspect(engine)
+    for table in models.Base.metadata.sorted_tables:
+        existing_columns = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+            column_type = column.type.compile(dialect=engine.dialect)
+            ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+            default = column.default.arg if column.default is not None and column.default.is_scalar else None
+            if default is not None:
+                ddl += f" DEFAULT {int(default) if isinstance(default, bool) else repr(default)}"
+            with engine.begin() as conn:
+                conn.execute(text(ddl))
+            print(f"✅ 컬럼 추가: {table.name}.{column.name}")
+
+        if table.name == "league_histories":
+            dedupe_league_histories(inspector)
+        if table.name == "schedule_archive" and "schedule_id" not in existing_columns:
+            # 예전 보관 행은 id가 원래 schedules.id
+            with engine.begin() as conn:
+                conn.execute(text("UPDATE schedule_archive SET schedule_id = id WHERE schedule_id IS NULL"))
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+        print(f"✅ 인덱스 확인 완료: {table.name}")
+
+    print(f"✅ 전문 검색 색인 확인 완료 ({search.ensure_index(engine)})")
+
+    db = SessionLocal()
+    try:
+        filled = schedule_slots.backfill_minutes(db)
+        db.commit()
+    finally:
+        db.close()
+    print(f"✅ 운동 약속 분 컬럼 채우기 완료 ({filled}건)")
+
+    print("✅ DB 스키마 동기화 완료")
+
+def dedupe_league_histories(inspector):
+    """
+    월말 정산이 두 번 실행되어 생긴 (member_id, year, month) 중복 기록 삭제 (먼저 저장된 행 유지)
+    유니크 인덱스가 생기면 기존 비유니크 인덱스는 삭제
+    """
+    existing = {index["name"] for index in inspector.get_indexes("league_histories")}
+    if "uq_league_histories_member_period" in existing:
+        return
+    with engine.begin() as conn:
+        removed = conn.execute(text(
+            "DELETE FROM league_histories WHERE id NOT IN ("
+            "SELECT keep_id FROM (SELECT MIN(id) AS keep_id FROM league_histories "
+            "GROUP BY member_id, year, month) AS keep)"
+        )).rowcount
+    if removed:
+        print(f"🧹 중복 월별 기록 삭제: {removed}건")
+    if "ix_league_histories_member_period" in existing:
+        # MySQL은 member_id 외래 키용 인덱스가 필요하므로 유니크 인덱스를 먼저 만든 뒤 기존 인덱스 삭제
+        unique_index = next(i for i in models.LeagueHistory.__table__.indexes
+                            if i.name == "uq_league_histories_member_period")
+        unique_index.create(bind=engine)
+        on_table = " ON league_histories" if engine.dialect.name == "mysql" else ""
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP INDEX ix_league_histories_member_period{on_table}"))
+        print("✅ 인덱스 교체: ix_league_histories_member_period -> uq_league_histories_member_period")
+
+if __name__ == "__main__":
+    migrate_schema()
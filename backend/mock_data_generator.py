@@ -0,0 +1,260 @@
+"""
+대용량 테스트 데이터 생성 (같은 --seed면 항상 같은 데이터)
+
+회원 / 경기(수년치) / 월말 정산 기록 / 게시글 / 운동 약속 / 갤러리 항목을
+여러 행 INSERT(executemany)로 한꺼번에 넣고, 순위 관련 집계는 서버와 같은 방식으로 계산
+- member_season_stats: standings.rebuild (경기 원장 INSERT ... SELECT)
+- league_histories: 지난달까지 월별 성적 (월말 정산 결과와 같음), settlement_runs는 완료 처리
+- members 성적: 이번 달 경기 집계 -> standings.py check 시 차이 없음
+- league_rolling_points: league_history.refresh_rolling_points
+- members.rating / matches.rating_delta: rating.rebuild (전체 경기 시간순 재계산)
+
+모든 회원의 PIN은 1234, 1번 회원(전화번호 01000000000)은 관리자
+갤러리 항목은 목록 조회용 행만 만들고 파일은 만들지 않음
+
+사용법 (backend 디렉터리에서):
+    python mock_data_generator.py                       # 기본 medium (회원 1만, 경기 100만)
+    python mock_data_generator.py --profile large       # 회원 10만, 경기 500만
+    python mock_data_generator.py --members 20000 --matches 2000000 --years 3
+    python mock_data_generator.py --database-url sqlite:///./bench.db --reset
+(--database-url을 주지 않으면 DATABASE_URL 환경변수의 DB 사용)
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import datetime
+import itertools
+
+BATCH_SIZE = 10000
+
+PROFILES = {
+    "small": {"members": 1000, "matches": 50000, "years": 2, "posts": 2000, "gallery": 500, "schedules_per_day": 20},
+    "medium": {"members": 10000, "matches": 1000000, "years": 3, "posts": 20000, "gallery": 5000, "schedules_per_day": 100},
+    "large": {"members": 100000, "matches": 5000000, "years": 5, "posts": 100000, "gallery": 20000, "schedules_per_day": 300},
+}
+
+SURNAMES = "김이박최정강조윤장임한오서신권황안송류전홍고문양손배백허유남심노하곽성차주우구민진나엄채원천방공현함변염여추도소석선설마길연위표명기반왕금옥육인맹제모탁국어은편용예봉경사부가복태목형피두감호제갈"
+GIVEN = "민서준도윤하은지우현수연예진주원유채시호영재승성혜정희동건태아소나율다미경한규"
+POST_WORDS = ["오늘", "코트", "레슨", "복식", "랠리", "서브", "발리", "스매시", "라켓", "줄", "교체", "정모",
+              "번개", "비", "우천", "취소", "대회", "후기", "공지", "회비", "신입", "환영", "날씨", "조명"]
+
+
+def member_rows(rng: random.Random, count: int):
+    for i in range(count):
+        name = rng.choice(SURNAMES) + rng.choice(GIVEN) + rng.choice(GIVEN)
+        yield {
+            "name": name, "phone": f"010{i:08d}", "birth": str(rng.randint(1955, 2002)), "pin": "1234",
+            "role": "ADMIN" if i == 0 else "MEMBER",
+            # 일부는 승인 대기 / 탈퇴
+            "is_approved": i == 0 or rng.random() > 0.02,
+            "is_active": i == 0 or rng.random() > 0.01,
+            "rank_point": 0, "wins": 0, "draws": 0, "losses": 0, "game_diff": 0,
+        }
+
+
+def player_weights(rng: random.Random, count: int) -> list:
+    """누적 가중치: 자주 나오는 회원과 가끔 나오는 회원 (파레토 분포)"""
+    weights = [rng.paretovariate(1.5) for _ in range(count)]
+    return list(itertools.accumulate(weights))
+
+
+def match_rows(rng: random.Random, count: int, members: int, start: datetime.datetime, end: datetime.datetime):
+    """start ~ end 사이 시간순 경기 (id 순서 = 경기 순서)"""
+    cum_weights = player_weights(rng, members)
+    ids = range(1, members + 1)
+    step = (end - start).total_seconds() / max(count, 1)
+    for i in range(count):
+        players = set()
+        while len(players) < 4:
+            players.update(rng.choices(ids, cum_weights=cum_weights, k=4 - len(players)))
+        a1, a2, b1, b2 = players
+        winner, loser = 6, rng.choice((0, 1, 2, 3, 4, 4, 5, 5, 6))
+        score_a, score_b = (winner, loser) if rng.random() < 0.5 else (loser, winner)
+        yield {
+            "team_a_player1_id": a1, "team_a_player2_id": a2,
+            "team_b_player1_id": b1, "team_b_player2_id": b2,
+            "score_team_a": score_a, "score_team_b": score_b,
+            "date": start + datetime.timedelta(seconds=i * step + rng.random() * step),
+        }
+
+
+def post_rows(rng: random.Random, count: int, members: int, now: datetime.datetime):
+    # 게시글은 30일 보관이므로 최근 30일 안에 분포
+    for i in range(count):
+        words = rng.choices(POST_WORDS, k=rng.randint(20, 120))
+        yield {
+            "title": " ".join(rng.choices(POST_WORDS, k=3)),
+            "author_name": f"회원{rng.randint(1, members)}",
+            "content": " ".join(words),
+            "password": "0000",
+            "created_at": now - datetime.timedelta(seconds=(count - i) * 30 * 86400 / count),
+        }
+
+
+def gallery_rows(rng: random.Random, count: int, members: int, now: datetime.datetime):
+    for i in range(count):
+        is_video = rng.random() < 0.1
+        yield {
+            "uploader_name": f"회원{rng.randint(1, members)}",
+            "file_type": "VIDEO" if is_video else "IMAGE",
+            "file_path": f"mock_{i}.{'mp4' if is_video else 'jpg'}",
+            "created_at": now - datetime.timedelta(minutes=(count - i) * 17),
+        }
+
+
+def schedule_rows(rng: random.Random, per_day: int, members: int, names: dict, today: datetime.date):
+    """지난 7일 ~ 앞으로 14일, 하루 per_day건 (같은 날 같은 회원은 한 번만 -> 시간 중복 없음)"""
+    for offset in range(-7, 15):
+        day = today + datetime.timedelta(days=offset)
+        for member_id in rng.sample(range(1, members + 1), min(per_day, members)):
+            start = rng.randrange(6 * 60, 21 * 60, 30)
+            end = min(start + rng.choice((60, 90, 120)), 24 * 60 - 1)
+            yield {
+                "member_id": member_id, "member_name": names[member_id], "date": day,
+                "start_time": f"{start // 60:02d}:{start % 60:02d}", "end_time": f"{end // 60:02d}:{end % 60:02d}",
+                "start_minute": start, "end_minute": end,
+            }
+
+
+def bulk_insert(engine, table, rows, label: str) -> int:
+    """
+    BATCH_SIZE 행씩 executemany (배치마다 commit)
+    빈 테이블에 넣으므로 보조 인덱스는 지웠다가 마지막에 한 번에 생성 (행마다 B-tree 갱신 방지)
+    """
+    total = 0
+    started = time.perf_counter()
+    indexes = list(table.indexes)
+    for index in indexes:
+        index.drop(engine)
+    rows = iter(rows)
+    while True:
+        batch = list(itertools.islice(rows, BATCH_SIZE))
+        if not batch:
+            break
+        with engine.begin() as conn:
+            conn.execute(table.insert(), batch)
+        total += len(batch)
+    for index in indexes:
+        index.create(engine)
+    print(f"  {label:<16} {total:>10,}행  {time.perf_counter() - started:6.1f}초")
+    return total
+
+
+def derive_league_tables(engine, today: datetime.date, first_month: tuple) -> None:
+    """경기 원장으로 시즌 집계 / 월말 정산 기록 / 이번 달 성적 / 누적 승점 / 레이팅 계산"""
+    from sqlalchemy import func, select, update, literal
+    from sqlalchemy.orm import sessionmaker
+    import models
+    import standings
+    import league_history
+    import rating
+
+    db = sessionmaker(bind=engine)()
+    try:
+        started = time.perf_counter()
+        standings.rebuild(db)
+
+        s = models.MemberSeasonStats
+        current = (today.year, today.month)
+        last_settled = league_history.shift_month(*current, -1)
+        period = first_month
+        settled_months = 0
+        while period <= last_settled:
+            year, month = period
+            # 정산 시각: 다음 달 0시 (말일 23:59 이후 경기도 그 달 성적에 포함 -> 원장 집계와 경계 일치)
+            recorded_at = datetime.datetime(*league_history.shift_month(year, month, 1), 1)
+            db.execute(models.LeagueHistory.__table__.insert().from_select(
+                ["member_id", "year", "month", "total_points", "final_wins", "final_losses", "final_diff", "recorded_at"],
+                select(s.member_id, literal(year), literal(month), s.rank_point, s.wins, s.losses, s.game_diff,
+                       literal(recorded_at)).where(s.year == year, s.month == month)
+            ))
+            db.add(models.SettlementRun(
+                year=year, month=month, status="DONE", phase="ROLLING", last_member_id=0,
+                started_at=recorded_at, updated_at=recorded_at, finished_at=recorded_at,
+            ))
+            settled_months += 1
+            period = league_history.shift_month(year, month, 1)
+
+        # 이번 달 성적 -> members 누적 카운터
+        m = models.Member
+        for column in standings.STAT_COLUMNS:
+            db.execute(update(m).values({column: func.coalesce(
+                select(getattr(s, column)).where(s.member_id == m.id, s.year == current[0], s.month == current[1])
+                .scalar_subquery(), 0
+            )}))
+        league_history.refresh_rolling_points(db, *last_settled)
+        db.commit()
+        print(f"  {'리그 집계':<16} {settled_months:>10,}개월  {time.perf_counter() - started:6.1f}초")
+
+        started = time.perf_counter()
+        replayed = rating.rebuild(db)
+        print(f"  {'레이팅':<16} {replayed:>10,}경기  {time.perf_counter() - started:6.1f}초")
+    finally:
+        db.close()
+
+
+def generate(engine, members: int, matches: int, years: int, posts: int, gallery: int,
+             schedules_per_day: int, seed: int = 7, today: datetime.date = None) -> dict:
+    import models
+    import search
+
+    today = today or datetime.date.today()
+    now = datetime.datetime.combine(today, datetime.time(21, 0))
+    rng = random.Random(seed)
+    first_month = (today.year - years, today.month)
+    start = datetime.datetime(*first_month, 1)
+
+    counts = {}
+    members_list = list(member_rows(rng, members))
+    names = {i + 1: row["name"] for i, row in enumerate(members_list)}
+    counts["members"] = bulk_insert(engine, models.Member.__table__, members_list, "members")
+    counts["matches"] = bulk_insert(engine, models.Match.__table__,
+                                    match_rows(rng, matches, members, start, now), "matches")
+    counts["community_posts"] = bulk_insert(engine, models.CommunityPost.__table__,
+                                            post_rows(rng, posts, members, now), "community_posts")
+    counts["gallery"] = bulk_insert(engine, models.Gallery.__table__,
+                                    gallery_rows(rng, gallery, members, now), "gallery")
+    counts["schedules"] = bulk_insert(engine, models.Schedule.__table__,
+                                      schedule_rows(rng, schedules_per_day, members, names, today), "schedules")
+    derive_league_tables(engine, today, first_month)
+    search.rebuild(engine)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대용량 테스트 데이터 생성")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="medium")
+    parser.add_argument("--database-url")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--reset", action="store_true", help="기존 테이블을 지우고 다시 생성")
+    for key in PROFILES["medium"]:
+        parser.add_argument(f"--{key.replace('_', '-')}", type=int, help=f"{key} (기본: 프로필 값)")
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    import models
+    from database import engine
+
+    options = dict(PROFILES[args.profile])
+    options.update({key: getattr(args, key) for key in options if getattr(args, key) is not None})
+
+    if args.reset:
+        models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        if conn.execute(models.Member.__table__.select().limit(1)).first():
+            print("⚠️ [Mock] 회원 데이터가 이미 있습니다. 다시 만들려면 --reset 을 지정하세요.")
+            return 1
+
+    print(f"🎾 [Mock] {engine.url.render_as_string(hide_password=True)} (seed={args.seed}) {options}")
+    started = time.perf_counter()
+    counts = generate(engine, seed=args.seed, **options)
+    print(f"✅ [Mock] 완료: {sum(counts.values()):,}행, {time.perf_counter() - started:.1f}초")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, DateTime, Date
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, BigInteger, Float, String, DateTime, Date, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from database import Base  # [수정 1] 점(.) 제거: 절대 경로 사용
 import datetime
@@ -22,6 +22,9 @@ class Member(Base):
     draws = Column(Integer, default=0)
     losses = Column(Integer, default=0)
 
+    # 복식 Elo 레이팅 (월말 정산으로 초기화되지 않음, rating.py)
+    rating = Column(Float, default=1500.0)
+
     # [신규 추가] 소프트 삭제(임시 삭제) 플래그
     # True: 활동 중, False: 삭제 대기(휴지통)
     is_active = Column(Boolean, default=True)
@@ -32,18 +35,21 @@ class Match(Base):
     id = Column(Integer, primary_key=True, index=True)
     
     # Team A
-    team_a_player1_id = Column(Integer, ForeignKey("members.id"))
-    team_a_player2_id = Column(Integer, ForeignKey("members.id"))
+    team_a_player1_id = Column(Integer, ForeignKey("members.id"), index=True)
+    team_a_player2_id = Column(Integer, ForeignKey("members.id"), index=True)
     
     # Team B
-    team_b_player1_id = Column(Integer, ForeignKey("members.id"))
-    team_b_player2_id = Column(Integer, ForeignKey("members.id"))
+    team_b_player1_id = Column(Integer, ForeignKey("members.id"), index=True)
+    team_b_player2_id = Column(Integer, ForeignKey("members.id"), index=True)
     
     score_team_a = Column(Integer)
     score_team_b = Column(Integer)
     
     # [수정 2] 최신 파이썬 표준에 맞게 시간대(Timezone) 설정
-    date = Column(DateTime, default=lambda: datetime.datetime.now(datetime.timezone.utc))
+    date = Column(DateTime, default=lambda: datetime.datetime.now(datetime.timezone.utc), index=True)
+
+    # 이 경기로 팀 A 선수에게 적용한 레이팅 변화량 (팀 B는 부호 반대, 삭제/수정 시 되돌림)
+    rating_delta = Column(Float, default=0.0)
 
     team_a_player1 = relationship("Member", foreign_keys=[team_a_player1_id])
     team_a_player2 = relationship("Member", foreign_keys=[team_a_player2_id])
@@ -52,6 +58,10 @@ class Match(Base):
 
 class Schedule(Base):
     __tablename__ = "schedules"
+    __table_args__ = (
+        # 날짜 범위 조회 + 시간 순 정렬 / 겹치는 약속 확인용
+        Index("ix_schedules_date_start", "date", "start_minute"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     member_id = Column(Integer, ForeignKey("members.id"))
@@ -59,12 +69,36 @@ class Schedule(Base):
     start_time = Column(String(10)) # HH:mm
     end_time = Column(String(10))   # HH:mm
     date = Column(Date)             # YYYY-MM-DD
+    # 자정 기준 분 (문자열 대신 정수로 비교, 예: 10:30 -> 630)
+    start_minute = Column(Integer)
+    end_minute = Column(Integer)
     
     member = relationship("Member")
 
+# [신규 추가] 보관 기간이 지난 약속 (schedule_slots.archive_past가 schedules에서 이동)
+class ScheduleArchive(Base):
+    __tablename__ = "schedule_archive"
+
+    id = Column(Integer, primary_key=True, index=True)
+    schedule_id = Column(Integer, index=True)  # 원래 schedules.id (재사용될 수 있어 유일하지 않음)
+    member_id = Column(Integer, index=True)
+    member_name = Column(String(50))
+    start_time = Column(String(10))
+    end_time = Column(String(10))
+    date = Column(Date, index=True)
+    start_minute = Column(Integer)
+    end_minute = Column(Integer)
+    archived_at = Column(DateTime, default=datetime.datetime.utcnow)
+
 # [신규 추가] 지난달 기록 보관용 테이블
 class LeagueHistory(Base):
     __tablename__ = "league_histories"
+    __table_args__ = (
+        # 회원별 기록 조회 / 월별 기록 조회용 복합 인덱스
+        # 회원당 한 달 1건 (월말 정산을 다시 실행해도 중복 기록 없음)
+        Index("uq_league_histories_member_period", "member_id", "year", "month", unique=True),
+        Index("ix_league_histories_period", "year", "month"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     member_id = Column(Integer, ForeignKey("members.id"))
@@ -84,6 +118,139 @@ class LeagueHistory(Base):
     # 멤버와 연결
     member = relationship("Member")
 
+# [신규 추가] 월말 정산 실행 기록 (정산 월당 1행, 중단 시 이어서 진행)
+class SettlementRun(Base):
+    __tablename__ = "settlement_runs"
+    __table_args__ = (
+        UniqueConstraint("year", "month", name="uq_settlement_runs_period"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    year = Column(Integer)
+    month = Column(Integer)
+    status = Column(String(20), default="RUNNING")  # RUNNING / DONE
+    phase = Column(String(20), default="HISTORY")   # HISTORY -> PURGE -> ROLLING
+    last_member_id = Column(Integer, default=0)     # 현재 단계에서 처리가 끝난 회원 ID
+    members_settled = Column(Integer, default=0)
+    members_purged = Column(Integer, default=0)
+    owner = Column(String(36), nullable=True)       # 진행 중인 실행 ID
+    started_at = Column(DateTime, default=datetime.datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+# [신규 추가] 정기 작업 리더 임대 (여러 워커 중 한 곳만 스케줄 작업 실행)
+class SchedulerLease(Base):
+    __tablename__ = "scheduler_leases"
+
+    name = Column(String(50), primary_key=True)
+    owner = Column(String(100))      # 호스트:PID:임의값
+    expires_at = Column(DateTime)    # 갱신이 없으면 이 시각 이후 다른 프로세스가 획득
+    acquired_at = Column(DateTime)
+    renewed_at = Column(DateTime)
+
+# [신규 추가] 정기 작업 실행 기록 (소요 시간 / 결과)
+class JobRun(Base):
+    __tablename__ = "job_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_name = Column(String(50), index=True)
+    owner = Column(String(100))
+    status = Column(String(20))       # OK / ERROR
+    error = Column(String(500), nullable=True)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    duration_ms = Column(Integer)
+
+# [신규 추가] 최근 N개월 누적 성적 (월말 정산 시 league_histories로부터 갱신)
+# 토너먼트 시드 배정 / 누적 랭킹 화면은 이 테이블 한 번 조회로 처리
+class LeagueRollingPoints(Base):
+    __tablename__ = "league_rolling_points"
+    __table_args__ = (
+        UniqueConstraint("window_months", "member_id", name="uq_league_rolling_points"),
+        Index("ix_league_rolling_points_rank", "window_months", "total_points"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    window_months = Column(Integer)  # 집계 기간 (6 또는 12개월)
+    member_id = Column(Integer, ForeignKey("members.id"))
+
+    total_points = Column(Integer, default=0)
+    total_wins = Column(Integer, default=0)
+    total_losses = Column(Integer, default=0)
+    total_diff = Column(Integer, default=0)
+    months_played = Column(Integer, default=0)
+
+    # 마지막으로 반영된 정산 월
+    through_year = Column(Integer)
+    through_month = Column(Integer)
+
+    member = relationship("Member")
+
+# [신규 추가] 회원별 월(시즌)별 리그 성적 집계 (matches 테이블 기준 프로젝션)
+# matches가 원본(source of truth)이며, 이 테이블은 언제든 standings.py rebuild로 재생성 가능
+class MemberSeasonStats(Base):
+    __tablename__ = "member_season_stats"
+    __table_args__ = (
+        UniqueConstraint("member_id", "year", "month", name="uq_member_season_stats"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    member_id = Column(Integer, ForeignKey("members.id"))
+    year = Column(Integer)
+    month = Column(Integer)
+
+    rank_point = Column(Integer, default=0)
+    wins = Column(Integer, default=0)
+    draws = Column(Integer, default=0)
+    losses = Column(Integer, default=0)
+    game_diff = Column(Integer, default=0)
+
+# [신규 추가] 토너먼트 (대진표 저장 및 승자 진출)
+class Tournament(Base):
+    __tablename__ = "tournaments"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100))
+    size = Column(Integer)           # 대진표 크기 (2의 거듭제곱)
+    entrant_count = Column(Integer)  # 실제 참가 인원 (나머지는 부전승)
+    status = Column(String(20), default="IN_PROGRESS")  # IN_PROGRESS / COMPLETED
+    champion_id = Column(Integer, ForeignKey("members.id"), nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.datetime.now(datetime.timezone.utc))
+
+class TournamentRound(Base):
+    __tablename__ = "tournament_rounds"
+    __table_args__ = (
+        UniqueConstraint("tournament_id", "round_number", name="uq_tournament_rounds"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    tournament_id = Column(Integer, ForeignKey("tournaments.id"), index=True)
+    round_number = Column(Integer)  # 1 = 첫 라운드
+    name = Column(String(20))       # '8강전', '4강전', '결승' 등
+    match_count = Column(Integer)
+
+class BracketMatch(Base):
+    __tablename__ = "bracket_matches"
+    __table_args__ = (
+        UniqueConstraint("tournament_id", "round_number", "position", name="uq_bracket_matches_slot"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    tournament_id = Column(Integer, ForeignKey("tournaments.id"), index=True)
+    round_number = Column(Integer)
+    position = Column(Integer)      # 라운드 내 순서 (0부터)
+    match_number = Column(Integer)  # 대진표 전체 경기 번호 (1부터, 라운드 순)
+
+    player1_id = Column(Integer, ForeignKey("members.id"), nullable=True)
+    player2_id = Column(Integer, ForeignKey("members.id"), nullable=True)
+    player1_seed = Column(Integer, nullable=True)
+    player2_seed = Column(Integer, nullable=True)
+
+    score1 = Column(Integer, nullable=True)
+    score2 = Column(Integer, nullable=True)
+    winner_id = Column(Integer, ForeignKey("members.id"), nullable=True)
+    is_bye = Column(Boolean, default=False)
+
 class CommunityPost(Base):
     __tablename__ = "community_posts"
 
@@ -93,7 +260,8 @@ class CommunityPost(Base):
     content = Column(String(2000))
     password = Column(String(20))
     # [수정 2] 시간대 설정 적용
-    created_at = Column(DateTime, default=lambda: datetime.datetime.now(datetime.timezone.utc))
+    # (index: 30일 보관 정리 작업의 범위 조건용)
+    created_at = Column(DateTime, default=lambda: datetime.datetime.now(datetime.timezone.utc), index=True)
 
 class Gallery(Base):
     __tablename__ = "gallery"
@@ -103,4 +271,29 @@ class Gallery(Base):
     file_type = Column(String(20)) # 'IMAGE' or 'VIDEO'
     file_path = Column(String(255))
     thumbnail_path = Column(String(255), nullable=True)
+    # 내용 해시 (media_blobs 참조, 기존 uuid 파일은 None)
+    content_hash = Column(String(64), nullable=True, index=True)
     created_at = Column(DateTime, default=lambda: datetime.datetime.now(datetime.timezone.utc))
+
+# 내용 해시(sha256) 기준으로 한 번만 저장되는 업로드 파일
+# ref_count: 이 파일을 가리키는 gallery 행 수 (0이 되면 파일 삭제)
+class MediaBlob(Base):
+    __tablename__ = "media_blobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    content_hash = Column(String(64), unique=True, nullable=False)
+    file_path = Column(String(255), nullable=False)
+    size = Column(BigInteger, default=0)
+    ref_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=lambda: datetime.datetime.now(datetime.timezone.utc))
+
+# 이어받기 업로드 세션 (받은 바이트 수는 임시 파일 크기로 판단)
+class UploadSession(Base):
+    __tablename__ = "upload_sessions"
+
+    id = Column(String(36), primary_key=True)
+    uploader_name = Column(String(50))
+    file_type = Column(String(20))
+    file_extension = Column(String(20))
+    total_size = Column(BigInteger, nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.datetime.now(datetime.timezone.utc), index=True)
@@ -0,0 +1,244 @@
+"""
+복식 Elo 레이팅 (월말 정산으로 초기화되지 않고 시즌을 넘어 누적)
+
+- 팀 레이팅 = 두 선수 레이팅 평균 -> 파트너와 상대 팀의 실력을 함께 반영
+- 팀 A 기대 승률 E = 1 / (1 + 10^((팀 B - 팀 A) / 400)), 결과 S = 승 1 / 무 0.5 / 패 0
+- 변화량 d = K * (S - E): 팀 A 두 선수 +d, 팀 B 두 선수 -d (합계 0)
+- 경기마다 적용한 d를 matches.rating_delta에 저장
+  -> 경기 등록/삭제는 선수 4명만 UPDATE rating = rating + :d (O(1), 동시 등록에도 갱신 유실 없음)
+  -> 수정은 기존 d를 되돌린 뒤 새 결과로 다시 계산
+- 증분 갱신은 등록 순서 기준이라 지난 경기를 지우거나 고치면 그 뒤 경기의 변화량은 그대로 남음
+  -> rebuild: matches 전체를 경기 시각 순으로 다시 계산 (NumPy, 선수가 겹치지 않는 경기끼리 묶어 한 번에 계산)
+
+환경변수:
+    RATING_K  경기당 최대 변화량 (기본 24)
+
+사용법 (backend 디렉터리에서):
+    python rating.py rebuild
+    python rating.py check
+"""
+import os
+import sys
+import time
+import types
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.orm import Session
+from database import SessionLocal
+import models
+
+try:
+    import numpy as np
+except ImportError:  # numpy는 선택 사항 (없으면 경기 단위 반복으로 재계산, 결과 동일)
+    np = None
+
+INITIAL = 1500.0
+K = float(os.getenv("RATING_K", "24"))
+# check에서 차이로 보지 않는 오차 (부동소수점 누적)
+TOLERANCE = 0.01
+
+
+def current(member) -> float:
+    return member.rating if member.rating is not None else INITIAL
+
+
+def _team(ratings: dict, first, second) -> float:
+    values = [ratings[mid] for mid in (first, second) if mid is not None]
+    return sum(values) / len(values) if values else INITIAL
+
+
+def match_delta(ratings: dict, match) -> float:
+    """경기 1건의 팀 A 선수 변화량 (팀 B는 부호 반대), ratings: {member_id: 레이팅}"""
+    team_a = _team(ratings, match.team_a_player1_id, match.team_a_player2_id)
+    team_b = _team(ratings, match.team_b_player1_id, match.team_b_player2_id)
+    expected = 1.0 / (1.0 + 10.0 ** ((team_b - team_a) / 400.0))
+    if match.score_team_a > match.score_team_b:
+        score = 1.0
+    elif match.score_team_a < match.score_team_b:
+        score = 0.0
+    else:
+        score = 0.5
+    return K * (score - expected)
+
+
+def member_deltas(match, delta: float) -> dict:
+    """팀 A 변화량 -> {member_id: 변화량}"""
+    result = {}
+    for member_id, sign in ((match.team_a_player1_id, 1), (match.team_a_player2_id, 1),
+                            (match.team_b_player1_id, -1), (match.team_b_player2_id, -1)):
+        if member_id is not None:
+            result[member_id] = result.get(member_id, 0.0) + sign * delta
+    return result
+
+
+def assign(members: dict, matches) -> dict:
+    """
+    새 경기들의 rating_delta를 순서대로 계산해 설정 (같은 요청 안의 앞 경기 결과를 반영)
+    members: {id: Member}, 반환: 회원별 변화량 합계 -> apply_deltas
+    """
+    ratings = {mid: current(m) for mid, m in members.items()}
+    totals = {}
+    for match in matches:
+        match.rating_delta = match_delta(ratings, match)
+        for member_id, change in member_deltas(match, match.rating_delta).items():
+            ratings[member_id] += change
+            totals[member_id] = totals.get(member_id, 0.0) + change
+    return totals
+
+
+def apply_deltas(db: Session, deltas: dict) -> None:
+    """UPDATE members SET rating = rating + :delta WHERE id = :id (executemany 한 번)"""
+    params = [{"b_id": mid, "d_rating": change} for mid, change in deltas.items() if change]
+    if not params:
+        return
+    table = models.Member.__table__
+    db.execute(
+        table.update().where(table.c.id == bindparam("b_id"))
+        .values(rating=func.coalesce(table.c.rating, INITIAL) + bindparam("d_rating")),
+        params
+    )
+
+
+# --- 전체 재계산 ---
+
+def _replay_python(players: list, scores: list) -> tuple:
+    ratings, deltas = {}, []
+    for (a1, a2, b1, b2), (score_a, score_b) in zip(players, scores):
+        for mid in (a1, a2, b1, b2):
+            if mid is not None:
+                ratings.setdefault(mid, INITIAL)
+        match = types.SimpleNamespace(team_a_player1_id=a1, team_a_player2_id=a2, team_b_player1_id=b1,
+                                      team_b_player2_id=b2, score_team_a=score_a, score_team_b=score_b)
+        delta = match_delta(ratings, match)
+        for mid, change in member_deltas(match, delta).items():
+            ratings[mid] += change
+        deltas.append(delta)
+    return ratings, deltas
+
+
+def _levels(slots, count: int):
+    """
+    경기별 계산 단계: 참가 선수의 직전 경기 단계 + 1
+    같은 단계의 경기는 선수가 겹치지 않으므로 순서와 무관하게 한 번에 계산 가능
+    """
+    last = [0] * count
+    levels = []
+    for a1, a2, b1, b2 in slots.tolist():
+        level = max(last[a1], last[a2], last[b1], last[b2]) + 1
+        last[a1] = last[a2] = last[b1] = last[b2] = level
+        levels.append(level)
+    return np.array(levels, dtype=np.int64)
+
+
+def _replay_numpy(players: list, scores: list) -> tuple:
+    raw = np.array([[-1 if mid is None else mid for mid in row] for row in players], dtype=np.int64).reshape(-1, 4)
+    ids, slots = np.unique(raw, return_inverse=True)
+    slots = slots.reshape(-1, 4)
+    score_a, score_b = np.array(scores, dtype=np.int64).reshape(-1, 2).T
+    result = np.where(score_a > score_b, 1.0, np.where(score_a < score_b, 0.0, 0.5))
+
+    # 자리별 가중치: 팀 B 평균 - 팀 A 평균 = (레이팅 * weight).sum() + bias
+    # 빈 자리(-1)도 슬롯 하나를 차지하지만 가중치 0이라 계산에 쓰이지 않음
+    valid = (raw >= 0).astype(np.float64)
+    count_a, count_b = valid[:, :2].sum(axis=1), valid[:, 2:].sum(axis=1)
+    weight = valid * np.stack([-1 / np.maximum(count_a, 1)] * 2 + [1 / np.maximum(count_b, 1)] * 2, axis=1)
+    bias = INITIAL * ((count_b == 0).astype(np.float64) - (count_a == 0))
+    spread = valid * np.array([1.0, 1.0, -1.0, -1.0])
+    # 한 경기에 같은 선수가 두 번 있는 경기 (add.at으로 변화량을 모두 반영)
+    ordered = np.sort(np.where(raw >= 0, raw, -np.arange(1, 5)), axis=1)
+    repeated = (ordered[:, 1:] == ordered[:, :-1]).any(axis=1)
+
+    # 단계 순으로 정렬해 단계마다 연속 구간으로 계산
+    levels = _levels(slots, len(ids))
+    order = np.argsort(levels, kind="stable")
+    slots, weight, bias, spread, result = slots[order], weight[order], bias[order], spread[order], result[order]
+    sorted_levels = levels[order]
+    bounds = np.concatenate(([0], np.flatnonzero(np.diff(sorted_levels)) + 1, [len(order)]))
+    repeated_levels = set(levels[repeated].tolist())
+
+    ratings = np.full(len(ids), INITIAL)
+    deltas = np.empty(len(order))
+    for lo, hi in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+        s = slots[lo:hi]
+        diff = np.einsum("ij,ij->i", ratings[s], weight[lo:hi]) + bias[lo:hi]
+        delta = K * (result[lo:hi] - 1.0 / (1.0 + 10.0 ** (diff / 400.0)))
+        deltas[lo:hi] = delta
+        change = delta[:, None] * spread[lo:hi]
+        if int(sorted_levels[lo]) in repeated_levels:
+            np.add.at(ratings, s, change)
+        else:
+            ratings[s] += change
+
+    match_deltas = np.empty(len(order))
+    match_deltas[order] = deltas
+    return ({int(mid): float(value) for mid, value in zip(ids, ratings) if mid >= 0}, match_deltas.tolist())
+
+
+def replay(db: Session) -> tuple:
+    """
+    matches 전체를 경기 시각(같으면 ID) 순으로 다시 계산
+    반환: ({member_id: 레이팅}, [(match_id, rating_delta)])
+    """
+    m = models.Match
+    rows = db.execute(select(
+        m.id, m.team_a_player1_id, m.team_a_player2_id, m.team_b_player1_id, m.team_b_player2_id,
+        m.score_team_a, m.score_team_b
+    ).order_by(m.date, m.id)).all()
+    if not rows:
+        return {}, []
+    players = [row[1:5] for row in rows]
+    scores = [row[5:7] for row in rows]
+    ratings, deltas = (_replay_numpy if np is not None else _replay_python)(players, scores)
+    return ratings, list(zip((row[0] for row in rows), deltas))
+
+
+def rebuild(db: Session) -> int:
+    """members.rating / matches.rating_delta를 재계산 결과로 덮어씀, 반환: 경기 수"""
+    ratings, deltas = replay(db)
+    members = models.Member.__table__
+    matches = models.Match.__table__
+    db.execute(members.update().values(rating=INITIAL))
+    if ratings:
+        db.execute(members.update().where(members.c.id == bindparam("b_id")).values(rating=bindparam("b_rating")),
+                   [{"b_id": mid, "b_rating": value} for mid, value in ratings.items()])
+    if deltas:
+        db.execute(matches.update().where(matches.c.id == bindparam("b_id")).values(rating_delta=bindparam("b_delta")),
+                   [{"b_id": match_id, "b_delta": delta} for match_id, delta in deltas])
+    db.commit()
+    return len(deltas)
+
+
+def check_drift(db: Session) -> list:
+    """저장된 레이팅 vs 전체 재계산 결과 (TOLERANCE 이상 차이 나는 회원)"""
+    ratings, _ = replay(db)
+    drift = []
+    for member_id, name, stored in db.execute(select(models.Member.id, models.Member.name, models.Member.rating)):
+        expected = ratings.get(member_id, INITIAL)
+        stored = INITIAL if stored is None else stored
+        if abs(stored - expected) >= TOLERANCE:
+            drift.append({"member_id": member_id, "name": name, "stored": stored, "replay": expected})
+    return drift
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "check"
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        if command == "rebuild":
+            count = rebuild(db)
+            print(f"✅ [Rating] 재계산 완료: 경기 {count}건 ({time.perf_counter() - started:.2f}초, "
+                  f"{'numpy' if np is not None else 'python'})")
+        elif command == "check":
+            drift = check_drift(db)
+            for item in drift:
+                print(f"⚠️ [Drift] 회원 {item['name']}(ID: {item['member_id']}) "
+                      f"저장값={item['stored']:.2f} 재계산={item['replay']:.2f}")
+            if drift:
+                print(f"⚠️ [Rating] 불일치 {len(drift)}명 -> python rating.py rebuild")
+                sys.exit(1)
+            print(f"✅ [Rating] 불일치 없음 ({time.perf_counter() - started:.2f}초)")
+        else:
+            print(f"알 수 없는 명령: {command} (rebuild | check)")
+            sys.exit(2)
+    finally:
+        db.close()
@@ -0,0 +1,152 @@
+"""
+운동 약속(schedules) 기간 조회 / 시간대별 인원 / 중복 약속 확인 / 지난 약속 보관
+
+- 시간은 "HH:MM" 문자열 대신 자정 기준 분(start_minute, end_minute) 정수로 비교
+  (date, start_minute) 인덱스로 날짜 범위 + 시간 순 조회
+- 같은 회원이 같은 날 겹치는 시간에 약속을 두 번 등록하면 충돌 (start < 기존 끝 AND end > 기존 시작)
+- SCHEDULE_RETENTION_DAYS(기본 30일)가 지난 약속은 schedule_archive로 옮기고 schedules에서 삭제
+
+사용법 (backend 디렉터리에서):
+    python schedule_slots.py backfill   # 기존 약속의 분 컬럼 채우기 (migrate_schema에서도 실행)
+    python schedule_slots.py archive    # 지난 약속 보관 (매일 스케줄러 작업)
+"""
+import os
+import sys
+import datetime
+from sqlalchemy import Integer, cast, func, insert, select
+from sqlalchemy.orm import Session
+from database import SessionLocal
+import models
+
+SCHEDULE_RETENTION_DAYS = int(os.getenv("SCHEDULE_RETENTION_DAYS", "30"))
+ARCHIVE_BATCH_SIZE = 500
+# 시간대별 인원 기본 단위(분)
+DEFAULT_SLOT_MINUTES = 30
+# 코트 수용 인원 (0이면 초과 표시 안 함)
+COURT_CAPACITY = int(os.getenv("COURT_CAPACITY", "0"))
+
+
+def to_minute(value: datetime.time) -> int:
+    return value.hour * 60 + value.minute
+
+
+def minute_label(minute: int) -> str:
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+
+def range_query(db: Session, date_from: datetime.date, date_to: datetime.date, skip: int = 0, limit: int = 100) -> list:
+    """date_from ~ date_to(포함) 약속, 날짜/시작 시간 순 (비동기 라우트는 AsyncSession.run_sync로 호출)"""
+    s = models.Schedule
+    return db.query(s).filter(s.date >= date_from, s.date <= date_to)\
+        .order_by(s.date, s.start_minute, s.id).offset(skip).limit(limit).all()
+
+
+def find_overlap(db: Session, member_id: int, day: datetime.date, start: int, end: int, exclude_id: int = None):
+    """같은 회원의 같은 날 겹치는 약속 (없으면 None)"""
+    s = models.Schedule
+    query = db.query(s).filter(
+        s.date == day,
+        s.start_minute < end,
+        s.end_minute > start,
+        s.member_id == member_id,
+    )
+    if exclude_id is not None:
+        query = query.filter(s.id != exclude_id)
+    return query.first()
+
+
+def occupancy(db: Session, day: datetime.date, slot_minutes: int = DEFAULT_SLOT_MINUTES) -> list:
+    """
+    하루를 slot_minutes 단위로 나눠 시간대별 코트 인원 (약속이 있는 시간대만)
+    하루치 약속만 읽어 각 약속이 걸친 시간대에 배정
+    """
+    s = models.Schedule
+    rows = db.query(s.start_minute, s.end_minute, s.member_name)\
+        .filter(s.date == day, s.start_minute.isnot(None)).all()
+
+    slot_count = (24 * 60 + slot_minutes - 1) // slot_minutes
+    names = [[] for _ in range(slot_count)]
+    for start, end, name in rows:
+        last = (max(end, start + 1) - 1) // slot_minutes
+        for index in range(start // slot_minutes, min(last, slot_count - 1) + 1):
+            names[index].append(name)
+
+    slots = []
+    for index in range(slot_count):
+        count = len(names[index])
+        if count:
+            start = index * slot_minutes
+            slots.append({
+                "start_time": minute_label(start),
+                "end_time": minute_label(min(start + slot_minutes, 24 * 60)),
+                "count": count,
+                "member_names": names[index],
+                "over_capacity": bool(COURT_CAPACITY) and count > COURT_CAPACITY,
+            })
+    return slots
+
+
+def backfill_minutes(db: Session) -> int:
+    """분 컬럼이 비어 있는 기존 약속을 "HH:MM" 문자열로부터 채움 (UPDATE 한 번)"""
+    s = models.Schedule
+    def minutes(column):
+        return cast(func.substr(column, 1, 2), Integer) * 60 + cast(func.substr(column, 4, 2), Integer)
+    result = db.query(s).filter(s.start_minute.is_(None), s.start_time.isnot(None))\
+        .update({s.start_minute: minutes(s.start_time), s.end_minute: minutes(s.end_time)},
+                synchronize_session=False)
+    return result
+
+
+def archive_past(db: Session, days: int = SCHEDULE_RETENTION_DAYS, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    """
+    보관 기간이 지난 약속을 schedule_archive로 이동 (INSERT ... SELECT + DELETE, 배치마다 commit)
+    """
+    s = models.Schedule
+    archive = models.ScheduleArchive.__table__
+    cutoff = datetime.date.today() - datetime.timedelta(days=days)
+    columns = ["member_id", "member_name", "date", "start_time", "end_time", "start_minute", "end_minute"]
+    total = 0
+    while True:
+        ids = db.scalars(select(s.id).where(s.date < cutoff).order_by(s.date, s.start_minute).limit(batch_size)).all()
+        if not ids:
+            break
+        # 보관 테이블은 자체 id 사용 (schedules.id는 삭제 후 재사용될 수 있으므로 schedule_id로만 기록)
+        db.execute(insert(archive).from_select(
+            ["schedule_id"] + columns, select(s.id, *[getattr(s, c) for c in columns]).where(s.id.in_(ids))
+        ))
+        db.query(s).filter(s.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+        total += len(ids)
+    return total
+
+
+def archive_past_job():
+    """매일 실행: 지난 약속 보관"""
+    db = SessionLocal()
+    try:
+        count = archive_past(db)
+        if count:
+            print(f"🗄️ [Schedule] 지난 약속 {count}건 보관")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ [Schedule Archive Error] {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "backfill"
+    if command == "backfill":
+        db = SessionLocal()
+        try:
+            count = backfill_minutes(db)
+            db.commit()
+            print(f"✅ [Schedule] 분 컬럼 채우기 완료: {count}건")
+        finally:
+            db.close()
+    elif command == "archive":
+        archive_past_job()
+    else:
+        print(f"알 수 없는 명령: {command} (backfill | archive)")
+        sys.exit(2)
@@ -1,57 +1,275 @@
+"""
+정기 작업 (월말 정산, 게시글/업로드 정리) + 단일 실행 보장
+
+- API 워커가 여러 개여도(uvicorn --workers N) 작업은 한 곳에서만 실행:
+  DB 임대(scheduler_leases) 행을 가진 프로세스만 작업 실행 (MySQL/SQLite 공통, 조건부 UPDATE)
+  임대는 LEASE_RENEW_SECONDS마다 갱신, 리더가 종료되면 LEASE_TTL_SECONDS 후 다른 프로세스가 이어받음
+- 작업 실행 시간/결과는 job_runs에 기록 (GET /scheduler)
+- API 프로세스에서 스케줄러를 끄고(SCHEDULER_ENABLED=0) 별도 프로세스로 실행 가능
+
+사용법 (backend 디렉터리에서):
+    python scheduler.py                 # 스케줄러 단독 실행 (포그라운드)
+    python scheduler.py run <작업 이름>  # 작업 한 번 즉시 실행 (임대 확인)
+    python scheduler.py status          # 현재 리더와 최근 작업 기록
+"""
+import os
+import sys
+import time
+import uuid
+import signal
+import socket
+import datetime
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from database import SessionLocal
 import models
-import datetime
+import settlement
+import media_store
+import schedule_slots
+
+# 커뮤니티 게시글 보관 기간 / 한 번에 지우는 건수 (잠금 시간을 짧게 유지)
+COMMUNITY_RETENTION_DAYS = 30
+PURGE_BATCH_SIZE = 500
 
 def reset_league_and_cleanup():
     """
-    매월 말일 실행:
+    매월 말일 실행 (settlement.py):
     1. 현재 성적을 LeagueHistory에 백업
     2. 현재 성적 0으로 초기화
     3. 탈퇴 대기(is_active=False) 회원 영구 삭제
+    4. 최근 6/12개월 누적 집계 갱신
+    회원 ID 구간별 INSERT ... SELECT / UPDATE로 처리, 다시 실행해도 중복 기록 없음
     """
     db: Session = SessionLocal()
     try:
         print("⏰ [Scheduler] 월말 정산 및 정리 작업 시작...")
-        
-        # 날짜 계산 (지난달 기록으로 저장)
-        now = datetime.datetime.now()
-        record_year = now.year
-        record_month = now.month 
-
-        members = db.query(models.Member).all()
-        
-        for member in members:
-            # 1. 탈퇴 대기 회원 -> 영구 삭제 (이제 진짜 지움)
-            if not member.is_active:
-                print(f"💀 [Cleanup] 탈퇴 대기 회원 영구 삭제: {member.name}")
-                db.delete(member)
-                continue # 삭제했으니 다음으로
-
-            # 2. 활동 회원 -> 기록 백업
-            history = models.LeagueHistory(
-                member_id=member.id,
-                year=record_year,
-                month=record_month,
-                total_points=member.rank_point,
-                final_wins=member.wins,
-                final_losses=member.losses,
-                final_diff=member.game_diff
-            )
-            db.add(history)
-
-            # 3. 점수 초기화 (새 시즌 시작)
-            member.rank_point = 0
-            member.wins = 0
-            member.draws = 0
-            member.losses = 0
-            member.game_diff = 0
-            
-        db.commit()
-        print("✅ [Scheduler] 월말 정산 완료!")
-        
+        run = settlement.run_settlement(db)
+        if run is None:
+            print("ℹ️ [Scheduler] 이미 완료되었거나 다른 워커가 진행 중인 정산입니다.")
+        else:
+            print(f"✅ [Scheduler] {run.year}년 {run.month}월 정산 완료! "
+                  f"(보관 {run.members_settled}명, 정리 {run.members_purged}명)")
+
     except Exception as e:
         print(f"❌ [Scheduler Error] {e}")
+        raise
+    finally:
+        db.close()
+
+def purge_expired_posts(db: Session, days: int = COMMUNITY_RETENTION_DAYS, batch_size: int = PURGE_BATCH_SIZE) -> int:
+    """
+    보관 기간이 지난 게시글을 batch_size건씩 나누어 삭제 (배치마다 commit)
+    created_at 인덱스로 대상만 찾고, 삭제는 PK IN 조건으로 처리
+    """
+    # created_at은 UTC로 저장됨 (DB 컬럼에는 시간대 정보 없음)
+    cutoff = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None) - datetime.timedelta(days=days)
+    total = 0
+    while True:
+        ids = [row.id for row in db.query(models.CommunityPost.id)
+               .filter(models.CommunityPost.created_at < cutoff)
+               .order_by(models.CommunityPost.created_at)
+               .limit(batch_size).all()]
+        if not ids:
+            break
+        db.query(models.CommunityPost).filter(models.CommunityPost.id.in_(ids))\
+            .delete(synchronize_session=False)
+        db.commit()
+        total += len(ids)
+    return total
+
+def purge_expired_posts_job():
+    """매일 실행: 30일 지난 커뮤니티 게시글 정리"""
+    db: Session = SessionLocal()
+    try:
+        count = purge_expired_posts(db)
+        if count:
+            print(f"🧹 [Scheduler] 오래된 게시글 {count}건 삭제")
+    except Exception as e:
+        print(f"❌ [Scheduler Error] 게시글 정리 실패: {e}")
         db.rollback()
+        raise
     finally:
         db.close()
+
+
+# --- 작업 목록: (이름, 함수, cron 설정) ---
+JOBS = [
+    # 매월 말일 23시 59분 월말 정산
+    ("monthly_settlement", reset_league_and_cleanup, {"day": "last", "hour": 23, "minute": 59}),
+    # 말일 실행을 놓친 경우(리더 교체 등) 다음 달 1일에 지난달 정산 (이미 완료면 건너뜀)
+    ("monthly_settlement_catchup", reset_league_and_cleanup, {"day": 1, "hour": 0, "minute": 30}),
+    # 매일 새벽 30일 지난 커뮤니티 게시글 정리 (조회 API에서 분리)
+    ("purge_expired_posts", purge_expired_posts_job, {"hour": 4, "minute": 0}),
+    # 매일 새벽 보관 기간이 지난 운동 약속 보관
+    ("archive_past_schedules", schedule_slots.archive_past_job, {"hour": 4, "minute": 15}),
+    # 매일 새벽 완료되지 않은 이어받기 업로드 정리
+    ("purge_stale_uploads", media_store.purge_stale_sessions_job, {"hour": 4, "minute": 30}),
+]
+
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "1").lower() in ("1", "true", "yes")
+LEASE_NAME = "scheduler"
+LEASE_TTL_SECONDS = int(os.getenv("LEASE_TTL_SECONDS", "60"))
+LEASE_RENEW_SECONDS = int(os.getenv("LEASE_RENEW_SECONDS", "20"))
+
+
+def _utcnow() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+
+class LeaderLease:
+    """DB 행 하나로 리더 선출: 만료됐거나 내가 가진 임대만 조건부 UPDATE로 가져옴"""
+
+    def __init__(self, name: str = LEASE_NAME, ttl: int = LEASE_TTL_SECONDS, owner: str = None):
+        self.name = name
+        self.ttl = ttl
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.is_leader = False
+
+    def acquire(self) -> bool:
+        """임대 획득/갱신 시도, 현재 리더인지 반환"""
+        lease = models.SchedulerLease
+        now = _utcnow()
+        db = SessionLocal()
+        try:
+            updated = db.execute(
+                update(lease).where(
+                    lease.name == self.name,
+                    (lease.owner == self.owner) | (lease.expires_at < now),
+                ).values(owner=self.owner, expires_at=now + datetime.timedelta(seconds=self.ttl), renewed_at=now)
+            ).rowcount
+            if not updated and db.get(lease, self.name) is None:
+                db.add(lease(name=self.name, owner=self.owner, acquired_at=now, renewed_at=now,
+                             expires_at=now + datetime.timedelta(seconds=self.ttl)))
+                try:
+                    db.flush()
+                    updated = 1
+                except IntegrityError:
+                    # 다른 프로세스가 먼저 생성
+                    db.rollback()
+                    updated = 0
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"❌ [Scheduler] 임대 갱신 실패: {e}")
+            updated = 0
+        finally:
+            db.close()
+
+        leader = bool(updated)
+        if leader != self.is_leader:
+            print(f"👑 [Scheduler] 리더 {'획득' if leader else '상실'} ({self.owner})")
+        self.is_leader = leader
+        return leader
+
+    def release(self) -> None:
+        """종료 시 임대 반납 -> 다른 프로세스가 바로 이어받음"""
+        lease = models.SchedulerLease
+        db = SessionLocal()
+        try:
+            db.execute(update(lease).where(lease.name == self.name, lease.owner == self.owner)
+                       .values(expires_at=_utcnow()))
+            db.commit()
+        finally:
+            db.close()
+        self.is_leader = False
+
+
+def run_job(name: str, func, lease: LeaderLease) -> bool:
+    """리더일 때만 작업 실행 후 job_runs에 소요 시간/결과 기록. 실행했으면 True"""
+    if not lease.acquire():
+        return False
+    started = _utcnow()
+    t0 = time.perf_counter()
+    status, error = "OK", None
+    try:
+        func()
+    except Exception as e:
+        status, error = "ERROR", str(e)[:500]
+    duration_ms = int((time.perf_counter() - t0) * 1000)
+
+    db = SessionLocal()
+    try:
+        db.add(models.JobRun(job_name=name, owner=lease.owner, status=status, error=error,
+                             started_at=started, finished_at=_utcnow(), duration_ms=duration_ms))
+        db.commit()
+    finally:
+        db.close()
+    print(f"⏱️ [Scheduler] {name} {status} ({duration_ms}ms)")
+    return True
+
+
+def create_scheduler(scheduler_class=None, lease: LeaderLease = None):
+    """모든 프로세스가 같은 작업을 등록하되 실행은 임대를 가진 리더만"""
+    if scheduler_class is None:
+        from apscheduler.schedulers.background import BackgroundScheduler as scheduler_class
+    lease = lease or LeaderLease()
+    scheduler = scheduler_class()
+    for name, func, cron in JOBS:
+        scheduler.add_job(run_job, "cron", args=[name, func, lease], id=name, **cron)
+    # 임대 갱신 (리더가 죽으면 TTL 후 다른 프로세스가 획득)
+    scheduler.add_job(lease.acquire, "interval", seconds=LEASE_RENEW_SECONDS, id="lease_renew",
+                      next_run_time=datetime.datetime.now())
+    scheduler.lease = lease
+    return scheduler
+
+
+def stop_scheduler(scheduler) -> None:
+    scheduler.shutdown(wait=False)
+    scheduler.lease.release()
+
+
+def status(db: Session, limit: int = 20) -> dict:
+    lease = db.get(models.SchedulerLease, LEASE_NAME)
+    runs = db.query(models.JobRun).order_by(models.JobRun.id.desc()).limit(limit).all()
+    return {
+        "leader": lease.owner if lease and lease.expires_at > _utcnow() else None,
+        "lease_expires_at": lease.expires_at if lease else None,
+        "jobs": [name for name, _, _ in JOBS],
+        "recent_runs": [{
+            "job": r.job_name, "status": r.status, "owner": r.owner, "started_at": r.started_at,
+            "duration_ms": r.duration_ms, "error": r.error,
+        } for r in runs],
+    }
+
+
+if __name__ == "__main__":
+    from database import engine
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "serve"
+    models.Base.metadata.create_all(bind=engine)
+    if command == "serve":
+        from apscheduler.schedulers.blocking import BlockingScheduler
+
+        scheduler = create_scheduler(BlockingScheduler)
+        # 종료 신호(systemd/docker stop)에도 임대 반납
+        signal.signal(signal.SIGTERM, lambda *args: sys.exit(0))
+        print(f"⏰ [Scheduler] 단독 실행 시작 ({scheduler.lease.owner})")
+        try:
+            scheduler.start()
+        except (KeyboardInterrupt, SystemExit):
+            pass
+        finally:
+            scheduler.lease.release()
+    elif command == "run" and len(sys.argv) > 2:
+        jobs = {name: func for name, func, _ in JOBS}
+        if sys.argv[2] not in jobs:
+            print(f"알 수 없는 작업: {sys.argv[2]} ({' | '.join(jobs)})")
+            sys.exit(2)
+        lease = LeaderLease()
+        if not run_job(sys.argv[2], jobs[sys.argv[2]], lease):
+            print("⚠️ [Scheduler] 다른 프로세스가 리더입니다. (리더에서 실행되거나 임대 만료 후 다시 시도)")
+            sys.exit(1)
+        lease.release()
+    elif command == "status":
+        db = SessionLocal()
+        try:
+            info = status(db)
+        finally:
+            db.close()
+        print(f"리더: {info['leader'] or '없음'} (만료 {info['lease_expires_at']})")
+        for r in info["recent_runs"]:
+            print(f"{r['started_at']} {r['job']:28} {r['status']:6} {r['duration_ms']}ms {r['error'] or ''}")
+    else:
+        print(f"알 수 없는 명령: {command} (serve | run <작업 이름> | status)")
+        sys.exit(2)
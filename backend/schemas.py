@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, computed_field
+from typing import Literal, Optional, List
 from datetime import datetime
 
 class MemberBase(BaseModel):
@@ -23,6 +23,9 @@ class LoginResponse(BaseModel):
     role: str
     is_approved: bool
 
+class MemberRoleUpdate(BaseModel):
+    role: Literal["ADMIN", "MEMBER"]
+
 class Member(MemberBase):
     id: int
     rank_point: int
@@ -32,9 +35,9 @@ class Member(MemberBase):
     losses: int
     draws: int
     game_diff: int
+    rating: float
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class MatchBase(BaseModel):
     team_a_player1_id: int
@@ -51,8 +54,17 @@ class Match(MatchBase):
     id: int
     date: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+class MatchBatchItemResult(BaseModel):
+    index: int
+    match: Optional[Match] = None
+    error: Optional[str] = None
+
+class MatchBatchResult(BaseModel):
+    created: int
+    failed: int
+    results: List[MatchBatchItemResult]
 
 class MatchHistoryResponse(BaseModel):
     id: int
@@ -62,8 +74,7 @@ class MatchHistoryResponse(BaseModel):
     team_a_names: str
     team_b_names: str
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 from datetime import date as date_type
 
@@ -79,31 +90,97 @@ class ScheduleCreate(BaseModel):
     end_time: time
     date: date
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "start_time": "10:00:00",
-                "end_time": "12:00:00",
-                "date": "2024-05-20"
-            }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "start_time": "10:00:00",
+            "end_time": "12:00:00",
+            "date": "2024-05-20"
         }
+    })
 
 class Schedule(ScheduleBase):
     id: int
     member_id: int
     date: date_type
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+class ScheduleSlot(BaseModel):
+    start_time: str
+    end_time: str
+    count: int
+    member_names: List[str]
+    over_capacity: bool
+
+class HistoryMember(BaseModel):
+    id: int
+    name: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+class LeagueHistoryResponse(BaseModel):
+    id: int
+    member_id: int
+    year: int
+    month: int
+    total_points: int
+    final_wins: int
+    final_losses: int
+    final_diff: int
+    member: Optional[HistoryMember] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class LeagueRollingResponse(BaseModel):
+    member_id: int
+    window_months: int
+    total_points: int
+    total_wins: int
+    total_losses: int
+    total_diff: int
+    months_played: int
+    through_year: int
+    through_month: int
+    member: Optional[HistoryMember] = None
+
+    model_config = ConfigDict(from_attributes=True)
 
 class TournamentMatch(BaseModel):
-    match_id: int
+    match_id: int  # 대진표 경기 번호 (1부터, 라운드 순)
     round: str # 'QF', 'SF', 'F'
     player1: str
     player2: str
+    bracket_match_id: Optional[int] = None  # 결과 입력용 DB ID
+    round_number: Optional[int] = None
+    position: Optional[int] = None
+    player1_id: Optional[int] = None
+    player2_id: Optional[int] = None
+    player1_seed: Optional[int] = None
+    player2_seed: Optional[int] = None
+    score1: Optional[int] = None
+    score2: Optional[int] = None
+    winner_id: Optional[int] = None
+    winner: Optional[str] = None
+    is_bye: bool = False
+
+class TournamentRoundResponse(BaseModel):
+    round_number: int
+    name: str
+    matches: List[TournamentMatch]
 
 class TournamentBracket(BaseModel):
-    matches: List[TournamentMatch]
+    matches: List[TournamentMatch]  # 첫 라운드 (기존 앱 호환)
+    tournament_id: Optional[int] = None
+    name: Optional[str] = None
+    size: Optional[int] = None
+    status: Optional[str] = None
+    champion: Optional[str] = None
+    rounds: List[TournamentRoundResponse] = []
+
+class TournamentResultCreate(BaseModel):
+    winner_id: int
+    score1: Optional[int] = None
+    score2: Optional[int] = None
 
 class CommunityPostBase(BaseModel):
     title: str
@@ -117,8 +194,18 @@ class CommunityPostResponse(CommunityPostBase):
     id: int
     created_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+# 목록용 (본문 전체 대신 앞부분만, 전체 내용은 GET /community/{id})
+class CommunityPostSummary(BaseModel):
+    id: int
+    title: str
+    author_name: str
+    snippet: str
+    created_at: datetime
+
+class CommunitySearchResult(CommunityPostSummary):
+    score: float  # 관련도 (클수록 높음)
 
 class GalleryBase(BaseModel):
     uploader_name: str
@@ -127,11 +214,38 @@ class GalleryBase(BaseModel):
 class GalleryCreate(GalleryBase):
     pass
 
+def media_url(path: Optional[str]) -> Optional[str]:
+    """저장 경로(uploads/...) -> 앱에서 접근하는 URL 경로(/images/...)"""
+    if not path:
+        return None
+    return "/images/" + path.split("uploads/", 1)[-1]
+
 class GalleryResponse(GalleryBase):
     id: int
     file_path: str
     thumbnail_path: Optional[str] = None
+    content_hash: Optional[str] = None
     created_at: datetime
 
-    class Config:
-        orm_mode = True
+    @computed_field
+    @property
+    def file_url(self) -> Optional[str]:
+        return media_url(self.file_path)
+
+    @computed_field
+    @property
+    def thumbnail_url(self) -> Optional[str]:
+        return media_url(self.thumbnail_path)
+
+    model_config = ConfigDict(from_attributes=True)
+
+class UploadSessionCreate(BaseModel):
+    uploader_name: str
+    file_type: str  # 'IMAGE' or 'VIDEO'
+    filename: str
+    total_size: Optional[int] = None  # 알면 지정 (완료 시 크기 검증)
+
+class UploadSessionStatus(BaseModel):
+    upload_id: str
+    received: int  # 서버가 받은 바이트 수 = 다음 조각의 offset
+    total_size: Optional[int] = None
@@ -0,0 +1,184 @@
+"""
+커뮤니티 게시글 전문 검색 (GET /community/search)
+
+- SQLite: FTS5 가상 테이블(community_posts_fts, 외부 콘텐츠 방식)
+  community_posts에 걸린 INSERT/UPDATE/DELETE 트리거로 색인 동기화
+  -> 글 작성, 삭제, 30일 정리 작업(일괄 DELETE) 모두 자동 반영
+  한국어 조사("예약은", "예약을")도 찾도록 검색어마다 접두어 검색("예약"*)
+- MySQL: FULLTEXT 인덱스 + ngram 파서 (InnoDB가 색인을 자동 갱신)
+- 결과는 관련도 순 (SQLite bm25, MySQL MATCH 점수), 제목 일치에 가중치
+- FTS를 쓸 수 없는 환경이면 LIKE 검색으로 대체 (전체 스캔, 경고 출력)
+
+사용법 (backend 디렉터리에서, 색인 생성/재구성):
+    python search.py rebuild
+"""
+import re
+import sys
+from sqlalchemy import inspect, or_, text
+from sqlalchemy.orm import Session
+import models
+
+FTS_TABLE = "community_posts_fts"
+# MATCH(...)의 컬럼 목록은 FULLTEXT 인덱스와 정확히 같아야 하므로 제목 전용 인덱스도 둠
+MYSQL_FULLTEXT_INDEXES = {
+    "ft_community_posts_title_content": "title, content",
+    "ft_community_posts_title": "title",
+}
+# 관련도 계산 시 제목 일치 가중치 (본문 = 1)
+TITLE_WEIGHT = 5.0
+SNIPPET_LENGTH = 80
+MAX_TERMS = 8
+
+_SQLITE_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, content, content='community_posts', content_rowid='id', tokenize='unicode61'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS community_posts_fts_ai AFTER INSERT ON community_posts BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS community_posts_fts_ad AFTER DELETE ON community_posts BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS community_posts_fts_au AFTER UPDATE ON community_posts BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO {FTS_TABLE}(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+]
+
+# ensure_index 결과: "fts5" / "fulltext" / "like"
+_mode = None
+
+
+def search_terms(q: str) -> list:
+    """검색어 -> 단어 목록 (연산자/따옴표 등 특수문자 제거)"""
+    cleaned = re.sub(r"[^\w\s]", " ", q or "")
+    return [term for term in cleaned.split() if term][:MAX_TERMS]
+
+
+def ensure_index(engine) -> str:
+    """전문 검색 색인이 없으면 생성 (여러 번 실행해도 안전), 사용할 검색 방식 반환"""
+    global _mode
+    dialect = engine.dialect.name
+    try:
+        if dialect == "sqlite":
+            with engine.begin() as conn:
+                created = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE name = :name"), {"name": FTS_TABLE}
+                ).first() is None
+                for ddl in _SQLITE_DDL:
+                    conn.execute(text(ddl))
+                if created:
+                    # 기존 게시글 색인
+                    conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+            _mode = "fts5"
+        elif dialect == "mysql":
+            indexes = {index["name"] for index in inspect(engine).get_indexes("community_posts")}
+            for name, columns in MYSQL_FULLTEXT_INDEXES.items():
+                if name in indexes:
+                    continue
+                with engine.begin() as conn:
+                    conn.execute(text(
+                        f"ALTER TABLE community_posts ADD FULLTEXT INDEX {name} ({columns}) WITH PARSER ngram"
+                    ))
+                print(f"✅ 전문 검색 인덱스 생성: community_posts.{name}")
+            _mode = "fulltext"
+        else:
+            _mode = "like"
+    except Exception as e:
+        print(f"⚠️ [Search] 전문 검색 색인을 만들 수 없어 LIKE 검색을 사용합니다: {e}")
+        _mode = "like"
+    return _mode
+
+
+def rebuild(engine) -> None:
+    """색인 전체 재구성 (SQLite FTS5만 해당, MySQL FULLTEXT는 자동 유지)"""
+    if ensure_index(engine) == "fts5":
+        with engine.begin() as conn:
+            conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+
+def search_posts(db: Session, q: str, limit: int = 20) -> list:
+    """
+    관련도 순 검색 결과: [{"id", "title", "author_name", "snippet", "created_at", "score"}]
+    score는 클수록 관련도가 높음
+    """
+    terms = search_terms(q)
+    if not terms:
+        return []
+    mode = _mode or ensure_index(db.get_bind())
+    if mode == "fts5":
+        return _search_fts5(db, terms, limit)
+    if mode == "fulltext":
+        return _search_mysql(db, terms, limit)
+    return _search_like(db, terms, limit)
+
+
+def _search_fts5(db: Session, terms: list, limit: int) -> list:
+    # 모든 단어 포함(AND), 단어별 접두어 검색
+    # 순위 계산은 색인 안에서 rowid만으로 끝내고, 상위 limit건만 게시글과 조인
+    # (본문/요약을 먼저 읽으면 일치하는 모든 글에 대해 계산하게 됨)
+    match = " ".join(f'"{term}"*' for term in terms)
+    rows = db.execute(text(f"""
+        SELECT p.id, p.title, p.author_name, p.created_at,
+               substr(p.content, 1, :snippet_length) AS snippet,
+               hits.rank AS rank
+        FROM (
+            SELECT rowid, bm25({FTS_TABLE}, :title_weight, 1.0) AS rank
+            FROM {FTS_TABLE}
+            WHERE {FTS_TABLE} MATCH :match
+            ORDER BY rank
+            LIMIT :limit
+        ) AS hits
+        JOIN community_posts p ON p.id = hits.rowid
+        ORDER BY hits.rank
+    """), {"match": match, "title_weight": TITLE_WEIGHT,
+           "snippet_length": SNIPPET_LENGTH, "limit": limit}).mappings().all()
+    # bm25는 작을수록 관련도가 높으므로 부호를 뒤집어 반환
+    return [dict(row, score=-row["rank"]) for row in rows]
+
+
+def _search_mysql(db: Session, terms: list, limit: int) -> list:
+    # ngram 파서: 각 단어를 구문("...")으로 검색하면 연속된 2글자 토큰이 모두 있어야 일치
+    against = " ".join(f'+"{term}"' for term in terms)
+    rows = db.execute(text("""
+        SELECT id, title, author_name, created_at,
+               SUBSTRING(content, 1, :snippet_length) AS snippet,
+               MATCH(title) AGAINST (:against IN BOOLEAN MODE) * :title_weight
+                 + MATCH(title, content) AGAINST (:against IN BOOLEAN MODE) AS score
+        FROM community_posts
+        WHERE MATCH(title, content) AGAINST (:against IN BOOLEAN MODE)
+        ORDER BY score DESC, id DESC
+        LIMIT :limit
+    """), {"against": against, "title_weight": TITLE_WEIGHT,
+           "snippet_length": SNIPPET_LENGTH, "limit": limit}).mappings().all()
+    return [dict(row) for row in rows]
+
+
+def _search_like(db: Session, terms: list, limit: int) -> list:
+    post = models.CommunityPost
+    query = db.query(post.id, post.title, post.author_name, post.content, post.created_at)
+    for term in terms:
+        pattern = f"%{term}%"
+        query = query.filter(or_(post.title.like(pattern), post.content.like(pattern)))
+    rows = query.order_by(post.id.desc()).limit(limit).all()
+    results = [{
+        "id": row.id,
+        "title": row.title,
+        "author_name": row.author_name,
+        "created_at": row.created_at,
+        "snippet": (row.content or "")[:SNIPPET_LENGTH],
+        # 제목에 포함된 단어 수를 점수로 사용
+        "score": float(sum(TITLE_WEIGHT for term in terms if term in (row.title or "")) + len(terms)),
+    } for row in rows]
+    results.sort(key=lambda row: row["score"], reverse=True)
+    return results
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "rebuild"
+    if command != "rebuild":
+        print(f"알 수 없는 명령: {command} (rebuild)")
+        sys.exit(2)
+    from database import engine
+    rebuild(engine)
+    print(f"✅ [Search] 검색 색인 재구성 완료 ({_mode})")
@@ -0,0 +1,69 @@
+"""
+목록 응답 빠른 직렬화 (/members/, /league/rankings, /matches, /community, /gallery)
+
+- 기존: ORM 객체 전체 로드 -> 행마다 Pydantic 모델 검증(from_attributes) -> JSON
+- 변경: 응답 스키마에 필요한 컬럼만 SELECT -> 행을 dict로 -> orjson으로 바로 bytes
+  (필드 목록은 schemas.py 응답 모델에서 가져오므로 응답 형식은 그대로)
+- orjson이 없으면 표준 json으로 대체 (출력 형식 동일: 공백 없는 UTF-8, datetime은 ISO 8601)
+
+벤치마크: python bench_serialization.py
+"""
+import json
+import datetime
+from starlette.responses import Response
+import schemas
+
+try:
+    import orjson
+except ImportError:  # orjson은 선택 사항
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    raise TypeError(f"JSON으로 변환할 수 없는 값: {type(value).__name__}")
+
+
+def dumps(value) -> bytes:
+    if orjson is not None:
+        # OPT_UTC_Z: UTC 시각을 Pydantic과 같은 "Z"로 표기
+        return orjson.dumps(value, option=orjson.OPT_UTC_Z)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=_default).encode()
+
+
+class FastJSONResponse(Response):
+    """dict/list를 dumps로 직렬화하는 JSON 응답 (response_model 검증을 거치지 않음)"""
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def fields(schema) -> tuple:
+    """응답 모델의 필드 이름 (computed_field 제외)"""
+    return tuple(schema.model_fields)
+
+
+def columns(model, schema) -> list:
+    """응답 모델 필드와 같은 이름의 ORM 컬럼 (SELECT 목록)"""
+    return [getattr(model, name) for name in fields(schema)]
+
+
+def project(rows, names) -> list:
+    """SELECT 결과 행 -> [{필드: 값}]"""
+    return [dict(zip(names, row)) for row in rows]
+
+
+MEMBER_FIELDS = fields(schemas.Member)
+GALLERY_FIELDS = fields(schemas.GalleryResponse)
+
+
+def gallery_items(rows) -> list:
+    """갤러리 행 -> GalleryResponse와 같은 dict (file_url, thumbnail_url 포함)"""
+    items = project(rows, GALLERY_FIELDS)
+    for item in items:
+        item["file_url"] = schemas.media_url(item["file_path"])
+        item["thumbnail_url"] = schemas.media_url(item["thumbnail_path"])
+    return items
@@ -0,0 +1,239 @@
+"""
+월말 리그 정산 (scheduler.reset_league_and_cleanup에서 호출)
+
+한 달 성적을 league_histories에 보관하고 회원 성적을 0으로 초기화한 뒤 탈퇴 대기 회원을 정리한다.
+- 회원을 모두 메모리에 올리지 않고 회원 ID 구간(SETTLEMENT_BATCH_SIZE)별로
+  아직 기록이 없는 회원 ID만 조회 -> INSERT ... SELECT(기록 보관) + UPDATE(초기화)를 한 트랜잭션으로 처리
+- settlement_runs(정산 월당 1행)에 단계/마지막 처리 ID를 기록 -> 중단되어도 이어서 진행
+- league_histories (member_id, year, month) 유니크 -> 다시 실행하거나 여러 워커가 동시에 실행해도 중복 기록 없음
+- 진행 중인 정산은 owner로 소유권을 확인, STALE_RUN_MINUTES 동안 갱신이 없으면 다른 실행이 이어받음
+
+사용법 (backend 디렉터리에서):
+    python settlement.py run [YYYY-MM]    # 정산 실행 (기본: 말일이면 이번 달, 아니면 지난달)
+    python settlement.py status           # 최근 정산 기록
+"""
+import os
+import sys
+import uuid
+import datetime
+from sqlalchemy import exists, func, literal, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from database import SessionLocal
+import models
+import league_history
+from cache import rankings_cache
+
+SETTLEMENT_BATCH_SIZE = int(os.getenv("SETTLEMENT_BATCH_SIZE", "5000"))
+STALE_RUN_MINUTES = 10
+
+# 정산 단계 (이 순서로 진행)
+PHASE_HISTORY = "HISTORY"   # 성적 보관 + 초기화
+PHASE_PURGE = "PURGE"       # 탈퇴 대기 회원 정리
+PHASE_ROLLING = "ROLLING"   # 최근 6/12개월 누적 집계 갱신
+STATUS_RUNNING = "RUNNING"
+STATUS_DONE = "DONE"
+
+
+class SettlementLost(Exception):
+    """다른 실행이 정산 소유권을 가져감"""
+
+
+def _utcnow() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+
+def settlement_period(today: datetime.date = None) -> tuple:
+    """
+    정산할 (연, 월)
+    말일 23:59 실행이면 이번 달, 자정을 넘겨 다시 실행(재시도)하는 경우는 지난달
+    """
+    today = today or datetime.date.today()
+    if (today + datetime.timedelta(days=1)).month != today.month:
+        return today.year, today.month
+    return league_history.shift_month(today.year, today.month, -1)
+
+
+def claim_run(db: Session, year: int, month: int, owner: str):
+    """정산 기록 생성 또는 이어받기. 이미 완료됐거나 다른 실행이 진행 중이면 None"""
+    run_model = models.SettlementRun
+    run = db.query(run_model).filter(run_model.year == year, run_model.month == month).first()
+    if run is None:
+        try:
+            run = run_model(year=year, month=month, status=STATUS_RUNNING, phase=PHASE_HISTORY,
+                            last_member_id=0, owner=owner, started_at=_utcnow(), updated_at=_utcnow())
+            db.add(run)
+            db.commit()
+            return run
+        except IntegrityError:
+            # 다른 워커가 같은 달 정산을 먼저 생성
+            db.rollback()
+            run = db.query(run_model).filter(run_model.year == year, run_model.month == month).one()
+
+    if run.status == STATUS_DONE:
+        return None
+    stale = _utcnow() - datetime.timedelta(minutes=STALE_RUN_MINUTES)
+    claimed = db.execute(
+        update(run_model).where(
+            run_model.id == run.id,
+            run_model.status != STATUS_DONE,
+            or_(run_model.owner.is_(None), run_model.owner == owner, run_model.updated_at < stale),
+        ).values(owner=owner, updated_at=_utcnow())
+    ).rowcount
+    db.commit()
+    if not claimed:
+        return None
+    db.refresh(run)
+    return run
+
+
+def _checkpoint(db: Session, run, claimed_by: str, **values) -> None:
+    """진행 상황 기록 (배치와 같은 트랜잭션). 소유권을 잃었으면 SettlementLost"""
+    run_model = models.SettlementRun
+    updated = db.execute(
+        update(run_model).where(run_model.id == run.id, run_model.owner == claimed_by)
+        .values(updated_at=_utcnow(), **values)
+    ).rowcount
+    if not updated:
+        raise SettlementLost(f"{run.year}-{run.month:02d} 정산을 다른 실행이 이어받았습니다.")
+
+
+def _settle_batch(db: Session, year: int, month: int, low: int, high: int) -> int:
+    """
+    회원 ID (low, high] 구간: 기록 보관(INSERT ... SELECT) + 성적 초기화(UPDATE)
+    - 이번 배치에서 기록을 새로 보관한 회원만 초기화 (이미 기록이 있는 회원의 성적은 보관 없이 지우지 않음)
+    - 탈퇴 대기 회원도 정산 (경기 기록이 있어 정리되지 않는 회원의 성적이 다음 달로 넘어가지 않도록,
+      정리되는 회원의 기록은 PURGE 단계에서 함께 삭제)
+    """
+    m = models.Member
+    h = models.LeagueHistory
+    already_recorded = exists().where(h.member_id == m.id, h.year == year, h.month == month)
+    ids = db.scalars(select(m.id).where(m.id > low, m.id <= high, ~already_recorded)).all()
+    if not ids:
+        return 0
+
+    db.execute(h.__table__.insert().from_select(
+        ["member_id", "year", "month", "total_points", "final_wins", "final_losses", "final_diff", "recorded_at"],
+        select(m.id, literal(year), literal(month), m.rank_point, m.wins, m.losses, m.game_diff,
+               literal(_utcnow())).where(m.id.in_(ids))
+    ))
+    db.execute(update(m).where(m.id.in_(ids)).values(rank_point=0, wins=0, draws=0, losses=0, game_diff=0))
+    return len(ids)
+
+
+def _purge_batch(db: Session, low: int, high: int) -> int:
+    """
+    회원 ID (low, high] 구간의 탈퇴 대기 회원 영구 삭제
+    경기/토너먼트 기록에 남아 있는 회원은 기록 보존을 위해 숨김 상태로 유지
+    """
+    m = models.Member
+    played = or_(
+        exists().where(or_(
+            models.Match.team_a_player1_id == m.id, models.Match.team_a_player2_id == m.id,
+            models.Match.team_b_player1_id == m.id, models.Match.team_b_player2_id == m.id,
+        )),
+        exists().where(or_(
+            models.BracketMatch.player1_id == m.id, models.BracketMatch.player2_id == m.id,
+            models.BracketMatch.winner_id == m.id,
+        )),
+        exists().where(models.Tournament.champion_id == m.id),
+    )
+    ids = db.scalars(select(m.id).where(m.id > low, m.id <= high, m.is_active.is_(False), ~played)).all()
+    if not ids:
+        return 0
+    # 회원에 딸린 데이터 먼저 삭제 (외래 키)
+    for dependent in (models.Schedule, models.LeagueHistory, models.LeagueRollingPoints, models.MemberSeasonStats):
+        db.query(dependent).filter(dependent.member_id.in_(ids)).delete(synchronize_session=False)
+    db.query(m).filter(m.id.in_(ids)).delete(synchronize_session=False)
+    return len(ids)
+
+
+def run_settlement(db: Session, year: int = None, month: int = None, batch_size: int = SETTLEMENT_BATCH_SIZE):
+    """
+    (year, month) 정산 실행 (기본: settlement_period())
+    완료된 settlement_runs 행을 반환, 이미 완료됐거나 다른 실행이 진행 중이면 None
+    """
+    if year is None or month is None:
+        year, month = settlement_period()
+    owner = str(uuid.uuid4())
+    run = claim_run(db, year, month, owner)
+    if run is None:
+        return None
+
+    run_model = models.SettlementRun
+    try:
+        max_id = db.scalar(select(func.max(models.Member.id))) or 0
+        if run.phase == PHASE_HISTORY:
+            while run.last_member_id < max_id:
+                high = run.last_member_id + batch_size
+                settled = _settle_batch(db, year, month, run.last_member_id, high)
+                _checkpoint(db, run, owner, last_member_id=high,
+                            members_settled=run_model.members_settled + settled)
+                db.commit()
+                db.refresh(run)
+            _checkpoint(db, run, owner, phase=PHASE_PURGE, last_member_id=0)
+            db.commit()
+            db.refresh(run)
+
+        if run.phase == PHASE_PURGE:
+            while run.last_member_id < max_id:
+                high = run.last_member_id + batch_size
+                purged = _purge_batch(db, run.last_member_id, high)
+                _checkpoint(db, run, owner, last_member_id=high,
+                            members_purged=run_model.members_purged + purged)
+                db.commit()
+                db.refresh(run)
+            _checkpoint(db, run, owner, phase=PHASE_ROLLING)
+            db.commit()
+            db.refresh(run)
+
+        # 누적 집계는 기간별 DELETE + INSERT ... SELECT라 다시 실행해도 같은 결과
+        league_history.refresh_rolling_points(db, year, month)
+        _checkpoint(db, run, owner, status=STATUS_DONE, owner=None, finished_at=_utcnow())
+        db.commit()
+        db.refresh(run)
+        return run
+    except SettlementLost:
+        db.rollback()
+        raise
+    except Exception:
+        db.rollback()
+        # 실패 시 소유권 반환 -> 재시도가 바로 이어서 진행
+        db.execute(update(run_model).where(run_model.id == run.id, run_model.owner == owner).values(owner=None))
+        db.commit()
+        raise
+    finally:
+        # 일부 구간만 초기화된 경우도 순위 캐시는 새로 계산
+        rankings_cache.invalidate("월말 정산")
+
+
+def recent_runs(db: Session, limit: int = 12) -> list:
+    run_model = models.SettlementRun
+    return db.query(run_model).order_by(run_model.year.desc(), run_model.month.desc()).limit(limit).all()
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "run"
+    if command not in ("run", "status"):
+        print(f"알 수 없는 명령: {command} (run | status)")
+        sys.exit(2)
+
+    db = SessionLocal()
+    try:
+        if command == "status":
+            for r in recent_runs(db):
+                print(f"{r.year}-{r.month:02d} {r.status:8} {r.phase:8} 보관 {r.members_settled}명 / "
+                      f"정리 {r.members_purged}명 (시작 {r.started_at}, 완료 {r.finished_at})")
+        else:
+            period = None
+            if len(sys.argv) > 2:
+                year, month = sys.argv[2].split("-")
+                period = (int(year), int(month))
+            result = run_settlement(db, *(period or (None, None)))
+            if result is None:
+                print("⚠️ [Settlement] 이미 완료되었거나 다른 곳에서 진행 중인 정산입니다.")
+            else:
+                print(f"✅ [Settlement] {result.year}년 {result.month}월 정산 완료 "
+                      f"(보관 {result.members_settled}명, 정리 {result.members_purged}명)")
+    finally:
+        db.close()
@@ -0,0 +1,256 @@
+"""
+리그 순위 프로젝션 (member_season_stats)
+
+- matches 테이블이 원본(source of truth)
+- 경기 등록/삭제/수정 시 회원별 월(시즌)별 집계를 증분 갱신
+- rebuild: matches 전체를 INSERT ... SELECT 한 번(자리별 GROUP BY + UNION ALL)으로 재집계
+- check: members 테이블의 누적 카운터와 원장(matches) 집계의 차이(drift) 보고
+
+사용법 (backend 디렉터리에서):
+    python standings.py rebuild
+    python standings.py check
+"""
+import sys
+import time
+import calendar
+import datetime
+from sqlalchemy import case, extract, func, select, union_all
+from sqlalchemy.orm import Session
+from database import SessionLocal
+import models
+import schemas
+import serialization
+
+# 경기 결과로 변하는 회원 리그 스탯 컬럼
+STAT_COLUMNS = ("rank_point", "wins", "draws", "losses", "game_diff")
+
+
+def season_of(dt) -> tuple:
+    """경기 일시 -> 시즌 (연, 월)"""
+    return dt.year, dt.month
+
+
+def _ledger_rows(start=None, end=None, by_season: bool = False):
+    """
+    경기 원장을 선수 자리(A1, A2, B1, B2)별로 먼저 GROUP BY 한 뒤 UNION ALL
+    (경기 수 x 4 행을 펼치지 않고 자리별 부분합만 합치므로 대용량에서도 빠름)
+    """
+    m = models.Match.__table__
+    sides = (
+        (m.c.team_a_player1_id, m.c.score_team_a, m.c.score_team_b),
+        (m.c.team_a_player2_id, m.c.score_team_a, m.c.score_team_b),
+        (m.c.team_b_player1_id, m.c.score_team_b, m.c.score_team_a),
+        (m.c.team_b_player2_id, m.c.score_team_b, m.c.score_team_a),
+    )
+    legs = []
+    for player, own, opp in sides:
+        keys = [player.label("member_id")]
+        if by_season:
+            keys += [
+                extract("year", m.c.date).label("year"),
+                extract("month", m.c.date).label("month"),
+            ]
+        leg = select(
+            *keys,
+            func.sum(case((own > opp, 3), (own == opp, 1), else_=0)).label("rank_point"),
+            func.sum(case((own > opp, 1), else_=0)).label("wins"),
+            func.sum(case((own == opp, 1), else_=0)).label("draws"),
+            func.sum(case((own < opp, 1), else_=0)).label("losses"),
+            func.sum(own - opp).label("game_diff"),
+        ).where(player.isnot(None))
+        if start is not None:
+            leg = leg.where(m.c.date >= start)
+        if end is not None:
+            leg = leg.where(m.c.date < end)
+        legs.append(leg.group_by(*keys))
+    return union_all(*legs).subquery("ledger")
+
+
+def ledger_totals(start=None, end=None, by_season: bool = False):
+    """원장 집계 SELECT: 회원별 (by_season=True면 회원+시즌별) 스탯 합계"""
+    ledger = _ledger_rows(start, end, by_season)
+    keys = [ledger.c.member_id]
+    if by_season:
+        keys += [ledger.c.year, ledger.c.month]
+    sums = [func.sum(ledger.c[column]).label(column) for column in STAT_COLUMNS]
+    return select(*keys, *sums).group_by(*keys)
+
+
+def _stats_of(row) -> dict:
+    return {column: int(row._mapping[column] or 0) for column in STAT_COLUMNS}
+
+
+# --- 증분 갱신 ---
+
+def apply_season_deltas(db: Session, season: tuple, deltas: dict) -> None:
+    """
+    시즌 집계에 회원별 변화량을 더함 (없으면 생성)
+    INSERT ... ON CONFLICT / ON DUPLICATE KEY UPDATE col = col + 변화량
+    """
+    year, month = season
+    rows = [
+        {"member_id": member_id, "year": year, "month": month, **row}
+        for member_id, row in deltas.items() if any(row.values())
+    ]
+    if not rows:
+        return
+
+    table = models.MemberSeasonStats.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["member_id", "year", "month"],
+            set_={column: table.c[column] + stmt.excluded[column] for column in STAT_COLUMNS}
+        )
+    elif dialect in ("mysql", "mariadb"):
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table)
+        stmt = stmt.on_duplicate_key_update(
+            {column: table.c[column] + stmt.inserted[column] for column in STAT_COLUMNS}
+        )
+    else:
+        # 기타 DB: UPDATE 후 대상이 없으면 INSERT
+        for row in rows:
+            updated = db.execute(
+                table.update()
+                .where(table.c.member_id == row["member_id"])
+                .where(table.c.year == year)
+                .where(table.c.month == month)
+                .values({column: table.c[column] + row[column] for column in STAT_COLUMNS})
+            ).rowcount
+            if not updated:
+                db.execute(table.insert().values(row))
+        return
+    db.execute(stmt, rows)
+
+
+# --- 전체 재집계 ---
+
+def rebuild(db: Session) -> int:
+    """matches 원장으로 member_season_stats 전체 재생성 (INSERT ... SELECT 한 번)"""
+    table = models.MemberSeasonStats.__table__
+    db.execute(table.delete())
+    db.execute(table.insert().from_select(
+        ["member_id", "year", "month", *STAT_COLUMNS],
+        ledger_totals(by_season=True)
+    ))
+    db.commit()
+    return db.query(func.count(models.MemberSeasonStats.id)).scalar()
+
+
+# --- 특정 시점 순위 ---
+
+def standings_as_of(db: Session, as_of: datetime.date) -> dict:
+    """
+    as_of 날짜(포함)까지의 해당 시즌 성적 -> {member_id: {컬럼: 값}}
+    끝난 달은 프로젝션을 그대로 읽고, 진행 중인 달은 그 달 경기만 집계
+    """
+    last_day = calendar.monthrange(as_of.year, as_of.month)[1]
+    if as_of.day == last_day:
+        rows = db.query(models.MemberSeasonStats).filter(
+            models.MemberSeasonStats.year == as_of.year,
+            models.MemberSeasonStats.month == as_of.month
+        ).all()
+        return {r.member_id: {column: getattr(r, column) for column in STAT_COLUMNS} for r in rows}
+
+    start = datetime.datetime(as_of.year, as_of.month, 1)
+    end = datetime.datetime.combine(as_of + datetime.timedelta(days=1), datetime.time())
+    return {r.member_id: _stats_of(r) for r in db.execute(ledger_totals(start, end))}
+
+
+def live_rankings_statement():
+    """
+    현재 순위 (GET /league/rankings): 승인된 회원, 승점 > 득실차 > 승수 내림차순
+    응답(schemas.Member)에 필요한 컬럼만 조회 -> serialization.project(rows, MEMBER_FIELDS)
+    """
+    return select(*serialization.columns(models.Member, schemas.Member)).where(models.Member.is_approved == True).order_by(
+        models.Member.rank_point.desc(),
+        models.Member.game_diff.desc(),
+        models.Member.wins.desc()
+    )
+
+
+def rankings_as_of(db: Session, as_of: datetime.date) -> list:
+    """GET /league/rankings?as_of= 응답 (현재 순위와 같은 정렬: 승점 > 득실차 > 승수)"""
+    totals = standings_as_of(db, as_of)
+    zero = dict.fromkeys(STAT_COLUMNS, 0)
+
+    members = db.query(models.Member).filter(models.Member.is_approved == True).all()
+    result = []
+    for m in members:
+        result.append({
+            "id": m.id,
+            "name": m.name,
+            "phone": m.phone,
+            "birth": m.birth,
+            "role": m.role,
+            "is_approved": m.is_approved,
+            "rating": m.rating,
+            **totals.get(m.id, zero)
+        })
+    result.sort(key=lambda r: (r["rank_point"], r["game_diff"], r["wins"]), reverse=True)
+    return result
+
+
+# --- 정합성 검사 ---
+
+def check_drift(db: Session) -> dict:
+    """
+    1. members 누적 카운터 vs 마지막 월말 정산 이후 경기 원장 집계
+    2. member_season_stats 프로젝션 vs 원장 시즌별 집계
+    """
+    zero = dict.fromkeys(STAT_COLUMNS, 0)
+
+    last_settled = db.query(func.max(models.LeagueHistory.recorded_at)).scalar()
+    expected = {r.member_id: _stats_of(r) for r in db.execute(ledger_totals(start=last_settled))}
+    member_drift = []
+    for m in db.query(models.Member).yield_per(1000):
+        stored = {column: getattr(m, column) or 0 for column in STAT_COLUMNS}
+        ledger = expected.get(m.id, zero)
+        if stored != ledger:
+            member_drift.append({"member_id": m.id, "name": m.name, "stored": stored, "ledger": ledger})
+
+    ledger_seasons = {
+        (r.member_id, int(r.year), int(r.month)): _stats_of(r)
+        for r in db.execute(ledger_totals(by_season=True))
+    }
+    projection_drift = []
+    for r in db.query(models.MemberSeasonStats).yield_per(1000):
+        key = (r.member_id, r.year, r.month)
+        stored = {column: getattr(r, column) or 0 for column in STAT_COLUMNS}
+        ledger = ledger_seasons.pop(key, zero)
+        if stored != ledger:
+            projection_drift.append({"key": key, "stored": stored, "ledger": ledger})
+    for key, ledger in ledger_seasons.items():
+        if ledger != zero:
+            projection_drift.append({"key": key, "stored": None, "ledger": ledger})
+
+    return {"since": last_settled, "members": member_drift, "projection": projection_drift}
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "check"
+    db = SessionLocal()
+    try:
+        if command == "rebuild":
+            started = time.perf_counter()
+            count = rebuild(db)
+            print(f"✅ [Standings] 프로젝션 재생성 완료: {count}행 ({time.perf_counter() - started:.2f}초)")
+        elif command == "check":
+            report = check_drift(db)
+            print(f"🔎 [Standings] 기준 시점(마지막 정산): {report['since'] or '전체 기간'}")
+            for item in report["members"]:
+                print(f"⚠️ [Drift] 회원 {item['name']}(ID: {item['member_id']}) 저장값={item['stored']} 원장={item['ledger']}")
+            for item in report["projection"]:
+                print(f"⚠️ [Drift] 프로젝션 {item['key']} 저장값={item['stored']} 원장={item['ledger']}")
+            if not report["members"] and not report["projection"]:
+                print("✅ [Standings] 불일치 없음")
+            else:
+                sys.exit(1)
+        else:
+            print(f"알 수 없는 명령: {command} (rebuild | check)")
+            sys.exit(2)
+    finally:
+        db.close()
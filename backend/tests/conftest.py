@@ -0,0 +1,137 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# backend 모듈들은 절대 경로(import models 등)로 import 하므로 backend 디렉터리를 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import models
+import schemas
+
+# 테스트 모듈에 MEMBER_COUNT가 없을 때 session_factory가 만드는 회원 수
+DEFAULT_MEMBER_COUNT = 6
+
+
+@pytest.fixture(scope="session")
+def make_engine():
+    """임시 SQLite 파일 DB 엔진 (테이블 생성 포함, 여러 스레드에서 사용 가능)"""
+    def make(path):
+        engine = create_engine(
+            f"sqlite:///{path}",
+            connect_args={"check_same_thread": False, "timeout": 30},
+        )
+        models.Base.metadata.create_all(bind=engine)
+        return engine
+    return make
+
+
+@pytest.fixture
+def member_count(request):
+    return getattr(request.module, "MEMBER_COUNT", DEFAULT_MEMBER_COUNT)
+
+
+@pytest.fixture
+def make_session_factory(make_engine, member_count):
+    """DB 파일 경로 -> 승인된 회원 member_count명이 있는 세션 팩토리 (엔진은 테스트 후 정리)"""
+    engines = []
+
+    def make(path):
+        engine = make_engine(path)
+        engines.append(engine)
+        factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        db = factory()
+        for i in range(member_count):
+            db.add(models.Member(
+                name=f"선수{i}", phone=f"0100000{i:04d}", birth="1980", pin="0000",
+                is_approved=True, rank_point=0, game_diff=0, wins=0, draws=0, losses=0,
+            ))
+        db.commit()
+        db.close()
+        return factory
+
+    yield make
+    for engine in engines:
+        engine.dispose()
+
+
+@pytest.fixture
+def session_factory(tmp_path, make_session_factory):
+    """승인된 회원 member_count명이 있는 임시 DB의 세션 팩토리"""
+    return make_session_factory(tmp_path / "test.db")
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def random_match(member_count):
+    """rng -> 서로 다른 회원 4명의 임의 경기 (schemas.MatchCreate)"""
+    def make(rng):
+        ids = rng.sample(range(1, member_count + 1), 4)
+        return schemas.MatchCreate(
+            team_a_player1_id=ids[0],
+            team_a_player2_id=ids[1],
+            team_b_player1_id=ids[2],
+            team_b_player2_id=ids[3],
+            score_team_a=rng.randint(0, 6),
+            score_team_b=rng.randint(0, 6),
+        )
+    return make
+
+
+def _override_get_db(factory):
+    def override_get_db():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+    return override_get_db
+
+
+@pytest.fixture
+def use_db():
+    """세션 팩토리 -> main.get_db 대체 (client가 다른 DB를 쓰도록 전환)"""
+    import main
+
+    def use(factory):
+        main.app.dependency_overrides[main.get_db] = _override_get_db(factory)
+    return use
+
+
+@pytest.fixture
+def client(session_factory, tmp_path, monkeypatch):
+    """session_factory DB를 쓰는 API TestClient"""
+    # main은 import 시 현재 디렉터리에 uploads/를 만들므로 임시 디렉터리에서 import
+    monkeypatch.chdir(tmp_path)
+    from fastapi.testclient import TestClient
+    import main
+    from auth import principal_cache
+    from cache import rankings_cache, tournament_cache
+
+    main.app.dependency_overrides[main.get_db] = _override_get_db(session_factory)
+    # 다른 테스트 DB의 권한/응답 캐시가 남지 않도록 초기화
+    principal_cache.invalidate(reason="테스트")
+    rankings_cache.invalidate("테스트")
+    tournament_cache.invalidate("테스트")
+    try:
+        yield TestClient(main.app)
+    finally:
+        main.app.dependency_overrides.pop(main.get_db, None)
+
+
+@pytest.fixture
+def auth_headers():
+    """전화번호 -> Authorization 헤더 (로그인 없이 토큰 발급)"""
+    import auth
+
+    def make(phone):
+        return {"Authorization": f"Bearer {auth.create_access_token(data={'sub': phone})}"}
+    return make
@@ -0,0 +1,59 @@
+import time
+
+import anyio
+
+import cache
+
+
+class SlowBackend(cache.LocalBackend):
+    """Redis처럼 호출마다 네트워크 왕복이 있는 백엔드"""
+
+    blocking = True
+
+    def version(self):
+        time.sleep(0.05)
+        return super().version()
+
+    def bump(self):
+        time.sleep(0.05)
+        return super().bump()
+
+
+def test_async_methods_keep_blocking_backend_off_the_event_loop():
+    response_cache = cache.ResponseCache("test", SlowBackend())
+    ticks = []
+    finished = []
+
+    async def ticker():
+        for _ in range(10):
+            ticks.append(time.monotonic())
+            await anyio.sleep(0.01)
+
+    async def use_cache():
+        assert await response_cache.get_async("live") is None
+        version = await response_cache.version_async()
+        etag = await response_cache.set_async("live", b"[]", version)
+        assert await response_cache.get_async("live") == (etag, b"[]")
+        await response_cache.invalidate_async("테스트")
+        assert await response_cache.get_async("live") is None
+        finished.append(time.monotonic())
+
+    async def main():
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(ticker)
+            await use_cache()
+
+    anyio.run(main)
+    # 백엔드 호출(0.05초 x 6)이 루프를 막았다면 캐시 사용이 끝난 뒤에야 틱이 진행됨
+    assert len(ticks) == 10 and ticks[-1] < finished[0]
+
+
+def test_local_backend_runs_in_place():
+    response_cache = cache.ResponseCache("test")
+
+    async def main():
+        version = await response_cache.version_async()
+        etag = await response_cache.set_async("live", b"[]", version)
+        return await response_cache.get_async("live") == (etag, b"[]")
+
+    assert anyio.run(main)
@@ -0,0 +1,83 @@
+import random
+import threading
+import time
+
+import anyio
+
+import events
+import match_stats
+
+
+class SlowBroker:
+    blocking = True
+
+    def __init__(self):
+        self.published = []
+        self.finished_at = None
+
+    def publish(self, topic, data):
+        time.sleep(0.2)
+        self.published.append((topic, data["type"]))
+        self.finished_at = time.monotonic()
+
+
+def test_publish_async_runs_blocking_broker_off_the_event_loop(monkeypatch):
+    broker = SlowBroker()
+    monkeypatch.setattr(events, "broker", broker)
+    ticks = []
+
+    async def ticker():
+        for _ in range(10):
+            ticks.append(time.monotonic())
+            await anyio.sleep(0.01)
+
+    async def main():
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(ticker)
+            await events.publish_async("matches", "created", id=1)
+
+    anyio.run(main)
+    assert broker.published == [("matches", "created")]
+    # 발행이 루프를 막았다면 발행이 끝난 뒤에야 틱이 진행됨
+    assert len(ticks) == 10 and ticks[-1] < broker.finished_at
+
+
+def test_published_counter_is_exact_across_threads(monkeypatch):
+    hub = events.EventHub()
+    monkeypatch.setattr(events, "hub", hub)
+    monkeypatch.setattr(events, "broker", events.LocalBroker(hub))
+
+    def work():
+        for _ in range(2000):
+            events.publish("rankings", "changed")
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert hub.stats()["published"] == 16000
+
+
+def test_batch_publishes_ids_without_reloading_matches(client, session_factory, random_match, monkeypatch):
+    from sqlalchemy import event
+
+    published = []
+    monkeypatch.setattr(events, "publish", lambda topic, event_type, **fields: published.append((topic, fields)))
+    statements = []
+    engine = session_factory.kw["bind"]
+    # RETURNING이 없는 DB(MySQL)처럼 ORM flush로 INSERT -> commit 후 객체가 만료되는 경로
+    monkeypatch.setattr(match_stats, "insert_matches", lambda db, db_matches: (db.add_all(db_matches), db.flush()))
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        rng = random.Random(3)
+        body = client.post("/matches/batch", json=[random_match(rng).model_dump() for _ in range(20)]).json()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert published[0] == ("matches", {"ids": [r["match"]["id"] for r in body["results"]]})
+    assert not [s for s in statements if s.startswith("SELECT") and "FROM matches" in s]
@@ -0,0 +1,39 @@
+import pytest
+
+import admission
+
+PHONE = "01000000000"
+ATTACKER = {"X-Forwarded-For": "10.0.0.9"}
+OWNER = {"X-Forwarded-For": "10.0.0.1"}
+
+
+@pytest.fixture
+def buckets(monkeypatch):
+    monkeypatch.setattr(admission, "TRUST_FORWARDED", True)
+    # IP 버킷은 넉넉하게 두고 전화번호 실패 버킷만 확인
+    monkeypatch.setattr(admission, "login_ip_bucket", admission.TokenBucket("login_ip", 600, 100))
+    monkeypatch.setattr(admission, "login_phone_bucket", admission.TokenBucket("login_phone", 5, 5))
+
+
+def login(client, pin, headers):
+    return client.post("/login", json={"phone": PHONE, "pin": pin}, headers=headers)
+
+
+def test_wrong_pins_from_other_client_do_not_lock_out_owner(client, buckets):
+    statuses = [login(client, "9999", ATTACKER).status_code for _ in range(10)]
+    assert 429 not in statuses[:5]
+    assert statuses[5:] == [429] * 5
+
+    # 같은 번호라도 다른 클라이언트의 올바른 PIN은 통과
+    response = login(client, "0000", OWNER)
+    assert response.status_code == 200
+    assert response.json()["phone"] == PHONE
+
+
+def test_successful_logins_are_not_charged(client, buckets):
+    for _ in range(10):
+        assert login(client, "0000", OWNER).status_code == 200
+    # 성공만 했으므로 실패 허용 횟수는 그대로
+    statuses = [login(client, "9999", OWNER).status_code for _ in range(6)]
+    assert 429 not in statuses[:5]
+    assert statuses[5] == 429
@@ -0,0 +1,184 @@
+import random
+import threading
+
+import pytest
+
+import models
+import match_stats
+
+# 선수 수를 적게 두어 스레드끼리 같은 선수를 공유하는 경기가 계속 겹치도록 함
+MEMBER_COUNT = 6
+THREADS = 8
+MATCHES_PER_THREAD = 25
+
+
+def run_threads(worker):
+    errors = []
+    barrier = threading.Barrier(THREADS)
+
+    def target(n):
+        try:
+            barrier.wait()
+            worker(n)
+        except Exception as e:  # pragma: no cover - 실패 시 원인 보고용
+            errors.append(e)
+
+    threads = [threading.Thread(target=target, args=(n,)) for n in range(THREADS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors, errors
+
+
+def stored_stats(factory):
+    db = factory()
+    try:
+        return {
+            m.id: {c: getattr(m, c) for c in match_stats.STAT_COLUMNS}
+            for m in db.query(models.Member).all()
+        }
+    finally:
+        db.close()
+
+
+def expected_stats(matches):
+    totals = {mid: dict.fromkeys(match_stats.STAT_COLUMNS, 0) for mid in range(1, MEMBER_COUNT + 1)}
+    for match in matches:
+        match_stats.merge_deltas(totals, match_stats.match_deltas(match))
+    return totals
+
+
+def stored_standings(factory):
+    """회원 레이팅 + 시즌 집계 (일괄 등록과 순차 등록 비교용)"""
+    db = factory()
+    try:
+        ratings = {m.id: m.rating for m in db.query(models.Member).all()}
+        seasons = {
+            (s.member_id, s.year, s.month): {c: getattr(s, c) for c in match_stats.STAT_COLUMNS}
+            for s in db.query(models.MemberSeasonStats).all()
+        }
+        return ratings, seasons
+    finally:
+        db.close()
+
+
+def test_concurrent_overlapping_matches_keep_exact_totals(session_factory, random_match):
+    plans = [
+        [random_match(random.Random(n * 1000 + i)) for i in range(MATCHES_PER_THREAD)]
+        for n in range(THREADS)
+    ]
+
+    def worker(n):
+        for match in plans[n]:
+            db = session_factory()
+            try:
+                assert match_stats.record_match(db, match) is not None
+                db.commit()
+            finally:
+                db.close()
+
+    run_threads(worker)
+
+    all_matches = [m for plan in plans for m in plan]
+    assert stored_stats(session_factory) == expected_stats(all_matches)
+
+    db = session_factory()
+    assert db.query(models.Match).count() == THREADS * MATCHES_PER_THREAD
+    db.close()
+
+
+def test_concurrent_deletes_roll_back_each_match_once(session_factory, random_match):
+    rng = random.Random(7)
+    matches = [random_match(rng) for _ in range(THREADS * 10)]
+    db = session_factory()
+    for match in matches:
+        match_stats.record_match(db, match)
+    db.commit()
+    match_ids = [m.id for m in db.query(models.Match).order_by(models.Match.id).all()]
+    db.close()
+
+    # 앞쪽 절반을 모든 스레드가 동시에 삭제 시도 -> 롤백은 경기당 한 번만 적용되어야 함
+    to_delete = match_ids[: len(match_ids) // 2]
+
+    def worker(n):
+        for match_id in to_delete:
+            db = session_factory()
+            try:
+                match_stats.remove_match(db, match_id)
+                db.commit()
+            finally:
+                db.close()
+
+    run_threads(worker)
+
+    remaining = matches[len(to_delete):]
+    assert stored_stats(session_factory) == expected_stats(remaining)
+
+
+def test_edit_match_applies_only_score_delta(session_factory, random_match):
+    rng = random.Random(11)
+    original = random_match(rng)
+    db = session_factory()
+    db_match = match_stats.record_match(db, original)
+    db.commit()
+    match_id = db_match.id
+
+    edited = original.model_copy(update={
+        "score_team_a": original.score_team_b,
+        "score_team_b": original.score_team_a,
+    })
+    assert match_stats.edit_match(db, match_id, edited) is not None
+    db.commit()
+    db.close()
+
+    assert stored_stats(session_factory) == expected_stats([edited])
+
+
+
+def test_edit_match_detects_concurrent_edit(session_factory, random_match, monkeypatch):
+    original = random_match(random.Random(13))
+    db = session_factory()
+    db_match = match_stats.record_match(db, original)
+    db.commit()
+    match_id = db_match.id
+
+    # 기존 값을 읽은 직후 다른 요청이 같은 경기를 먼저 수정하는 상황 재현
+    load_members = match_stats.load_members
+
+    def racing_load_members(session, ids):
+        other = session_factory()
+        other.query(models.Match).filter(models.Match.id == match_id).update({"score_team_a": 99})
+        other.commit()
+        other.close()
+        return load_members(session, ids)
+
+    monkeypatch.setattr(match_stats, "load_members", racing_load_members)
+    edited = original.model_copy(update={"score_team_b": original.score_team_b + 1})
+    with pytest.raises(match_stats.MatchConflict):
+        match_stats.edit_match(db, match_id, edited)
+    db.rollback()
+    db.close()
+
+
+def test_batch_matches_sequential_creates(client, session_factory, make_session_factory, use_db,
+                                          tmp_path, random_match):
+    rng = random.Random(17)
+    matches = [random_match(rng).model_dump() for _ in range(30)]
+    matches[5]["team_b_player1_id"] = 999  # 없는 선수 -> 이 항목만 실패
+
+    body = client.post("/matches/batch", json=matches).json()
+    assert (body["created"], body["failed"]) == (29, 1)
+    assert body["results"][5]["error"] and body["results"][5]["match"] is None
+    assert [r["match"]["id"] for r in body["results"] if r["match"]] == list(range(1, 30))
+
+    sequential = make_session_factory(tmp_path / "sequential.db")
+    use_db(sequential)
+    statuses = [client.post("/matches", json=match).status_code for match in matches]
+    assert statuses == [404 if index == 5 else 200 for index in range(len(matches))]
+
+    assert stored_stats(session_factory) == stored_stats(sequential)
+    batch_ratings, batch_seasons = stored_standings(session_factory)
+    sequential_ratings, sequential_seasons = stored_standings(sequential)
+    assert batch_seasons == sequential_seasons
+    assert batch_ratings == pytest.approx(sequential_ratings, abs=1e-9)
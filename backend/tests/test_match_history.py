@@ -0,0 +1,22 @@
+import random
+
+
+def test_limit_zero_on_empty_history(client):
+    response = client.get("/matches?limit=0")
+    assert response.status_code == 200
+    assert response.json() == []
+    assert "X-Next-Before-Id" not in response.headers
+
+
+def test_limit_is_clamped(client, random_match):
+    rng = random.Random(1)
+    for _ in range(3):
+        assert client.post("/matches", json=random_match(rng).model_dump()).status_code == 200
+
+    response = client.get("/matches?limit=0")
+    assert len(response.json()) == 1
+    assert response.headers["X-Next-Before-Id"] == str(response.json()[0]["id"])
+
+    response = client.get("/matches?limit=1000000")
+    assert len(response.json()) == 3
+    assert "X-Next-Before-Id" not in response.headers
@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+import models
+import media_store
+
+
+@pytest.fixture
+def media_dir(tmp_path, monkeypatch):
+    # MEDIA_DIR / PARTIAL_DIR는 현재 디렉터리 기준 상대 경로
+    monkeypatch.chdir(tmp_path)
+    os.makedirs(media_store.PARTIAL_DIR)
+    return tmp_path
+
+
+def write_temp(name, content=b"tennis"):
+    path = media_store.partial_path(name)
+    with open(path, "wb") as f:
+        f.write(content)
+    return path
+
+
+def media_files():
+    return sorted(name for name in os.listdir(media_store.MEDIA_DIR) if not name.startswith("."))
+
+
+def test_rollback_moves_new_file_back(media_dir, db):
+    src = write_temp("a")
+    blob, is_new = media_store.store_file(db, src, "jpg")
+    assert is_new and os.path.exists(blob.file_path) and not os.path.exists(src)
+
+    db.rollback()
+    assert media_files() == []
+    assert os.path.exists(src)  # 이어받기 업로드는 다시 완료 요청 가능
+    assert db.query(models.MediaBlob).count() == 0
+
+
+def test_close_without_commit_moves_new_file_back(media_dir, session_factory):
+    db = session_factory()
+    src = write_temp("b")
+    media_store.store_file(db, src, "jpg")
+    db.close()
+    assert media_files() == []
+    assert os.path.exists(src)
+
+
+def test_duplicate_removes_temp_file_only_after_commit(media_dir, db):
+    blob, _ = media_store.store_file(db, write_temp("c"), "jpg")
+    db.commit()
+
+    src = write_temp("d")
+    _, is_new = media_store.store_file(db, src, "jpg")
+    assert not is_new and os.path.exists(src)
+    db.rollback()
+    assert os.path.exists(src)
+    assert db.query(models.MediaBlob).one().ref_count == 1
+
+    media_store.store_file(db, src, "jpg")
+    db.commit()
+    assert not os.path.exists(src)
+    assert media_files() == [os.path.basename(blob.file_path)]
+    assert db.query(models.MediaBlob).one().ref_count == 2
+
+
+def test_failed_direct_upload_leaves_no_files(client, monkeypatch):
+    import main
+
+    def fail(db, db_gallery):
+        raise RuntimeError("commit 실패")
+
+    monkeypatch.setattr(main, "_gallery_created", fail)
+    with pytest.raises(RuntimeError):
+        client.post("/gallery", files={"file": ("a.jpg", b"image-bytes")},
+                    data={"uploader_name": "선수0", "file_type": "IMAGE"})
+    assert media_files() == []
+    assert os.listdir(media_store.PARTIAL_DIR) == []
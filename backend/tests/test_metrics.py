@@ -0,0 +1,19 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+import metrics
+
+
+def test_failed_statement_does_not_skew_next_query_timing():
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM no_such_table"))
+
+        before = metrics.registry.queries_total
+        conn.execute(text("SELECT 1"))
+        assert metrics.registry.queries_total == before + 1
+        # 실패한 문장의 시작 시각이 연결에 남지 않음
+        assert not any(key.startswith("metrics") for key in conn.info)
+    engine.dispose()
@@ -0,0 +1,46 @@
+import pytest
+from fastapi import HTTPException
+
+import auth
+import models
+
+PHONE = "01000000000"
+
+
+@pytest.fixture
+def loads(db):
+    auth.principal_cache.invalidate(reason="테스트")
+    calls = []
+
+    def load_member(phone):
+        calls.append(phone)
+        return db.query(models.Member).filter(models.Member.phone == phone).first()
+    return calls, load_member
+
+
+def test_cached_principal_resolves_without_loading_member(loads):
+    calls, load_member = loads
+    token = auth.create_access_token(data={"sub": PHONE})
+
+    first = auth.resolve_principal(token, load_member)
+    second = auth.resolve_principal(token, load_member)
+    assert first == second and first.phone == PHONE
+    assert calls == [PHONE]
+
+    auth.principal_cache.invalidate(PHONE, reason="권한 변경")
+    auth.resolve_principal(token, load_member)
+    assert calls == [PHONE, PHONE]
+
+
+def test_role_claims_in_old_tokens_are_ignored(loads, db):
+    calls, load_member = loads
+    # 예전에 발급된 클레임 토큰도 권한은 DB(캐시)의 현재 값 사용
+    token = auth.create_access_token(data={"sub": PHONE, "uid": 1, "name": "선수0", "role": "ADMIN"})
+    assert auth.resolve_principal(token, load_member).role != "ADMIN"
+
+    db.query(models.Member).filter(models.Member.phone == PHONE).update({"is_active": False})
+    db.commit()
+    auth.principal_cache.invalidate(PHONE, reason="탈퇴")
+    with pytest.raises(HTTPException) as error:
+        auth.resolve_principal(token, load_member)
+    assert error.value.status_code == 401
@@ -0,0 +1,140 @@
+"""
+엔드포인트별 쿼리 예산 회귀 테스트
+
+데이터 크기를 바꿔 가며 같은 요청을 보내고, 요청당 SQL 실행 수와 응답 시간이 예산 안인지 확인.
+쿼리 수는 metrics.MetricsMiddleware가 내보내는 Server-Timing 헤더(desc="N queries")로 측정
+-> 행마다 지연 로딩(N+1)이나 전체 스캔이 다시 생기면 데이터가 커질 때 쿼리 수/시간이 늘어 실패
+
+    QUERY_BUDGET_TIME_SCALE  느린 CI에서 시간 예산 배율 (기본 1.0)
+"""
+import os
+import re
+import time
+import random
+import datetime
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+import models
+
+TIME_SCALE = float(os.getenv("QUERY_BUDGET_TIME_SCALE", "1.0"))
+
+SIZES = {
+    "small": {"members": 20, "matches": 200, "posts": 50, "gallery": 20, "schedules": 20},
+    "large": {"members": 400, "matches": 8000, "posts": 3000, "gallery": 300, "schedules": 400},
+}
+
+# (메서드, 경로, 최대 쿼리 수, 최대 응답 시간(초)): 쿼리 수는 데이터 크기와 무관해야 함
+BUDGETS = [
+    ("GET", "/matches", 1, 0.5),
+    ("GET", "/matches?member_id=1", 1, 0.5),
+    ("GET", "/league/rankings", 1, 0.5),
+    ("GET", "/members/", 1, 0.5),
+    ("POST", "/tournament/preview?entrants=16", 4, 0.5),
+    ("POST", "/tournament/generate?entrants=16", 10, 0.5),
+    ("GET", "/community", 1, 0.5),
+    ("GET", "/gallery", 1, 0.5),
+    ("GET", "/schedules", 1, 0.5),
+]
+
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+
+def seed(engine, members, matches, posts, gallery, schedules):
+    rng = random.Random(42)
+    now = datetime.datetime.now()
+    with engine.begin() as conn:
+        conn.execute(models.Member.__table__.insert(), [{
+            "name": f"회원{i}", "phone": f"0108000{i:04d}", "birth": "1990", "pin": "1234",
+            "role": "MEMBER", "is_approved": True, "is_active": True,
+            "rank_point": rng.randint(0, 90), "wins": 0, "draws": 0, "losses": 0, "game_diff": 0,
+        } for i in range(members)])
+        rows = []
+        for i in range(matches):
+            ids = rng.sample(range(1, members + 1), 4)
+            rows.append({
+                "team_a_player1_id": ids[0], "team_a_player2_id": ids[1],
+                "team_b_player1_id": ids[2], "team_b_player2_id": ids[3],
+                "score_team_a": rng.randint(0, 6), "score_team_b": rng.randint(0, 6),
+                "date": now - datetime.timedelta(minutes=i * 7),
+            })
+        conn.execute(models.Match.__table__.insert(), rows)
+        conn.execute(models.CommunityPost.__table__.insert(), [{
+            "title": f"글 {i}", "author_name": f"회원{i % members}", "content": "내용 " * 100,
+            "password": "0000", "created_at": now - datetime.timedelta(minutes=i),
+        } for i in range(posts)])
+        conn.execute(models.Gallery.__table__.insert(), [{
+            "uploader_name": f"회원{i % members}", "file_type": "IMAGE", "file_path": f"{i}.jpg",
+            "created_at": now - datetime.timedelta(minutes=i),
+        } for i in range(gallery)])
+        conn.execute(models.Schedule.__table__.insert(), [{
+            "member_id": i % members + 1, "member_name": f"회원{i % members}", "date": now.date(),
+            "start_time": f"{6 + i % 16:02d}:00", "end_time": f"{7 + i % 16:02d}:00",
+            "start_minute": (6 + i % 16) * 60, "end_minute": (7 + i % 16) * 60,
+        } for i in range(schedules)])
+
+
+@pytest.fixture(scope="module", params=list(SIZES))
+def sized_client(request, tmp_path_factory, make_engine):
+    workdir = tmp_path_factory.mktemp(f"budget_{request.param}")
+    previous_cwd = os.getcwd()
+    # main은 import 시 현재 디렉터리에 uploads/를 만들므로 임시 디렉터리에서 import
+    os.chdir(workdir)
+
+    from fastapi.testclient import TestClient
+    import main
+    import auth
+    import metrics
+    from cache import rankings_cache, tournament_cache
+
+    engine = make_engine(workdir / "budget.db")
+    seed(engine, **SIZES[request.param])
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    main.app.dependency_overrides[main.get_db] = override_get_db
+    # 관리자 전용 API(대진표 저장)는 인증 조회를 빼고 엔드포인트 쿼리만 측정
+    main.app.dependency_overrides[main.get_current_principal] = lambda: auth.Principal(
+        1, "관리자", "01080000000", "ADMIN", True, True
+    )
+    server_timing = metrics.SERVER_TIMING
+    metrics.SERVER_TIMING = True
+    # 다른 크기에서 만든 응답 캐시를 쓰지 않도록 초기화 (캐시 미스 경로를 측정)
+    rankings_cache.invalidate("쿼리 예산 테스트")
+    tournament_cache.invalidate("쿼리 예산 테스트")
+    try:
+        yield request.param, TestClient(main.app)
+    finally:
+        metrics.SERVER_TIMING = server_timing
+        main.app.dependency_overrides.pop(main.get_db, None)
+        main.app.dependency_overrides.pop(main.get_current_principal, None)
+        engine.dispose()
+        os.chdir(previous_cwd)
+
+
+@pytest.mark.parametrize("method,path,max_queries,max_seconds", BUDGETS,
+                         ids=[f"{method} {path}" for method, path, _, _ in BUDGETS])
+def test_endpoint_query_budget(sized_client, method, path, max_queries, max_seconds):
+    size, client = sized_client
+    started = time.perf_counter()
+    response = client.request(method, path)
+    elapsed = time.perf_counter() - started
+
+    assert response.status_code == 200, f"{method} {path} [{size}] -> {response.status_code} {response.text[:200]}"
+    match = SERVER_TIMING_QUERIES.search(response.headers.get("server-timing", ""))
+    assert match, f"{method} {path}: Server-Timing 헤더 없음 (MetricsMiddleware 확인)"
+    queries = int(match.group(1))
+
+    assert queries <= max_queries, (
+        f"query budget exceeded: {method} {path} [{size}] {queries} queries > {max_queries}"
+    )
+    assert elapsed <= max_seconds * TIME_SCALE, (
+        f"time budget exceeded: {method} {path} [{size}] {elapsed * 1000:.1f}ms > {max_seconds * TIME_SCALE * 1000:.0f}ms"
+    )
@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+import models
+import match_stats
+import rating
+
+MEMBER_COUNT = 8
+MATCH_COUNT = 300
+
+
+def stored_ratings(db):
+    db.expire_all()
+    return {m.id: m.rating for m in db.query(models.Member).all()}
+
+
+def assert_ratings_close(stored, expected):
+    for member_id, value in stored.items():
+        assert value == pytest.approx(expected.get(member_id, rating.INITIAL), abs=1e-6), member_id
+
+
+def test_incremental_matches_replay(db, random_match):
+    rng = random.Random(3)
+    for _ in range(MATCH_COUNT):
+        match_stats.record_match(db, random_match(rng))
+        db.commit()
+
+    expected, _ = rating.replay(db)
+    assert_ratings_close(stored_ratings(db), expected)
+    # 복식 Elo는 합계 0
+    assert sum(stored_ratings(db).values()) == pytest.approx(rating.INITIAL * MEMBER_COUNT)
+
+
+def test_numpy_replay_matches_sequential(random_match):
+    if rating.np is None:
+        pytest.skip("numpy 없음")
+    rng = random.Random(5)
+    players, scores = [], []
+    for _ in range(MATCH_COUNT):
+        match = random_match(rng)
+        players.append(match_stats.participant_ids(match))
+        scores.append((match.score_team_a, match.score_team_b))
+    # 빈 자리(탈퇴 등으로 ID 없음)나 한 경기에 같은 선수가 두 번 있는 입력도 같은 결과
+    players[10] = (players[10][0], None, players[10][2], players[10][3])
+    players[20] = (players[20][0], players[20][0], players[20][2], players[20][0])
+
+    vector_ratings, vector_deltas = rating._replay_numpy(players, scores)
+    loop_ratings, loop_deltas = rating._replay_python(players, scores)
+    assert vector_deltas == pytest.approx(loop_deltas, abs=1e-9)
+    assert vector_ratings == pytest.approx(loop_ratings, abs=1e-9)
+
+
+def test_delete_and_edit_reverse_rating_updates(db, random_match):
+    rng = random.Random(11)
+    for _ in range(20):
+        match_stats.record_match(db, random_match(rng))
+        db.commit()
+    before_last = stored_ratings(db)
+
+    last = match_stats.record_match(db, random_match(rng))
+    db.commit()
+    assert stored_ratings(db) != before_last
+
+    # 마지막 경기 삭제 -> 등록 전 레이팅으로 정확히 복구
+    match_stats.remove_match(db, last.id)
+    db.commit()
+    assert_ratings_close(stored_ratings(db), before_last)
+
+    # 마지막 경기 결과 수정 -> 처음부터 그 결과로 등록한 것과 같음
+    last = match_stats.record_match(db, random_match(rng))
+    db.commit()
+    edited = random_match(rng)
+    match_stats.edit_match(db, last.id, edited)
+    db.commit()
+    expected, _ = rating.replay(db)
+    assert_ratings_close(stored_ratings(db), expected)
+
+    # 재계산 후 저장된 경기별 변화량으로도 되돌릴 수 있음
+    rating.rebuild(db)
+    assert rating.check_drift(db) == []
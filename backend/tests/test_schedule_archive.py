@@ -0,0 +1,39 @@
+import datetime
+
+import models
+import schedule_slots
+
+
+def add_schedule(db, day, schedule_id=None):
+    db.add(models.Schedule(id=schedule_id, member_id=1, member_name="선수0", date=day,
+                           start_time="10:00", end_time="12:00", start_minute=600, end_minute=720))
+    db.commit()
+
+
+def test_archive_survives_reused_schedule_ids(db):
+    old_day = datetime.date.today() - datetime.timedelta(days=schedule_slots.SCHEDULE_RETENTION_DAYS + 1)
+    add_schedule(db, old_day)
+    assert schedule_slots.archive_past(db) == 1
+
+    # schedules가 비면 SQLite는 같은 rowid를 다시 배정
+    add_schedule(db, old_day)
+    assert db.query(models.Schedule.id).scalar() == db.query(models.ScheduleArchive.schedule_id).scalar()
+    assert schedule_slots.archive_past(db) == 1
+
+    archived = db.query(models.ScheduleArchive).order_by(models.ScheduleArchive.id).all()
+    assert len(archived) == 2
+    assert archived[0].schedule_id == archived[1].schedule_id
+    assert db.query(models.Schedule).count() == 0
+
+
+def test_range_query_orders_by_date_and_start(db):
+    today = datetime.date.today()
+    for day, start in ((today, 600), (today, 540), (today - datetime.timedelta(days=1), 700)):
+        db.add(models.Schedule(member_id=1, member_name="선수0", date=day, start_minute=start, end_minute=start + 60))
+    db.commit()
+
+    rows = schedule_slots.range_query(db, today - datetime.timedelta(days=1), today)
+    assert [(r.date, r.start_minute) for r in rows] == [
+        (today - datetime.timedelta(days=1), 700), (today, 540), (today, 600),
+    ]
+    assert len(schedule_slots.range_query(db, today, today, skip=1, limit=5)) == 1
@@ -0,0 +1,59 @@
+import models
+import settlement
+
+MEMBER_COUNT = 4
+
+
+def add_match(db, players, score=(6, 3)):
+    db.add(models.Match(team_a_player1_id=players[0], team_a_player2_id=players[1],
+                        team_b_player1_id=players[2], team_b_player2_id=players[3],
+                        score_team_a=score[0], score_team_b=score[1]))
+
+
+def set_points(db, member_id, points, wins=1):
+    member = db.get(models.Member, member_id)
+    member.rank_point, member.wins, member.game_diff = points, wins, 3
+    return member
+
+
+def history(db, member_id):
+    h = models.LeagueHistory
+    return db.query(h).filter(h.member_id == member_id, h.year == 2026, h.month == 9).one_or_none()
+
+
+def test_rerun_keeps_counters_of_members_already_recorded(db):
+    for member_id in range(1, MEMBER_COUNT + 1):
+        set_points(db, member_id, member_id * 10)
+    db.commit()
+    # 지난 실행이 1번 회원만 기록한 뒤 중단됐고, 그 뒤 1번 회원이 다시 점수를 얻은 상태
+    db.add(models.LeagueHistory(member_id=1, year=2026, month=9, total_points=10,
+                                final_wins=1, final_losses=0, final_diff=3))
+    set_points(db, 1, 7)
+    db.commit()
+
+    run = settlement.run_settlement(db, 2026, 9, batch_size=2)
+    assert run.members_settled == MEMBER_COUNT - 1
+    db.expire_all()
+    # 이미 기록이 있는 회원은 보관되지 않은 성적을 지우지 않음
+    assert db.get(models.Member, 1).rank_point == 7
+    assert history(db, 1).total_points == 10
+    for member_id in range(2, MEMBER_COUNT + 1):
+        assert history(db, member_id).total_points == member_id * 10
+        assert db.get(models.Member, member_id).rank_point == 0
+
+
+def test_soft_deleted_members_who_played_are_settled(db):
+    add_match(db, (1, 4, 3, None))  # 2번 회원은 경기 기록 없음
+    for member_id in (2, 3):
+        set_points(db, member_id, 20).is_active = False
+    db.commit()
+
+    settlement.run_settlement(db, 2026, 9)
+    db.expire_all()
+    # 경기 기록이 남아 정리되지 않는 탈퇴 회원: 기록 보관 + 초기화
+    kept = db.get(models.Member, 3)
+    assert kept is not None and kept.rank_point == 0
+    assert history(db, 3).total_points == 20
+    # 경기 기록이 없는 탈퇴 회원: 기록과 함께 삭제
+    assert db.query(models.Member).filter(models.Member.id == 2).count() == 0
+    assert history(db, 2) is None
@@ -0,0 +1,61 @@
+import pytest
+
+import models
+
+MEMBER_COUNT = 10
+ADMIN_PHONE = "01000000000"
+MEMBER_PHONE = "01000000001"
+
+
+@pytest.fixture
+def admin(session_factory):
+    db = session_factory()
+    db.query(models.Member).filter(models.Member.phone == ADMIN_PHONE).update({"role": "ADMIN"})
+    db.commit()
+    db.close()
+
+
+def tournament_count(session_factory):
+    db = session_factory()
+    try:
+        return db.query(models.Tournament).count()
+    finally:
+        db.close()
+
+
+def test_generate_requires_admin(client, auth_headers, admin, session_factory):
+    assert client.post("/tournament/generate").status_code == 401
+    assert client.post("/tournament/generate", headers=auth_headers(MEMBER_PHONE)).status_code == 403
+    assert tournament_count(session_factory) == 0
+
+    response = client.post("/tournament/generate", headers=auth_headers(ADMIN_PHONE))
+    assert response.status_code == 200
+    assert response.json()["tournament_id"] is not None
+    assert tournament_count(session_factory) == 1
+
+
+def test_preview_does_not_store_bracket(client, session_factory):
+    response = client.post("/tournament/preview?entrants=8")
+    assert response.status_code == 200
+    bracket = response.json()
+    assert bracket["tournament_id"] is None
+    assert [(m["player1_seed"], m["player2_seed"]) for m in bracket["matches"]] == [(1, 8), (4, 5), (2, 7), (3, 6)]
+    assert tournament_count(session_factory) == 0
+    assert client.get("/tournament/current").status_code == 404
+
+
+def test_record_result_requires_admin(client, auth_headers, admin):
+    bracket = client.post("/tournament/generate?entrants=8", headers=auth_headers(ADMIN_PHONE)).json()
+    first = bracket["matches"][0]
+    url = f"/tournament/matches/{first['bracket_match_id']}/result"
+    result = {"winner_id": first["player1_id"], "score1": 6, "score2": 3}
+
+    response = client.put(url, json=result, headers=auth_headers(MEMBER_PHONE))
+    assert response.status_code == 403
+    current = client.get("/tournament/current").json()
+    assert current["matches"][0]["winner_id"] is None
+    assert current["rounds"][1]["matches"][0]["player1_id"] is None
+
+    response = client.put(url, json=result, headers=auth_headers(ADMIN_PHONE))
+    assert response.status_code == 200
+    assert response.json()["rounds"][1]["matches"][0]["player1_id"] == first["player1_id"]
@@ -0,0 +1,176 @@
+"""
+갤러리 썸네일 생성 (요청 스레드와 분리된 프로세스 풀에서 처리)
+
+- 업로드 직후 enqueue() -> 워커 프로세스가 EXIF 방향 보정 + 축소 JPEG 생성
+- 완료되면 gallery.thumbnail_path 갱신
+- 대기열은 크기가 제한되어 있어 업로드가 몰려도 메모리를 소진하지 않음
+  (가득 차면 건너뛰고, 나중에 backfill로 채움)
+
+사용법 (backend 디렉터리에서, 썸네일 없는 기존 항목 채우기):
+    python thumbnails.py backfill
+"""
+import os
+import sys
+import shutil
+import subprocess
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow가 없으면 이미지 썸네일 생략
+    Image = None
+
+THUMBNAIL_DIR = os.getenv("THUMBNAIL_DIR", "uploads/thumbs")
+THUMBNAIL_SIZE = (400, 400)
+THUMBNAIL_QUALITY = 80
+# 동시에 처리/대기할 수 있는 최대 작업 수
+THUMBNAIL_WORKERS = int(os.getenv("THUMBNAIL_WORKERS", "2"))
+THUMBNAIL_QUEUE_SIZE = int(os.getenv("THUMBNAIL_QUEUE_SIZE", "32"))
+
+
+def thumbnail_path_for(file_path: str) -> str:
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    return f"{THUMBNAIL_DIR}/{stem}.jpg"
+
+
+def make_thumbnail(file_path: str, file_type: str):
+    """
+    워커 프로세스에서 실행: 썸네일 파일을 만들고 경로 반환 (불가능하면 None)
+    - 이미지: EXIF 방향 보정 후 THUMBNAIL_SIZE 안으로 축소
+    - 동영상: ffmpeg가 있으면 1초 지점 프레임 추출
+    """
+    if not os.path.exists(file_path):
+        return None
+    os.makedirs(THUMBNAIL_DIR, exist_ok=True)
+    target = thumbnail_path_for(file_path)
+
+    if file_type == "VIDEO":
+        if shutil.which("ffmpeg") is None:
+            return None
+        result = subprocess.run(
+            ["ffmpeg", "-y", "-loglevel", "error", "-ss", "1", "-i", file_path,
+             "-frames:v", "1", "-vf", f"scale={THUMBNAIL_SIZE[0]}:-2", target],
+            capture_output=True, timeout=60
+        )
+        return target if result.returncode == 0 and os.path.exists(target) else None
+
+    if Image is None:
+        return None
+    with Image.open(file_path) as img:
+        # draft(): JPEG는 디코딩 단계에서 미리 축소하여 메모리 사용량 감소
+        img.draft("RGB", THUMBNAIL_SIZE)
+        img = ImageOps.exif_transpose(img)
+        img = img.convert("RGB")
+        img.thumbnail(THUMBNAIL_SIZE)
+        img.save(target, "JPEG", quality=THUMBNAIL_QUALITY, optimize=True)
+    return target
+
+
+def _save_thumbnail_path(gallery_id: int, thumb_path: str) -> None:
+    from database import SessionLocal
+    import models
+
+    db = SessionLocal()
+    try:
+        db.query(models.Gallery).filter(models.Gallery.id == gallery_id)\
+            .update({"thumbnail_path": thumb_path})
+        db.commit()
+    finally:
+        db.close()
+
+
+class ThumbnailWorker:
+    """크기 제한 대기열을 가진 썸네일 프로세스 풀"""
+
+    def __init__(self, workers: int = THUMBNAIL_WORKERS, queue_size: int = THUMBNAIL_QUEUE_SIZE):
+        self._workers = workers
+        self._slots = threading.BoundedSemaphore(queue_size)
+        self._executor = None
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.failed = 0
+        self.dropped = 0
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: 웹 서버의 스레드/DB 연결을 자식 프로세스로 복제하지 않음
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def enqueue(self, gallery_id: int, file_path: str, file_type: str, block: bool = False) -> bool:
+        """썸네일 작업 등록. 대기열이 가득 차면 False (block=True면 빈 자리까지 대기)"""
+        if not self._slots.acquire(blocking=block):
+            self.dropped += 1
+            print(f"⚠️ [Thumbnail] 대기열 가득 참, 건너뜀 (Gallery ID: {gallery_id})")
+            return False
+
+        try:
+            future = self._pool().submit(make_thumbnail, file_path, file_type)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda f: self._on_done(gallery_id, f))
+        return True
+
+    def _on_done(self, gallery_id: int, future) -> None:
+        try:
+            thumb_path = future.result()
+            if thumb_path:
+                _save_thumbnail_path(gallery_id, thumb_path)
+                self.completed += 1
+        except Exception as e:
+            self.failed += 1
+            print(f"❌ [Thumbnail Error] Gallery ID {gallery_id}: {e}")
+            if isinstance(e, BrokenProcessPool):
+                # 워커가 비정상 종료되면 다음 작업 때 풀을 새로 만듦
+                with self._lock:
+                    self._executor = None
+        finally:
+            self._slots.release()
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+    def stats(self) -> dict:
+        return {"completed": self.completed, "failed": self.failed, "dropped": self.dropped}
+
+
+thumbnail_worker = ThumbnailWorker()
+
+
+def backfill() -> int:
+    """thumbnail_path가 비어 있는 기존 갤러리 항목 썸네일 생성"""
+    from database import SessionLocal
+    import models
+
+    db = SessionLocal()
+    try:
+        items = db.query(models.Gallery.id, models.Gallery.file_path, models.Gallery.file_type)\
+            .filter(models.Gallery.thumbnail_path.is_(None)).all()
+    finally:
+        db.close()
+
+    for item in items:
+        thumbnail_worker.enqueue(item.id, item.file_path, item.file_type, block=True)
+    thumbnail_worker.shutdown(wait=True)
+    return len(items)
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "backfill"
+    if command != "backfill":
+        print(f"알 수 없는 명령: {command} (backfill)")
+        sys.exit(2)
+    count = backfill()
+    stats = thumbnail_worker.stats()
+    print(f"✅ [Thumbnail] 대상 {count}건: 생성 {stats['completed']}건 / 실패 {stats['failed']}건")
@@ -0,0 +1,284 @@
+"""
+토너먼트 대진표 엔진
+
+- 참가 인원 N명 -> 2의 거듭제곱 크기 대진표, 빈 자리는 상위 시드 부전승
+- 표준 시드 배치 (1번과 2번 시드는 결승에서만 만남)
+- 경기 결과 입력 시 승자를 다음 라운드 자리로 진출
+- 미리보기: 같은 배치를 저장하지 않고 응답만 생성 (앱의 대진표 보기)
+- 생성/조회 모두 인원과 무관하게 일정한 쿼리 수로 처리 (일괄 INSERT, IN 조회)
+"""
+import types
+import datetime
+from sqlalchemy.orm import Session
+import models
+import schemas
+import league_history
+
+
+def bracket_size(entrants: int) -> int:
+    """참가 인원을 담는 가장 작은 2의 거듭제곱"""
+    size = 2
+    while size < entrants:
+        size *= 2
+    return size
+
+
+def seed_order(size: int) -> list:
+    """
+    첫 라운드 자리 순서별 시드 번호 (size=8 -> [1, 8, 4, 5, 2, 7, 3, 6])
+    인접한 두 자리가 한 경기
+    """
+    seeds = [1]
+    while len(seeds) < size:
+        total = len(seeds) * 2
+        seeds = [x for seed in seeds for x in (seed, total + 1 - seed)]
+    return seeds
+
+
+def round_name(players: int) -> str:
+    return "결승" if players == 2 else f"{players}강전"
+
+
+# 시드 기준: points = 누적 승점 / 리그 순위, rating = 레이팅 (rating.py)
+SEED_SOURCES = ("points", "rating")
+
+
+def seed_member_ids(db: Session, entrants: int, seed_by: str = "points") -> list:
+    """
+    시드 순 회원 ID (활동 중인 승인 회원만)
+    - points: 최근 6개월 누적 승점 상위 -> 부족하면 현재 리그 순위로 보충 (쿼리 2회)
+    - rating: 레이팅 상위 (쿼리 1회)
+    """
+    if seed_by == "rating":
+        rows = db.query(models.Member.id).filter(
+            models.Member.is_active == True,
+            models.Member.is_approved == True
+        ).order_by(models.Member.rating.desc(), models.Member.id).limit(entrants).all()
+        return [row.id for row in rows]
+
+    seeded = league_history.top_member_ids(db, entrants)
+    if len(seeded) < entrants:
+        query = db.query(models.Member.id).filter(
+            models.Member.is_active == True,
+            models.Member.is_approved == True
+        )
+        if seeded:
+            query = query.filter(models.Member.id.notin_(seeded))
+        rows = query.order_by(
+            models.Member.rank_point.desc(),
+            models.Member.game_diff.desc(),
+            models.Member.wins.desc(),
+            models.Member.id
+        ).limit(entrants - len(seeded)).all()
+        seeded += [row.id for row in rows]
+    return seeded
+
+
+def default_name() -> str:
+    now = datetime.datetime.now()
+    return f"{now.year}년 {now.month}월 토너먼트"
+
+
+def layout(seeded_ids: list) -> tuple:
+    """
+    대진표 배치 (DB 저장 없음): 라운드별 빈 경기 슬롯 + 첫 라운드 시드 배치
+    부전승 경기는 승자를 바로 다음 라운드로 진출시킴
+    반환: (size, 라운드 행 목록, {(round_number, position): 경기 행})
+    """
+    entrants = len(seeded_ids)
+    if entrants < 2:
+        raise ValueError("토너먼트 인원 부족 (최소 2명 필요)")
+    size = bracket_size(entrants)
+
+    # 라운드별 빈 경기 슬롯 생성
+    round_rows = []
+    slots = {}  # (round_number, position) -> row dict
+    match_number = 0
+    players, round_number = size, 1
+    while players >= 2:
+        round_rows.append({
+            "round_number": round_number,
+            "name": round_name(players),
+            "match_count": players // 2,
+        })
+        for position in range(players // 2):
+            match_number += 1
+            slots[(round_number, position)] = {
+                "round_number": round_number,
+                "position": position,
+                "match_number": match_number,
+                "player1_id": None, "player2_id": None,
+                "player1_seed": None, "player2_seed": None,
+                "score1": None, "score2": None,
+                "winner_id": None, "is_bye": False,
+            }
+        players //= 2
+        round_number += 1
+    final_round = round_number - 1
+
+    # 첫 라운드 시드 배치 + 부전승 처리
+    order = seed_order(size)
+    for position in range(size // 2):
+        slot = slots[(1, position)]
+        for side, seed in (("1", order[2 * position]), ("2", order[2 * position + 1])):
+            if seed <= entrants:
+                slot[f"player{side}_id"] = seeded_ids[seed - 1]
+                slot[f"player{side}_seed"] = seed
+        if slot["player1_id"] is None or slot["player2_id"] is None:
+            slot["is_bye"] = True
+            slot["winner_id"] = slot["player1_id"] or slot["player2_id"]
+            if final_round > 1:
+                next_slot = slots[(2, position // 2)]
+                side = "1" if position % 2 == 0 else "2"
+                next_slot[f"player{side}_id"] = slot["winner_id"]
+                next_slot[f"player{side}_seed"] = slot["player1_seed"] or slot["player2_seed"]
+
+    return size, round_rows, slots
+
+
+def create_tournament(db: Session, seeded_ids: list, name: str = None) -> models.Tournament:
+    """대진표 생성 및 저장 (commit은 호출자가 수행)"""
+    size, round_rows, slots = layout(seeded_ids)
+    tournament = models.Tournament(name=name or default_name(), size=size,
+                                   entrant_count=len(seeded_ids), status="IN_PROGRESS")
+    db.add(tournament)
+    db.flush()
+
+    db.execute(models.TournamentRound.__table__.insert(),
+               [{"tournament_id": tournament.id, **row} for row in round_rows])
+    db.execute(models.BracketMatch.__table__.insert(),
+               [{"tournament_id": tournament.id, **row} for row in slots.values()])
+    return tournament
+
+
+def preview_bracket(db: Session, seeded_ids: list, name: str = None):
+    """저장하지 않는 대진표 (POST /tournament/preview, 결과 입력 불가: tournament_id / bracket_match_id 없음)"""
+    size, round_rows, slots = layout(seeded_ids)
+    names = dict(db.query(models.Member.id, models.Member.name)
+                 .filter(models.Member.id.in_(seeded_ids)).all())
+    round_names = {r["round_number"]: r["name"] for r in round_rows}
+    by_round = {r["round_number"]: [] for r in round_rows}
+    for (round_number, _), slot in sorted(slots.items()):
+        by_round[round_number].append(_match_response(types.SimpleNamespace(id=None, **slot), round_names, names))
+
+    return schemas.TournamentBracket(
+        matches=by_round[1],
+        name=name or default_name(),
+        size=size,
+        status="PREVIEW",
+        rounds=[
+            schemas.TournamentRoundResponse(round_number=r["round_number"], name=r["name"],
+                                            matches=by_round[r["round_number"]])
+            for r in round_rows
+        ]
+    )
+
+
+def record_result(db: Session, bracket_match_id: int, winner_id: int, score1=None, score2=None) -> int:
+    """
+    경기 결과 입력 후 승자 진출 (commit은 호출자가 수행)
+    다음 라운드 경기가 이미 끝났다면 결과를 바꿀 수 없음
+    반환: tournament_id
+    """
+    match = db.query(models.BracketMatch).filter(models.BracketMatch.id == bracket_match_id).first()
+    if not match:
+        raise LookupError("경기를 찾을 수 없습니다.")
+    if match.is_bye:
+        raise ValueError("부전승 경기는 결과를 입력할 수 없습니다.")
+    if match.player1_id is None or match.player2_id is None:
+        raise ValueError("아직 상대가 정해지지 않은 경기입니다.")
+    if winner_id not in (match.player1_id, match.player2_id):
+        raise ValueError("승자는 해당 경기 참가자여야 합니다.")
+
+    tournament = db.query(models.Tournament).filter(models.Tournament.id == match.tournament_id).first()
+    final_round = tournament.size.bit_length() - 1
+
+    if match.round_number < final_round:
+        next_match = db.query(models.BracketMatch).filter(
+            models.BracketMatch.tournament_id == match.tournament_id,
+            models.BracketMatch.round_number == match.round_number + 1,
+            models.BracketMatch.position == match.position // 2
+        ).first()
+        if next_match.winner_id is not None:
+            raise ValueError("다음 라운드 경기가 이미 끝나 결과를 변경할 수 없습니다.")
+        seed = match.player1_seed if winner_id == match.player1_id else match.player2_seed
+        if match.position % 2 == 0:
+            next_match.player1_id, next_match.player1_seed = winner_id, seed
+        else:
+            next_match.player2_id, next_match.player2_seed = winner_id, seed
+    else:
+        tournament.status = "COMPLETED"
+        tournament.champion_id = winner_id
+
+    match.winner_id = winner_id
+    match.score1 = score1
+    match.score2 = score2
+    return tournament.id
+
+
+def _match_response(m, round_names: dict, names: dict):
+    """경기 행(BracketMatch 또는 같은 속성의 객체) -> 응답 모델"""
+    return schemas.TournamentMatch(
+        match_id=m.match_number,
+        round=round_names[m.round_number],
+        player1=names.get(m.player1_id, "부전승" if m.is_bye else "TBD"),
+        player2=names.get(m.player2_id, "부전승" if m.is_bye else "TBD"),
+        bracket_match_id=m.id,
+        round_number=m.round_number,
+        position=m.position,
+        player1_id=m.player1_id,
+        player2_id=m.player2_id,
+        player1_seed=m.player1_seed,
+        player2_seed=m.player2_seed,
+        score1=m.score1,
+        score2=m.score2,
+        winner_id=m.winner_id,
+        winner=names.get(m.winner_id),
+        is_bye=m.is_bye
+    )
+
+
+def bracket_state(db: Session, tournament_id: int):
+    """저장된 대진표 전체 상태 (쿼리 4회: 대회, 라운드, 경기, 선수 이름)"""
+    tournament = db.query(models.Tournament).filter(models.Tournament.id == tournament_id).first()
+    if not tournament:
+        return None
+
+    rounds = db.query(models.TournamentRound)\
+        .filter(models.TournamentRound.tournament_id == tournament_id)\
+        .order_by(models.TournamentRound.round_number).all()
+    matches = db.query(models.BracketMatch)\
+        .filter(models.BracketMatch.tournament_id == tournament_id)\
+        .order_by(models.BracketMatch.round_number, models.BracketMatch.position).all()
+
+    member_ids = {tournament.champion_id}
+    for m in matches:
+        member_ids.update((m.player1_id, m.player2_id, m.winner_id))
+    member_ids.discard(None)
+    names = {}
+    if member_ids:
+        names = dict(db.query(models.Member.id, models.Member.name)
+                     .filter(models.Member.id.in_(member_ids)).all())
+
+    round_names = {r.round_number: r.name for r in rounds}
+    by_round = {r.round_number: [] for r in rounds}
+    for m in matches:
+        by_round[m.round_number].append(_match_response(m, round_names, names))
+
+    return schemas.TournamentBracket(
+        matches=by_round.get(1, []),
+        tournament_id=tournament.id,
+        name=tournament.name,
+        size=tournament.size,
+        status=tournament.status,
+        champion=names.get(tournament.champion_id),
+        rounds=[
+            schemas.TournamentRoundResponse(round_number=r.round_number, name=r.name, matches=by_round[r.round_number])
+            for r in rounds
+        ]
+    )
+
+
+def latest_tournament_id(db: Session):
+    row = db.query(models.Tournament.id).order_by(models.Tournament.id.desc()).first()
+    return row.id if row else None
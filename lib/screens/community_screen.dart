@@ -12,18 +12,56 @@ class CommunityScreen extends StatefulWidget {
 
 class _CommunityScreenState extends State<CommunityScreen> {
   final _communityService = CommunityService();
+  final _scrollController = ScrollController();
   List<dynamic> _posts = [];
   bool _isLoading = true;
+  bool _isLoadingMore = false;
+  // 검색 중이면 검색어 (null이면 전체 목록)
+  String? _searchQuery;
 
   @override
   void initState() {
     super.initState();
+    _scrollController.addListener(_onScroll);
     _loadPosts();
   }
 
+  @override
+  void dispose() {
+    _scrollController.dispose();
+    super.dispose();
+  }
+
+  // 목록 끝에 가까워지면 다음 페이지 요청
+  void _onScroll() {
+    if (_scrollController.position.pixels >=
+        _scrollController.position.maxScrollExtent - 200) {
+      _loadMore();
+    }
+  }
+
+  Future<void> _loadMore() async {
+    final before = _communityService.nextBefore;
+    if (_isLoadingMore || before == null || _searchQuery != null) return;
+    _isLoadingMore = true;
+    try {
+      final posts = await _communityService.fetchPosts(before: before);
+      if (mounted) {
+        setState(() => _posts.addAll(posts));
+      }
+    } catch (e) {
+      print('다음 페이지 로드 실패: $e');
+    } finally {
+      _isLoadingMore = false;
+    }
+  }
+
   Future<void> _loadPosts() async {
     try {
-      final posts = await _communityService.fetchPosts();
+      final query = _searchQuery;
+      final posts = query != null
+          ? await _communityService.searchPosts(query)
+          : await _communityService.fetchPosts();
       setState(() {
         _posts = posts;
         _isLoading = false;
@@ -38,6 +76,52 @@ class _CommunityScreenState extends State<CommunityScreen> {
     }
   }
 
+  Future<void> _showSearchDialog() async {
+    final searchController = TextEditingController(text: _searchQuery);
+
+    final query = await showDialog<String>(
+      context: context,
+      builder: (context) => AlertDialog(
+        title: const Text('게시글 검색'),
+        content: TextField(
+          controller: searchController,
+          autofocus: true,
+          decoration: const InputDecoration(
+            labelText: '검색어 (예: 코트 예약)',
+            border: OutlineInputBorder(),
+          ),
+          onSubmitted: (value) => Navigator.pop(context, value.trim()),
+        ),
+        actions: [
+          TextButton(
+            onPressed: () => Navigator.pop(context),
+            child: const Text('취소'),
+          ),
+          ElevatedButton(
+            onPressed: () =>
+                Navigator.pop(context, searchController.text.trim()),
+            child: const Text('검색'),
+          ),
+        ],
+      ),
+    );
+    if (query == null) return;
+
+    setState(() {
+      _searchQuery = query.isEmpty ? null : query;
+      _isLoading = true;
+    });
+    _loadPosts();
+  }
+
+  void _clearSearch() {
+    setState(() {
+      _searchQuery = null;
+      _isLoading = true;
+    });
+    _loadPosts();
+  }
+
   Future<void> _showCreatePostDialog() async {
     final titleController = TextEditingController();
     final contentController = TextEditingController();
@@ -186,7 +270,21 @@ class _CommunityScreenState extends State<CommunityScreen> {
     );
   }
 
-  void _showPostDetail(dynamic post) {
+  // 목록에는 본문 앞부분만 있으므로 누르면 전체 내용을 조회
+  Future<void> _showPostDetail(dynamic summary) async {
+    Map<String, dynamic> post;
+    try {
+      post = await _communityService.fetchPost(summary['id']);
+    } catch (e) {
+      if (mounted) {
+        ScaffoldMessenger.of(
+          context,
+        ).showSnackBar(SnackBar(content: Text('게시글 로드 실패: $e')));
+      }
+      return;
+    }
+    if (!mounted) return;
+
     showDialog(
       context: context,
       builder: (context) => AlertDialog(
@@ -221,20 +319,34 @@ class _CommunityScreenState extends State<CommunityScreen> {
   Widget build(BuildContext context) {
     return Scaffold(
       appBar: AppBar(
-        title: const Text('커뮤니티'),
+        title: Text(_searchQuery != null ? '검색: $_searchQuery' : '커뮤니티'),
         backgroundColor: Theme.of(context).colorScheme.primary,
         foregroundColor: Colors.white,
+        actions: [
+          if (_searchQuery != null)
+            IconButton(
+              icon: const Icon(Icons.close),
+              tooltip: '검색 해제',
+              onPressed: _clearSearch,
+            ),
+          IconButton(
+            icon: const Icon(Icons.search),
+            tooltip: '검색',
+            onPressed: _showSearchDialog,
+          ),
+        ],
       ),
       body: _isLoading
           ? const Center(child: CircularProgressIndicator())
           : _posts.isEmpty
-          ? const Center(
+          ? Center(
               child: Text(
-                '등록된 게시글이 없습니다.',
-                style: TextStyle(fontSize: 18, color: Colors.grey),
+                _searchQuery != null ? '검색 결과가 없습니다.' : '등록된 게시글이 없습니다.',
+                style: const TextStyle(fontSize: 18, color: Colors.grey),
               ),
             )
           : ListView.builder(
+              controller: _scrollController,
               padding: const EdgeInsets.all(8),
               itemCount: _posts.length,
               itemBuilder: (context, index) {
@@ -254,7 +366,12 @@ class _CommunityScreenState extends State<CommunityScreen> {
                       maxLines: 1,
                       overflow: TextOverflow.ellipsis,
                     ),
-                    subtitle: Text('${post['author_name']} | $dateStr'),
+                    subtitle: Text(
+                      '${post['snippet'] ?? ''}\n${post['author_name']} | $dateStr',
+                      maxLines: 2,
+                      overflow: TextOverflow.ellipsis,
+                    ),
+                    isThreeLine: true,
                     trailing: IconButton(
                       icon: const Icon(
                         Icons.delete_outline,
@@ -173,8 +173,9 @@ class _GalleryScreenState extends State<GalleryScreen> {
                     fit: StackFit.expand,
                     children: [
                       CachedNetworkImage(
-                        imageUrl: isVideo
-                            ? '${AuthService.baseUrl}/${(media['thumbnail_path'] ?? filePath).replaceFirst('uploads/', 'images/')}'
+                        // 목록에는 서버에서 만든 썸네일 사용 (없으면 원본)
+                        imageUrl: media['thumbnail_path'] != null
+                            ? '${AuthService.baseUrl}/${(media['thumbnail_path'] as String).replaceFirst('uploads/', 'images/')}'
                             : url,
                         fit: BoxFit.cover,
                         placeholder: (context, url) =>
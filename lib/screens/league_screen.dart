@@ -1,6 +1,8 @@
+import 'dart:async';
 import 'package:flutter/material.dart';
 import '../services/league_service.dart';
 import '../services/auth_service.dart';
+import '../services/events_service.dart';
 import '../models/member.dart';
 import 'match_history_screen.dart';
 import 'league_history_screen.dart';
@@ -29,11 +31,24 @@ class _LeagueScreenState extends State<LeagueScreen> {
 
   final _scoreAController = TextEditingController();
   final _scoreBController = TextEditingController();
+  StreamSubscription<String>? _eventsSubscription;
 
   @override
   void initState() {
     super.initState();
     _loadData();
+    // 다른 회원이 경기를 등록/삭제하거나 회원이 승인되면 순위 갱신
+    _eventsSubscription = EventsService()
+        .subscribe(['rankings'])
+        .listen((_) => _loadData());
+  }
+
+  @override
+  void dispose() {
+    _eventsSubscription?.cancel();
+    _scoreAController.dispose();
+    _scoreBController.dispose();
+    super.dispose();
   }
 
   Future<void> _loadData() async {
@@ -198,6 +213,7 @@ class _LeagueScreenState extends State<LeagueScreen> {
                           DataColumn(label: Text('승점')),
                           DataColumn(label: Text('전적')),
                           DataColumn(label: Text('득실')),
+                          DataColumn(label: Text('레이팅')),
                         ],
                         rows: List<DataRow>.generate(_rankings.length, (index) {
                           final member = _rankings[index];
@@ -212,6 +228,13 @@ class _LeagueScreenState extends State<LeagueScreen> {
                                 ),
                               ),
                               DataCell(Text('${member['game_diff']}')),
+                              DataCell(
+                                Text(
+                                  ((member['rating'] ?? 1500) as num)
+                                      .round()
+                                      .toString(),
+                                ),
+                              ),
                             ],
                           );
                         }),
@@ -1,6 +1,8 @@
+import 'dart:async';
 import 'package:flutter/material.dart';
 import '../models/match_record.dart';
 import '../services/match_service.dart';
+import '../services/events_service.dart';
 import '../models/member.dart';
 
 class MatchHistoryScreen extends StatefulWidget {
@@ -15,14 +17,25 @@ class MatchHistoryScreen extends StatefulWidget {
 class _MatchHistoryScreenState extends State<MatchHistoryScreen> {
   final _matchService = MatchService();
   late Future<List<MatchRecord>> _matchesFuture;
+  StreamSubscription<String>? _eventsSubscription;
 
   @override
   void initState() {
     super.initState();
     _matchesFuture = _matchService.getMatches();
+    _eventsSubscription = EventsService()
+        .subscribe(['matches'])
+        .listen((_) => _refreshMatches());
+  }
+
+  @override
+  void dispose() {
+    _eventsSubscription?.cancel();
+    super.dispose();
   }
 
   void _refreshMatches() {
+    if (!mounted) return;
     setState(() {
       _matchesFuture = _matchService.getMatches();
     });
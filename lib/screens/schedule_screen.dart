@@ -1,6 +1,8 @@
+import 'dart:async';
 import 'package:flutter/material.dart';
 import '../services/schedule_service.dart';
 import '../services/auth_service.dart';
+import '../services/events_service.dart';
 
 class ScheduleScreen extends StatefulWidget {
   final String memberName;
@@ -17,12 +19,22 @@ class _ScheduleScreenState extends State<ScheduleScreen> {
   List<dynamic> _schedules = [];
   bool _isLoading = true;
   int? _currentUserId;
+  StreamSubscription<String>? _eventsSubscription;
 
   @override
   void initState() {
     super.initState();
     _loadCurrentUser();
     _loadSchedules();
+    _eventsSubscription = EventsService()
+        .subscribe(['schedules'])
+        .listen((_) => _loadSchedules());
+  }
+
+  @override
+  void dispose() {
+    _eventsSubscription?.cancel();
+    super.dispose();
   }
 
   Future<void> _loadCurrentUser() async {
@@ -37,6 +49,7 @@ class _ScheduleScreenState extends State<ScheduleScreen> {
   Future<void> _loadSchedules() async {
     try {
       final schedules = await _scheduleService.fetchSchedules();
+      if (!mounted) return;
       setState(() {
         _schedules = schedules;
         _isLoading = false;
@@ -5,15 +5,46 @@ import 'auth_service.dart';
 class CommunityService {
   final String baseUrl = AuthService.baseUrl;
 
-  Future<List<dynamic>> fetchPosts() async {
-    final response = await http.get(Uri.parse('$baseUrl/community'));
+  // 다음 페이지 커서 (서버 응답 헤더 X-Next-Before-Id, 마지막 페이지면 null)
+  int? nextBefore;
+
+  // 게시글 목록 (제목/작성자/본문 앞부분). before를 주면 그 이전 글부터
+  Future<List<dynamic>> fetchPosts({int? before}) async {
+    final query = before != null ? '?before=$before' : '';
+    final response = await http.get(Uri.parse('$baseUrl/community$query'));
     if (response.statusCode == 200) {
+      final next = response.headers['x-next-before-id'];
+      nextBefore = next != null ? int.tryParse(next) : null;
       return jsonDecode(utf8.decode(response.bodyBytes));
     } else {
       throw Exception('Failed to load posts');
     }
   }
 
+  // 제목/본문 검색 (관련도 순)
+  Future<List<dynamic>> searchPosts(String query) async {
+    final response = await http.get(
+      Uri.parse(
+        '$baseUrl/community/search?q=${Uri.encodeQueryComponent(query)}',
+      ),
+    );
+    if (response.statusCode == 200) {
+      return jsonDecode(utf8.decode(response.bodyBytes));
+    } else {
+      throw Exception('Failed to search posts');
+    }
+  }
+
+  // 게시글 상세 (본문 전체)
+  Future<Map<String, dynamic>> fetchPost(int postId) async {
+    final response = await http.get(Uri.parse('$baseUrl/community/$postId'));
+    if (response.statusCode == 200) {
+      return jsonDecode(utf8.decode(response.bodyBytes));
+    } else {
+      throw Exception('Failed to load post');
+    }
+  }
+
   Future<void> createPost(
     String title,
     String authorName,
@@ -0,0 +1,65 @@
+import 'dart:async';
+import 'dart:convert';
+import 'package:http/http.dart' as http;
+import 'auth_service.dart';
+
+/// 서버 변경 알림 (GET /events, Server-Sent Events)
+/// 경기/약속/회원 변경이 생긴 토픽 이름을 흘려보내며, 화면은 해당 목록만 다시 조회
+class EventsService {
+  final String baseUrl = AuthService.baseUrl;
+
+  /// topics: rankings, matches, schedules, members
+  /// 연결이 끊기면 서버가 알려준 간격(retry)만큼 기다렸다가 다시 연결
+  Stream<String> subscribe(List<String> topics) {
+    late StreamController<String> controller;
+    http.Client? client;
+    bool closed = false;
+
+    Future<void> connect() async {
+      var retry = const Duration(seconds: 3);
+      while (!closed) {
+        client = http.Client();
+        try {
+          final request = http.Request(
+            'GET',
+            Uri.parse('$baseUrl/events?topics=${topics.join(',')}'),
+          );
+          request.headers['Accept'] = 'text/event-stream';
+          final response = await client!.send(request);
+          if (response.statusCode == 200) {
+            String? event;
+            await for (final line
+                in response.stream
+                    .transform(utf8.decoder)
+                    .transform(const LineSplitter())) {
+              if (closed) break;
+              if (line.startsWith('retry:')) {
+                final ms = int.tryParse(line.substring(6).trim());
+                if (ms != null) retry = Duration(milliseconds: ms);
+              } else if (line.startsWith('event:')) {
+                event = line.substring(6).trim();
+              } else if (line.isEmpty && event != null) {
+                controller.add(event);
+                event = null;
+              }
+            }
+          }
+        } catch (e) {
+          print('Events connection error: $e');
+        } finally {
+          client?.close();
+        }
+        if (!closed) await Future.delayed(retry);
+      }
+    }
+
+    controller = StreamController<String>(
+      onListen: connect,
+      onCancel: () {
+        closed = true;
+        client?.close();
+      },
+    );
+    return controller.stream;
+  }
+}
@@ -5,10 +5,27 @@ import 'auth_service.dart';
 class LeagueService {
   final String baseUrl = AuthService.baseUrl;
 
+  // 마지막으로 받은 순위와 ETag (변경 없으면 서버가 304로 응답)
+  static String? _rankingsEtag;
+  static List<dynamic>? _cachedRankings;
+
   Future<List<dynamic>> fetchRankings() async {
-    final response = await http.get(Uri.parse('$baseUrl/league/rankings'));
-    if (response.statusCode == 200) {
-      return jsonDecode(utf8.decode(response.bodyBytes));
+    final headers = <String, String>{};
+    if (_rankingsEtag != null && _cachedRankings != null) {
+      headers['If-None-Match'] = _rankingsEtag!;
+    }
+
+    final response = await http.get(
+      Uri.parse('$baseUrl/league/rankings'),
+      headers: headers,
+    );
+    if (response.statusCode == 304 && _cachedRankings != null) {
+      return _cachedRankings!;
+    } else if (response.statusCode == 200) {
+      final rankings = jsonDecode(utf8.decode(response.bodyBytes));
+      _rankingsEtag = response.headers['etag'];
+      _cachedRankings = rankings;
+      return rankings;
     } else {
       throw Exception('Failed to load rankings');
     }
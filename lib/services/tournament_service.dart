@@ -6,7 +6,7 @@ class TournamentService {
   final String baseUrl = AuthService.baseUrl;
 
   Future<Map<String, dynamic>> generateBracket() async {
-    final response = await http.post(Uri.parse('$baseUrl/tournament/generate'));
+    final response = await http.post(Uri.parse('$baseUrl/tournament/preview'));
 
     if (response.statusCode == 200) {
       return jsonDecode(utf8.decode(response.bodyBytes));